@@ -7,7 +7,7 @@ import pkg_resources
 
 from .exceptions import YangImportError
 from .generators import RPCGenerator
-from .registry import ImportRegistry
+from .registry import CatalogRegistry, ImportRegistry
 from .scan import Scanner
 
 try:
@@ -15,4 +15,5 @@ try:
 except:  # pylint: disable=bare-except
     __version__ = 'unknown'
 
-__all__ = ['RPCGenerator', 'ImportRegistry', 'Scanner', 'YangImportError']
+__all__ = ['RPCGenerator', 'CatalogRegistry', 'ImportRegistry', 'Scanner',
+           'YangImportError']
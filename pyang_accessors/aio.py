@@ -0,0 +1,221 @@
+# -*- coding: utf-8 -*-
+"""\
+asyncio front end for generating the interfaces of many YANG files.
+
+The jobs of :func:`pyang_accessors.batch.transform_many` run in the same
+executors, while the event loop just awaits their results::
+
+    async for result in transform_many(paths, max_pending=4, timeout=60):
+        if result.error is None:
+            save(result.path, result.output)
+
+.. note:: This module requires Python 3.7+ and is not imported by
+    :mod:`pyang_accessors`. It is written without the ``async`` syntax,
+    so the Python 2 tools can still check it.
+"""
+import asyncio  # pylint: disable=import-error
+from collections import deque
+from itertools import islice
+
+from .batch import Result, create_executor
+from .catalog import transform_file
+
+__author__ = "Anderson Bravalheri"
+__copyright__ = "Copyright (C) 2016 Anderson Bravalheri"
+__license__ = "mozilla"
+
+
+def _stop(waiter):
+    """Finish the iteration of the waiting consumer"""
+    # not a builtin of the Python 2 linters
+    waiter.set_exception(
+        StopAsyncIteration())  # noqa pylint: disable=undefined-variable
+
+
+class AsyncBatch(object):
+    """Asynchronous iterator over the results of a batch.
+
+    The jobs are submitted from the event loop and their results are
+    awaited through :func:`asyncio.wrap_future`, so the loop is never
+    blocked. See :func:`transform_many`.
+    """
+
+    def __init__(self, paths, search_path=None, generator_options=None,
+                 executor=None, max_pending=None, timeout=None):
+        (self.executor, self.max_pending, self.own_executor) = (
+            create_executor(executor, generator_options, max_pending))
+        self.options = (list(search_path or []), generator_options)
+        self.paths = iter(paths)
+        self.timeout = timeout
+        self.loop = None
+        self.running = {}  # future -> (path, deadline)
+        self.abandoned = set()
+        self.ready = deque()
+        self.waiter = None
+        self.timer = None
+        self.closed = False
+
+    def __aiter__(self):
+        return self
+
+    def __anext__(self):
+        """Awaitable for the next result"""
+        if self.waiter is not None and not self.waiter.done():
+            raise RuntimeError('The batch is already being awaited')
+
+        if self.loop is None:
+            self.loop = asyncio.get_running_loop()
+
+        waiter = self.waiter = self.loop.create_future()
+        waiter.add_done_callback(self._waiter_done)
+        if self.closed:
+            _stop(waiter)
+        else:
+            self._update()
+
+        return waiter
+
+    def close(self):
+        """Cancel the jobs not started yet and release the executor.
+
+        The running jobs cannot be interrupted, so their results are just
+        discarded.
+        """
+        if self.closed:
+            return
+
+        self.closed = True
+        if self.timer is not None:
+            self.timer.cancel()
+        for future in self.running:
+            future.cancel()
+        self.running.clear()
+        self.ready.clear()
+        if self.own_executor:
+            self.executor.shutdown(wait=False)
+        if self.waiter is not None and not self.waiter.done():
+            _stop(self.waiter)
+
+    def _waiter_done(self, waiter):
+        """Cancelling the consumer also cancels the batch"""
+        if waiter.cancelled():
+            self.close()
+
+    def _submit(self, path):
+        """Run the job of a file in the executor"""
+        future = self.executor.submit(transform_file, path, *self.options)
+        self.running[future] = (
+            path,
+            None if self.timeout is None else self.loop.time() + self.timeout
+        )
+        asyncio.wrap_future(future, loop=self.loop).add_done_callback(
+            lambda wrapped: self._finish(future, wrapped))
+
+    def _finish(self, future, wrapped):
+        """Collect the result of a job, in the event loop"""
+        (path, _) = self.running.pop(future, (None, None))
+        if wrapped.cancelled():
+            return
+
+        # the error is always retrieved, so asyncio does not log it
+        result = Result.finished(path, wrapped)
+        if path is None:
+            # the batch was closed meanwhile
+            return
+
+        if future in self.abandoned:
+            # already reported, the worker is just free now
+            self.abandoned.discard(future)
+        else:
+            self.ready.append(result)
+
+        self._update()
+
+    def _expire(self):
+        """Report the jobs that took too long"""
+        now = self.loop.time()
+        for (future, (path, deadline)) in list(self.running.items()):
+            if (future in self.abandoned or future.done() or
+                    deadline is None or deadline > now):
+                continue
+            if future.cancel():
+                del self.running[future]
+            else:
+                # cannot be interrupted, but still counts as pending
+                self.abandoned.add(future)
+            self.ready.append(Result.timed_out(path))
+
+    def _schedule(self):
+        """Wake up at the next deadline"""
+        if self.timer is not None:
+            self.timer.cancel()
+            self.timer = None
+
+        deadlines = [
+            deadline for (future, (_, deadline)) in self.running.items()
+            if deadline is not None and future not in self.abandoned
+        ]
+        if deadlines:
+            self.timer = self.loop.call_at(min(deadlines), self._update)
+
+    def _update(self):
+        """Hand the ready results over and keep the executor busy"""
+        self._expire()
+
+        waiter = self.waiter
+        waiting = waiter is not None and not waiter.done()
+        if waiting and self.ready:
+            waiter.set_result(self.ready.popleft())
+            waiting = False
+
+        # a finished file is replaced just when its result is consumed,
+        # so slow consumers stop the submissions
+        free = self.max_pending - len(self.running) - len(self.ready)
+        for path in islice(self.paths, max(free, 0)):
+            self._submit(path)
+
+        if waiting and not self.running and not self.ready:
+            self.close()
+        else:
+            self._schedule()
+
+
+def transform_many(paths, search_path=None, generator_options=None,
+                   executor=None, max_pending=None, timeout=None):
+    """Generate the interfaces for YANG files, without blocking the loop.
+
+    The results are produced as soon as each file is done (not in the
+    order of ``paths``). At most ``max_pending`` jobs are held by the
+    executor or wait to be consumed, so just this number of parsed
+    contexts is in memory, and no new file is submitted while the caller
+    does not consume the results.
+
+    A job that is not done ``timeout`` seconds after its submission is
+    reported as a ``TimeoutError``. If it was not started yet, it is
+    cancelled. Otherwise it cannot be interrupted: the job is abandoned,
+    but still counts as pending until it finishes.
+
+    Closing the batch (or cancelling the task awaiting it) cancels the
+    jobs not started yet.
+
+    Arguments:
+        paths (iterable): ``.yang`` files, consumed lazily.
+        search_path (list): directories with the imported modules.
+        generator_options (dict): configuration for the
+            :class:`~pyang_accessors.generators.RPCGenerator`.
+            Must be picklable when using a process pool.
+        executor (concurrent.futures.Executor): if ``None``, a pool is
+            created (and shut down at the end), as in
+            :func:`~pyang_accessors.batch.create_executor`.
+        max_pending (int): maximum number of jobs in the executor.
+        timeout (float): maximum number of seconds for each file.
+
+    Raises:
+        ValueError: if a ``catalog`` is given with a process pool.
+
+    Returns:
+        AsyncBatch: asynchronous iterator of
+            :class:`~pyang_accessors.batch.Result`.
+    """
+    return AsyncBatch(paths, search_path, generator_options,
+                      executor, max_pending, timeout)
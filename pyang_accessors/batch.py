@@ -0,0 +1,197 @@
+# -*- coding: utf-8 -*-
+"""\
+Tools for generating the interfaces of many YANG files in parallel.
+
+The generation is CPU bound and blocks for seconds on big modules, so
+each file is parsed and transformed in an executor (by default a process
+pool), while the caller consumes the results as soon as they are ready::
+
+    for result in transform_many(paths, max_pending=4, timeout=60):
+        if result.error is None:
+            save(result.path, result.output)
+
+On Python 2 the ``futures`` backport of :mod:`concurrent.futures` is
+required. The asyncio services can use the awaitable front end in
+:mod:`pyang_accessors.aio` instead.
+"""
+from concurrent import futures
+from itertools import islice
+from multiprocessing import cpu_count
+from time import time
+
+from .catalog import transform_file
+
+__author__ = "Anderson Bravalheri"
+__copyright__ = "Copyright (C) 2016 Anderson Bravalheri"
+__license__ = "mozilla"
+
+
+class Result(object):
+    """Outcome of the generation for a YANG file.
+
+    Attributes:
+        path (str): path of the ``.yang`` file.
+        output (str): generated module, in YANG format,
+            or ``None`` if the generation failed.
+        error (Exception): raised by the generation
+            (``concurrent.futures.TimeoutError`` if it took too long),
+            or ``None`` if it succeeded.
+    """
+    __slots__ = ('path', 'output', 'error')
+
+    def __init__(self, path, output=None, error=None):
+        self.path = path
+        self.output = output
+        self.error = error
+
+    @classmethod
+    def finished(cls, path, future):
+        """Result of a finished job"""
+        error = future.exception()
+        if error is not None:
+            return cls(path, error=error)
+
+        return cls(path, future.result())
+
+    @classmethod
+    def timed_out(cls, path):
+        """Result of a job that took too long"""
+        return cls(path, error=futures.TimeoutError(
+            'generation of {} took too long'.format(path)))
+
+
+def create_executor(executor=None, generator_options=None, max_pending=None):
+    """Pool for the jobs of a batch.
+
+    Arguments:
+        executor (concurrent.futures.Executor): used if given.
+        generator_options (dict): configuration for the
+            :class:`~pyang_accessors.generators.RPCGenerator`.
+            A new pool uses threads if a ``catalog`` is given,
+            or processes otherwise.
+        max_pending (int): number of workers of a new pool.
+            Defaults to the number of workers of the given executor or the
+            number of CPUs.
+
+    Returns:
+        tuple: ``(executor, max_pending, own_executor)``, where
+            ``own_executor`` tells if the pool was created (and therefore
+            should be shut down by the caller).
+
+    Raises:
+        ValueError: if a ``catalog`` is given with a process pool. Each
+            process would fill its own copy of the registry, so the
+            prefixes would not be shared.
+    """
+    catalog = (generator_options or {}).get('catalog')
+    if (catalog is not None and
+            isinstance(executor, futures.ProcessPoolExecutor)):
+        raise ValueError(
+            'A catalog registry cannot be shared by a process pool')
+
+    max_pending = (max_pending or getattr(executor, '_max_workers', None) or
+                   cpu_count())
+    if executor is not None:
+        return (executor, max_pending, False)
+
+    pool = (futures.ThreadPoolExecutor if catalog is not None
+            else futures.ProcessPoolExecutor)
+
+    return (pool(max_pending), max_pending, True)
+
+
+def transform_many(paths, search_path=None, generator_options=None,
+                   executor=None, max_pending=None, timeout=None):
+    """Generate the interfaces for YANG files in an executor.
+
+    The results are yielded as soon as each file is done (not in the order
+    of ``paths``). At most ``max_pending`` jobs are held by the executor,
+    so just this number of parsed contexts is in memory, and no new file
+    is submitted while the caller does not consume the results.
+
+    A job that is not done ``timeout`` seconds after its submission is
+    reported as a ``TimeoutError``. If it was not started yet, it is
+    cancelled. Otherwise it cannot be interrupted: the job is abandoned,
+    but still counts as pending until it finishes, so its worker (and the
+    memory it holds) is not reused before that.
+
+    Closing the generator cancels the jobs not started yet.
+
+    Arguments:
+        paths (iterable): ``.yang`` files, consumed lazily.
+        search_path (list): directories with the imported modules.
+        generator_options (dict): configuration for the
+            :class:`~pyang_accessors.generators.RPCGenerator`.
+            Must be picklable when using a process pool.
+        executor (concurrent.futures.Executor): if ``None``, a pool with
+            ``max_pending`` workers is created (and shut down at the end).
+            The pool uses processes, unless a ``catalog`` is given in the
+            ``generator_options``.
+        max_pending (int): maximum number of jobs in the executor.
+            Defaults to the number of workers of the given executor or the
+            number of CPUs.
+        timeout (float): maximum number of seconds for each file.
+
+    Raises:
+        ValueError: if a ``catalog`` is given with a process pool. Each
+            process would fill its own copy of the registry, so the
+            prefixes would not be shared.
+
+    Yields:
+        Result
+    """
+    (executor, max_pending, own_executor) = create_executor(
+        executor, generator_options, max_pending)
+
+    options = (list(search_path or []), generator_options)
+    paths = iter(paths)
+    running = {}  # future -> (path, deadline)
+    abandoned = set()
+
+    def submit(count):
+        """Submit the next files"""
+        for path in islice(paths, count):
+            future = executor.submit(transform_file, path, *options)
+            running[future] = (
+                path, None if timeout is None else time() + timeout)
+
+    submit(max_pending)
+    try:
+        while running:
+            deadlines = [
+                deadline for (future, (_, deadline)) in running.items()
+                if deadline is not None and future not in abandoned
+            ]
+            wait_time = (max(min(deadlines) - time(), 0)
+                         if deadlines else None)
+            (done, _) = futures.wait(
+                list(running), wait_time, futures.FIRST_COMPLETED)
+
+            for future in done:
+                (path, _) = running.pop(future)
+                if future in abandoned:
+                    # already reported, the worker is just free now
+                    abandoned.discard(future)
+                else:
+                    yield Result.finished(path, future)
+                # a finished file is replaced just when its result is
+                # consumed, so slow consumers stop the submissions
+                submit(1)
+
+            now = time()
+            for (future, (path, deadline)) in list(running.items()):
+                if (future in abandoned or future.done() or
+                        deadline is None or deadline > now):
+                    continue
+                if future.cancel():
+                    del running[future]
+                    yield Result.timed_out(path)
+                    submit(1)
+                else:
+                    abandoned.add(future)
+                    yield Result.timed_out(path)
+    finally:
+        for future in running:
+            future.cancel()
+        if own_executor:
+            executor.shutdown(wait=False)
@@ -0,0 +1,126 @@
+# -*- coding: utf-8 -*-
+"""\
+Tools for limiting the size of the output during the generation.
+
+Misplaced ``include`` modifiers can make the generator copy huge payloads
+into many groupings. The budgets are checked incrementally, by the
+scanner and by the generator, so the generation is aborted as soon as
+one of the limits is exceeded, before the payloads are copied.
+"""
+from .estimate import content_size
+from .exceptions import BudgetExceededError
+from .filters import join_path
+
+__author__ = "Anderson Bravalheri"
+__copyright__ = "Copyright (C) 2016 Anderson Bravalheri"
+__license__ = "mozilla"
+
+ENTRIES = 'entries'
+GROUPINGS = 'groupings'
+PAYLOAD_NODES = 'payload_nodes'
+OUTPUT_NODES = 'output_nodes'
+
+SHARED = '(shared)'
+"""Path reported for the nodes not created for a specific entry-point"""
+
+
+class Budget(object):
+    """Limits for the size of the output, checked incrementally.
+
+    A ``None`` limit is not checked.
+
+    Attributes:
+        limits (dict): maximum value for each budget.
+        usage (dict): current value for each budget.
+        growth (dict): number of output nodes created for each path.
+        entries (dict): number of entry-points under each top-level node.
+        path (str): path of the entry-point whose nodes are being
+            created (see :meth:`enter`).
+        groupings (set): names of the groupings already counted.
+        top (int): number of paths listed in the error report.
+    """
+
+    def __init__(self, max_entries=None, max_groupings=None,
+                 max_payload_nodes=None, max_output_nodes=None, top=10):
+        self.limits = {
+            ENTRIES: max_entries,
+            GROUPINGS: max_groupings,
+            PAYLOAD_NODES: max_payload_nodes,
+            OUTPUT_NODES: max_output_nodes,
+        }
+        self.usage = dict((budget, 0) for budget in self.limits)
+        self.growth = {}
+        self.entries = {}
+        self.path = None
+        self.groupings = set()
+        self.top = top
+
+    def __bool__(self):
+        """A budget without limits do not need to be checked"""
+        return any(limit is not None for limit in self.limits.values())
+
+    __nonzero__ = __bool__
+
+    def report(self, counts=None):
+        """Paths that contributed the most for the growth of the output"""
+        counts = self.growth if counts is None else counts
+        paths = sorted(counts.items(), key=lambda item: -item[1])
+        return paths[:self.top]
+
+    def check(self, budget, value, paths=None):
+        """Raise an error if the value exceeds the limit of a budget"""
+        limit = self.limits[budget]
+        if limit is not None and value > limit:
+            raise BudgetExceededError(
+                budget, limit, value,
+                self.report() if paths is None else paths)
+
+    def enter(self, path):
+        """Charge the next nodes to the path of an entry-point"""
+        self.path = path and join_path(path)
+
+    def add_entry(self, path):
+        """Count a new entry-point, charged to its top-level node"""
+        top_level = join_path(path[:1])
+        self.entries[top_level] = self.entries.get(top_level, 0) + 1
+        self.usage[ENTRIES] += 1
+        if (self.limits[ENTRIES] is not None and
+                self.usage[ENTRIES] > self.limits[ENTRIES]):
+            self.check(ENTRIES, self.usage[ENTRIES],
+                       self.report(self.entries))
+
+    def check_payload(self, payload, path):
+        """Check the size of a payload, before it is copied"""
+        if self.limits[PAYLOAD_NODES] is None:
+            return
+
+        (nodes, _) = content_size(payload)
+        self.check(PAYLOAD_NODES, nodes, [(join_path(path), nodes)])
+
+    def add_grouping(self, name, content):
+        """Count a new grouping, before its content is created.
+
+        Each name is counted once: the groupings repeated by the shards of
+        a module are moved to a single submodule in the end.
+        """
+        if name in self.groupings:
+            return
+
+        self.groupings.add(name)
+        self.usage[GROUPINGS] += 1
+        self.check(GROUPINGS, self.usage[GROUPINGS])
+
+        if (self.limits[PAYLOAD_NODES] is None and
+                self.limits[OUTPUT_NODES] is None):
+            return
+
+        (nodes, _) = content_size(content)
+        self.check(PAYLOAD_NODES, nodes, [(self.path or name, nodes)])
+        self.add_nodes(nodes + 1)
+
+    def add_nodes(self, nodes):
+        """Count new output nodes"""
+        path = self.path or SHARED
+        self.growth[path] = self.growth.get(path, 0) + nodes
+        self.usage[OUTPUT_NODES] += nodes
+        self.check(OUTPUT_NODES, self.usage[OUTPUT_NODES])
@@ -0,0 +1,250 @@
+# -*- coding: utf-8 -*-
+"""\
+Tools for accessing many nodes of a list item at once.
+
+The ``bulk`` accessors read or change all the entry-points of a list item
+with a single RPC, while the ``paginate`` accessors read the items of a
+list, a page at a time.
+"""
+from .definitions import (
+    CHANGE_MANY_OP,
+    CHANGE_OP,
+    READ_MANY_OP,
+    READ_OP,
+    READ_PAGE_OP
+)
+from .masks import FIELD_KEYWORDS
+from .payloads import unwrap
+
+__author__ = "Anderson Bravalheri"
+__copyright__ = "Copyright (C) 2016 Anderson Bravalheri"
+__license__ = "mozilla"
+
+
+class BulkAccessorsMixin(object):
+    """Batch and paginated accessors for list items.
+
+    Enabled by the ``bulk`` and ``paginate`` options, respectively.
+    """
+    # pylint: disable=no-member
+
+    def _define_bulk_accessors(self, out, entries, already_created,
+                               owned=None):
+        """Define batch accessors for each keyed item.
+
+        The entry-points whose last keyed parent is the same list item
+        are accessed together, with a single ``get-many`` or ``set-many``
+        RPC. For example, consider the following YANG described structure::
+
+            list users {
+                leaf name { type string; }
+                leaf email { type string; }
+            }
+
+        The ``get-many-user`` RPC receives the ``default-identification``
+        grouping and responds with both ``name`` and ``email``, while
+        the ``set-many-user`` RPC can change any of them, responding
+        with one status for each change::
+
+            grouping user-many-status {
+                list status {
+                    key target;
+                    leaf target {
+                        type enumeration { enum name; enum email; }
+                    }
+                    uses default-response;
+                }
+            }
+
+        Arguments:
+            out (pyang_builder.StatementWrapper): output module.
+            entries (list): entry-points generated by scanner.
+            already_created (list): names of the groupings already created.
+            owned (set): ids of the entry-points of ``out``, when it is
+                a shard (see :meth:`RPCGenerator._define_entries
+                <pyang_accessors.generators.RPCGenerator._define_entries>`).
+        """
+        compose = self.name_composer
+        create = self._create_and_append_grouping
+
+        # entry-points grouped by the path of the last keyed parent
+        items = []
+        grouped = {}
+        for entry in entries:
+            if entry.own_keys:
+                continue
+            keyed_indexes = [i for (i, name) in enumerate(entry.path)
+                             if name in entry.parent_keys]
+            if not keyed_indexes:
+                continue
+            item_path = tuple(entry.path[:keyed_indexes[-1] + 1])
+            if item_path not in grouped:
+                items.append(item_path)
+                grouped[item_path] = []
+            grouped[item_path].append(entry)
+
+        if owned is not None:
+            items = [path for path in items
+                     if id(grouped[path][0]) in owned]
+        if not items:
+            return
+
+        create(out, self.failure_name,
+               self.failure_children_template, already_created)
+        create(out, self.success_name,
+               self.success_children_template, already_created)
+        create(out, self.default_response_name,
+               self._response_choice(self.success_name), already_created)
+
+        for item_path in items:
+            item_path = list(item_path)
+            item_entries = grouped[tuple(item_path)]
+            (id_group, id_content) = (
+                self._define_parent_id_grouping(item_entries[0]))
+            create(out, id_group, id_content, already_created)
+
+            # each node is wrapped in a container named after its path
+            # relative to the item
+            readable = []
+            changeable = []
+            for entry in item_entries:
+                data_group = compose(entry.path + [self.data_suffix])
+                create(out, data_group, entry.payload, already_created)
+                node = ('container', compose(entry.path[len(item_path):]), [
+                    ('uses', data_group),
+                ])
+                if READ_OP in entry.operations:
+                    readable.append(node)
+                if CHANGE_OP in entry.operations:
+                    changeable.append(node)
+
+            if readable:
+                rpc_name = compose([READ_MANY_OP] + item_path)
+                data_group = compose(
+                    item_path + [self.bulk_suffix, self.data_suffix])
+                choice_name = compose([rpc_name, self.response_suffix])
+                create(out, data_group, readable, already_created)
+                create(out, choice_name,
+                       self._response_choice(data_group), already_created)
+
+                rpc = out.rpc(rpc_name)
+                rpc.input().uses(id_group)
+                rpc.output().uses(choice_name)
+
+            if changeable:
+                rpc_name = compose([CHANGE_MANY_OP] + item_path)
+                changes_group = compose(
+                    item_path + [self.bulk_suffix, self.bulk_changes_suffix])
+                status_group = compose(
+                    item_path + [self.bulk_suffix, self.bulk_status_suffix])
+                choice_name = compose([rpc_name, self.response_suffix])
+                key_name = self.bulk_status_key_name
+                create(out, changes_group, changeable, already_created)
+                create(out, status_group, [
+                    ('list', self.bulk_status_list_name, [
+                        ('key', key_name),
+                        ('leaf', key_name, [
+                            ('type', 'enumeration', [
+                                ('enum', change[1]) for change in changeable
+                            ]),
+                        ]),
+                        ('uses', self.default_response_name),
+                    ]),
+                ], already_created)
+                create(out, choice_name,
+                       self._response_choice(status_group), already_created)
+
+                rpc = out.rpc(rpc_name)
+                request = rpc.input()
+                request.uses(id_group)
+                request.uses(changes_group)
+                rpc.output().uses(choice_name)
+
+    def _define_page_accessors(self, out, entries, already_created):
+        """Define paginated READ accessors for list items.
+
+        Each entry-point that corresponds to a list item (``atomic-item``,
+        ``include-item`` and leaf-lists) gets a ``get-page`` RPC, that
+        receives the parent keys, a limit and an opaque cursor, and responds
+        with a list of items (ordered by its keys) and the next cursor::
+
+            grouping user-page-item {
+                leaf login { type string; }
+                leaf name { type string; }
+            }
+
+            grouping user-page {
+                list user {
+                    key login;
+                    uses user-page-item;
+                }
+                leaf next-cursor { type string; }
+            }
+
+            rpc get-page-user {
+                input { uses page-request; }
+                output { uses get-page-user-response; }
+            }
+
+        The items are built from the children of the payload (the keys
+        should be direct children of the list). The own keys are added with
+        the ID Grouping if they are not in the payload (e.g. default keys).
+
+        Arguments:
+            out (pyang_builder.StatementWrapper): output module.
+            entries (list): entry-points generated by scanner.
+            already_created (list): names of the groupings already created.
+        """
+        compose = self.name_composer
+        create = self._create_and_append_grouping
+
+        for entry in entries:
+            if not entry.own_keys or READ_OP not in entry.operations:
+                continue
+            if self.budget:
+                self.budget.enter(entry.path)
+
+            rpc_name = compose([READ_PAGE_OP] + entry.path)
+            item_group = compose(entry.path + [self.page_item_suffix])
+            page_group = compose(entry.path + [self.page_suffix])
+            choice_name = compose([rpc_name, self.response_suffix])
+            (parent_id_group, parent_id_content) = (
+                self._define_parent_id_grouping(entry))
+
+            # the payload is the item wrapped in a container
+            fields = [
+                node for node in unwrap(entry.payload).substmts
+                if node.keyword in FIELD_KEYWORDS + ('choice', 'uses')
+            ]
+            item_content = [
+                ('key', ' '.join(key.arg for key in entry.own_keys)),
+                ('description', 'items ordered by their keys.'),
+            ]
+            names = set(node.arg for node in fields)
+            if any(key.arg not in names for key in entry.own_keys):
+                own_id_group = self.default_key_group_name
+                if not self._just_default_key(entry.own_keys):
+                    own_id_group = compose(
+                        entry.path + [self.self_identification_suffix])
+                create(out, own_id_group, entry.own_keys, already_created)
+                item_content.append(('uses', own_id_group))
+            item_content.append(('uses', item_group))
+
+            create(out, self.failure_name,
+                   self.failure_children_template, already_created)
+            create(out, self.page_request_name,
+                   self.page_request_template, already_created)
+            create(out, parent_id_group, parent_id_content, already_created)
+            create(out, item_group, fields, already_created)
+            create(out, page_group, [
+                ('list', entry.path[-1], item_content),
+            ] + self.page_cursor_template, already_created)
+            create(out, choice_name,
+                   self._response_choice(page_group), already_created)
+
+            rpc = out.rpc(rpc_name)
+            request = rpc.input()
+            if parent_id_group:
+                request.uses(parent_id_group)
+            request.uses(self.page_request_name)
+            rpc.output().uses(choice_name)
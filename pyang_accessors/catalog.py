@@ -0,0 +1,322 @@
+# -*- coding: utf-8 -*-
+"""\
+Tools for generating the interfaces for a catalog of YANG files.
+
+The functions in this module work with file names and strings, so they
+can be used by batch drivers running in other threads or processes.
+
+:func:`process_catalog` generates the interfaces for a whole catalog in a
+single context, in the order of the import dependencies. Each module is
+released from the context as soon as no later module imports it, so the
+memory is bounded by the dependencies alive at each moment, instead of
+by the size of the catalog.
+
+This module also provides a command line interface::
+
+    pyang-accessors-catalog -p common/ -o out/ catalog/*.yang
+"""
+from __future__ import print_function
+
+import argparse
+import gc
+import json
+import os
+import re
+import sys
+
+from pyangext.utils import create_context, parse
+
+from .generators import RPCGenerator
+
+__author__ = "Anderson Bravalheri"
+__copyright__ = "Copyright (C) 2016 Anderson Bravalheri"
+__license__ = "mozilla"
+
+COMMENT_REGEX = re.compile(r'//[^\n]*|/\*.*?\*/', re.S)
+
+HEADER_REGEX = re.compile(
+    r'\b(module|submodule|import|include)\s+["\']?([\w.-]+)')
+"""Statements that identify a module and its dependencies.
+
+The file is not parsed, so the dependencies of the whole catalog can be
+found without loading it.
+"""
+
+
+def load_module(filename, search_path=None):
+    """Parse and validate a YANG file in a new context.
+
+    The directory of the file is also used to search the imported modules.
+
+    Arguments:
+        filename (str): path of the ``.yang`` file.
+        search_path (list): directories with the imported modules.
+
+    Returns:
+        tuple: ``(ctx, module)``
+    """
+    with open(filename) as fp:
+        text = fp.read()
+
+    directories = [os.path.dirname(os.path.abspath(filename))]
+    ctx = create_context(
+        os.pathsep.join(directories + list(search_path or [])))
+    module = parse(text, ctx)
+    ctx.add_parsed_module(module)
+
+    return (ctx, module)
+
+
+def transform_file(filename, search_path=None, generator_options=None):
+    """Generate the interface module for a YANG file.
+
+    Arguments:
+        filename (str): path of the ``.yang`` file.
+        search_path (list): directories with the imported modules.
+        generator_options (dict): configuration for the
+            :class:`~pyang_accessors.generators.RPCGenerator`.
+
+    Returns:
+        str: generated module, in YANG format.
+    """
+    (ctx, module) = load_module(filename, search_path)
+    generator = RPCGenerator(ctx, **(generator_options or {}))
+
+    return generator.transform(module).dump(ctx=ctx)
+
+
+class Header(object):
+    """Name and dependencies of a YANG file.
+
+    Attributes:
+        filename (str): path of the ``.yang`` file.
+        keyword (str): ``module`` or ``submodule``.
+        name (str): name of the module.
+        dependencies (list): names of the imported/included modules.
+    """
+    __slots__ = ('filename', 'keyword', 'name', 'dependencies')
+
+    def __init__(self, filename, keyword, name, dependencies):
+        self.filename = filename
+        self.keyword = keyword
+        self.name = name
+        self.dependencies = dependencies
+
+
+def scan_header(filename):
+    """Find the name and dependencies of a YANG file, without parsing it"""
+    with open(filename) as fp:
+        text = COMMENT_REGEX.sub('', fp.read())
+
+    keyword = name = None
+    dependencies = []
+    for match in HEADER_REGEX.finditer(text):
+        (statement, arg) = match.groups()
+        if statement in ('import', 'include'):
+            if arg not in dependencies:
+                dependencies.append(arg)
+        elif name is None:
+            (keyword, name) = (statement, arg)
+
+    return Header(filename, keyword, name, dependencies)
+
+
+def import_order(headers):
+    """Sort the modules, so each one comes after its dependencies.
+
+    The original order is kept whenever possible. Modules in import cycles
+    (invalid YANG) are appended in the original order.
+
+    Arguments:
+        headers (list): :class:`Header` for each file of the catalog.
+
+    Returns:
+        list: :class:`Header` objects.
+    """
+    names = set(header.name for header in headers)
+    done = set()
+    order = []
+    remaining = list(headers)
+    while remaining:
+        blocked = []
+        for header in remaining:
+            if all(dependency in done or dependency not in names
+                   for dependency in header.dependencies):
+                done.add(header.name)
+                order.append(header)
+            else:
+                blocked.append(header)
+
+        if len(blocked) == len(remaining):
+            order.extend(blocked)
+            break
+        remaining = blocked
+
+    return order
+
+
+def last_uses(order):
+    """Index of the last module that needs each module.
+
+    Arguments:
+        order (list): :class:`Header` objects, see :func:`import_order`.
+
+    Returns:
+        dict: module name -> index in ``order``.
+    """
+    uses = {}
+    for (index, header) in enumerate(order):
+        uses[header.name] = index
+        for dependency in header.dependencies:
+            uses[dependency] = index
+
+    return uses
+
+
+def release_modules(ctx, uses, index):
+    """Remove from the context the modules not needed after ``index``.
+
+    Modules unknown to the catalog (e.g. the generated ones) are also
+    removed. If one of them is imported again, it is reloaded from the
+    search path.
+
+    Returns:
+        int: number of released modules.
+    """
+    released = [
+        key for key in ctx.modules
+        if uses.get(key[0], index) <= index
+    ]
+    for key in released:
+        del ctx.modules[key]
+
+    return len(released)
+
+
+def peak_memory():
+    """Peak resident set size of the process, in KiB.
+
+    Returns:
+        int: or ``None`` if the platform does not report it.
+    """
+    try:
+        import resource
+    except ImportError:
+        return None
+
+    usage = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+    # macOS reports bytes, other Unix systems KiB
+    return usage // 1024 if sys.platform == 'darwin' else usage
+
+
+def process_catalog(filenames, emit, search_path=None,
+                    generator_options=None):
+    """Generate the interfaces for a catalog, releasing the used modules.
+
+    All the modules share a single context, so each dependency is parsed
+    just once while it is needed. Submodules are not processed on their
+    own, just as part of the including module.
+
+    Arguments:
+        filenames (list): ``.yang`` files of the catalog.
+        emit (callable): ``emit(filename, out, ctx)`` called for each
+            module with the generated ``pyang_builder.StatementWrapper``.
+            The output should not be kept, so it can be released.
+        search_path (list): directories with the imported modules,
+            besides the directories of the catalog files.
+        generator_options (dict): configuration for the
+            :class:`~pyang_accessors.generators.RPCGenerator`.
+
+    Returns:
+        dict: ``{'modules': n, 'released': n, 'peak_memory': KiB}``
+    """
+    order = import_order([scan_header(filename) for filename in filenames])
+    uses = last_uses(order)
+
+    directories = []
+    for filename in filenames:
+        directory = os.path.dirname(os.path.abspath(filename))
+        if directory not in directories:
+            directories.append(directory)
+    ctx = create_context(
+        os.pathsep.join(directories + list(search_path or [])))
+    generator = RPCGenerator(ctx, **(generator_options or {}))
+
+    report = {'modules': 0, 'released': 0}
+    for (index, header) in enumerate(order):
+        if header.keyword == 'submodule':
+            continue
+
+        # already loaded as a dependency of a module in a cycle
+        module = ctx.get_module(header.name)
+        if module is None:
+            with open(header.filename) as fp:
+                module = parse(fp.read(), ctx)
+            ctx.add_parsed_module(module)
+
+        emit(header.filename, generator.transform(module), ctx)
+        report['modules'] += 1
+
+        del module
+        released = release_modules(ctx, uses, index)
+        if released:
+            report['released'] += released
+            # statements reference their parents, so just the cycle
+            # collector frees them
+            gc.collect()
+
+    report['peak_memory'] = peak_memory()
+
+    return report
+
+
+def parse_args(args):
+    """Parse command line parameters
+
+    Arguments:
+        args (list): command line parameters as list of strings
+
+    Returns:
+        argparse.Namespace: command line parameters
+    """
+    parser = argparse.ArgumentParser(
+        description=(
+            'Generate the interfaces for a catalog of YANG modules, '
+            'releasing each module as soon as it is not needed.'
+        ))
+    parser.add_argument('files', nargs='+', metavar='FILE',
+                        help='.yang files of the catalog')
+    parser.add_argument(
+        '-p', '--path', action='append', default=[], metavar='DIR',
+        help='directory with the imported modules (can be repeated)')
+    parser.add_argument(
+        '-o', '--output-dir', default='.', metavar='DIR',
+        help='directory for the generated modules')
+
+    return parser.parse_args(args)
+
+
+def main(args):
+    """Generate the catalog, writing a JSON report to the standard output
+
+    Returns:
+        int: ``0``
+    """
+    options = parse_args(args)
+
+    def emit(_, out, ctx):
+        """Write each generated module as ``<name>.yang``"""
+        filename = os.path.join(options.output_dir, out.unwrap().arg)
+        with open(filename + '.yang', 'w') as fp:
+            out.dump(fp, ctx=ctx)
+
+    report = process_catalog(options.files, emit, options.path)
+    print(json.dumps(report, sort_keys=True))
+
+    return 0
+
+
+def run():
+    """Entry point for console_scripts"""
+    sys.exit(main(sys.argv[1:]))
@@ -0,0 +1,122 @@
+# -*- coding: utf-8 -*-
+"""\
+Tools for the READ accessors that return just part of the data.
+
+A READ request can carry the version known by the client (conditional
+reads), so the response is just ``not-modified`` if the data did not
+change, and a field mask, so just the selected children are returned
+(see :mod:`pyang_accessors.masks`).
+"""
+from .masks import is_maskable, mask_fields, optional_refines
+
+__author__ = "Anderson Bravalheri"
+__copyright__ = "Copyright (C) 2016 Anderson Bravalheri"
+__license__ = "mozilla"
+
+
+class ConditionalReadsMixin(object):
+    """READ accessors with version tokens and field masks.
+
+    Used by :meth:`RPCGenerator._plan_accessors
+    <pyang_accessors.generators.RPCGenerator._plan_accessors>` when the
+    ``conditional_reads`` or ``field_masks`` options are set.
+    """
+    # pylint: disable=no-member
+
+    def _define_field_mask(self, entry):
+        """Define the groupings used by a READ accessor with a field mask.
+
+        The field mask is an optional ``leaf-list`` whose values are the
+        names of the children of the payload. Since any field may be
+        absent, the response uses a projection of the Data Grouping with
+        optional nodes (see :func:`~pyang_accessors.masks.optional_refines`)::
+
+            grouping admin-field-mask {
+                leaf-list fields {
+                    type enumeration { enum name; enum email; }
+                }
+            }
+
+        Arguments:
+            entry: entry-point generated by scanner.
+
+        Returns:
+            tuple: ``(mask, response)``, where both are ``(name, content)``
+                pairs for the groupings. ``mask`` is ``None`` if the
+                payload has no fields.
+        """
+        compose = self.name_composer
+        data_group = compose(entry.path + [self.data_suffix])
+        fields = mask_fields(entry.payload)
+        if not fields:
+            return (None, (data_group, entry.payload))
+
+        mask = (compose(entry.path + [self.field_mask_suffix]), [
+            ('leaf-list', self.field_mask_leaf_name, [
+                ('type', 'enumeration', [('enum', name) for name in fields]),
+                ('description',
+                 'fields to be returned. All of them if omitted.'),
+            ]),
+        ])
+
+        # the data grouping can be used directly if there is nothing
+        # to be relaxed
+        refines = optional_refines(entry.payload)
+        if not refines:
+            return (mask, (data_group, entry.payload))
+
+        response = (compose(entry.path + [self.projection_suffix]), [
+            ('uses', data_group, refines),
+        ])
+
+        return (mask, response)
+
+    def _plan_selective_read(self, entry, rpc_name, id_grouping):
+        """Plan a READ accessor with a version token or a field mask.
+
+        Arguments:
+            entry: entry-point generated by scanner.
+            rpc_name (str): name of the READ RPC.
+            id_grouping (tuple): ``(name, content)`` of the ID Grouping.
+
+        Returns:
+            tuple: ``(groupings, request, response_choice_name, response)``,
+                where ``request`` and ``response`` are ``(name, content)``
+                pairs, or ``None`` if the READ accessor is neither
+                conditional nor has a field mask.
+        """
+        compose = self.name_composer
+        (mask, projection) = (None, None)
+        if self.field_masks and is_maskable(entry.payload):
+            (mask, projection) = self._define_field_mask(entry)
+
+        if not (self.conditional_reads or mask):
+            return None
+
+        # READ request may also specify the version known by the
+        # client and the fields to be returned, so it needs its
+        # own grouping
+        (id_group, _) = id_grouping
+        groupings = [id_grouping]
+        request_content = [('uses', id_group)] if id_group else []
+        if mask:
+            groupings.append(mask)
+            request_content.append(('uses', mask[0]))
+        if self.conditional_reads:
+            groupings.extend([
+                (self.version_group_name, self.version_template),
+                (self.not_modified_name,
+                 self.not_modified_children_template),
+            ])
+            request_content.append(('uses', self.version_group_name))
+        request = (compose([rpc_name, self.request_suffix]), request_content)
+
+        # Responds with (projected) data + version or not-modified
+        data = (compose(entry.path + [self.data_suffix]), entry.payload)
+        response = data
+        if mask:
+            groupings.append(data)
+            response = projection
+
+        return (groupings, request,
+                compose([rpc_name, self.response_suffix]), response)
@@ -0,0 +1,186 @@
+# -*- coding: utf-8 -*-
+"""In-memory datastore implementing the semantics of the accessors.
+
+It can be used as a local stand-in for the real server, e.g. in
+end-to-end tests or throughput benchmarks of the accessor interface::
+
+    datastore = Datastore(iter_records(generator, module))
+    dispatcher = datastore.serve()
+    dispatcher.dispatch('add-user', {'user': {'login': 'joe'}})
+
+Data is stored as nested dicts, following the entry-point paths.
+Keyed list items are stored in dicts indexed by the tuple of key values,
+nested by the parent keys, so any item is found in ``O(path length)``.
+
+.. note:: the ``include`` modifier of a whole list produces an
+    independent entry-point (e.g. ``companies``), that is stored
+    apart from the list items (e.g. ``company``).
+"""
+from itertools import count
+
+from .definitions import CHANGE_OP, ITEM_ADD_OP, ITEM_REMOVE_OP, READ_OP
+from .dispatch import Dispatcher
+from .exceptions import DataNotFoundError
+from .filters import join_path
+
+__author__ = "Anderson Bravalheri"
+__copyright__ = "Copyright (C) 2016 Anderson Bravalheri"
+__license__ = "mozilla"
+
+
+class Datastore(object):
+    """Store the data accessed by the generated accessors.
+
+    Attributes:
+        root (dict): data tree
+        own_keys (dict): path (tuple) -> names of the keys of the items
+        default_key (str): name of the key leaf generated by the
+            ``key_template`` (see :class:`~pyang_accessors.scan.Scanner`).
+            Values for this key are generated by the ``add`` operation,
+            when not provided.
+    """
+
+    def __init__(self, records=(), default_key='id'):
+        """Prepare the datastore for the described entry-points.
+
+        Arguments:
+            records (iterable): manifest records, see
+                :meth:`RPCGenerator.describe
+                <pyang_accessors.generators.RPCGenerator.describe>`.
+            default_key (str): name of the default key
+        """
+        self.root = {}
+        self.records = list(records)
+        self.default_key = default_key
+        self.own_keys = dict(
+            (tuple(record['path']), tuple(record.get('own_keys') or ()))
+            for record in self.records
+        )
+        self.ids = count(1)
+        self.operations = {
+            READ_OP: self.get,
+            CHANGE_OP: self.set,
+            ITEM_ADD_OP: self.add,
+            ITEM_REMOVE_OP: self.remove,
+        }
+
+    def _parent(self, path, parent_keys, create=False):
+        """Find the node that contains the target of the path.
+
+        Arguments:
+            path (list): names of nodes, ordered from root to target
+            parent_keys (dict): item name -> tuple of key values
+            create (bool): create the missing nodes
+
+        Raises:
+            DataNotFoundError: if a node does not exist (and not create)
+        """
+        node = self.root
+        for name in path[:-1]:
+            # keyed items are nested under the list, by key values
+            steps = [name]
+            if name in parent_keys:
+                steps.append(parent_keys[name])
+            for step in steps:
+                child = node.get(step)
+                if child is None:
+                    if not create:
+                        raise DataNotFoundError(join_path(path), step)
+                    child = node[step] = {}
+                node = child
+
+        return node
+
+    def _items(self, path, parent_keys, create=False):
+        """Find the dict that stores the items of a list"""
+        name = path[-1]
+        parent = self._parent(path, parent_keys, create)
+        if name not in parent:
+            if not create:
+                raise DataNotFoundError(join_path(path))
+            parent[name] = {}
+
+        return parent[name]
+
+    def get(self, path, parent_keys=None, own_keys=None, payload=None):
+        """Retrieve the data for a node (READ)"""
+        # pylint: disable=unused-argument
+        name = path[-1]
+        parent_keys = parent_keys or {}
+        if self.own_keys.get(tuple(path)):
+            items = self._items(path, parent_keys)
+            if own_keys not in items:
+                raise DataNotFoundError(join_path(path), own_keys)
+            return {name: items[own_keys]}
+
+        parent = self._parent(path, parent_keys)
+        if name not in parent:
+            raise DataNotFoundError(join_path(path))
+
+        return {name: parent[name]}
+
+    def set(self, path, parent_keys=None, own_keys=None, payload=None):
+        """Replace the data for a node (CHANGE)"""
+        name = path[-1]
+        parent_keys = parent_keys or {}
+        value = (payload or {}).get(name)
+        if self.own_keys.get(tuple(path)):
+            self._items(path, parent_keys, create=True)[own_keys] = value
+        else:
+            self._parent(path, parent_keys, create=True)[name] = value
+
+        return {'ok': True}
+
+    def add(self, path, parent_keys=None, own_keys=None, payload=None):
+        """Insert an item in a list (ITEM_ADD), returning its keys.
+
+        If the default key is not specified, a new one is generated.
+        """
+        name = path[-1]
+        key_names = self.own_keys[tuple(path)]
+        value = dict((payload or {}).get(name) or {})
+
+        if key_names == (self.default_key,) and (
+                not own_keys or own_keys[0] is None):
+            value[self.default_key] = next(self.ids)
+
+        own_keys = tuple(value.get(key) for key in key_names)
+        self._items(path, parent_keys or {}, create=True)[own_keys] = value
+
+        return dict(zip(key_names, own_keys))
+
+    def remove(self, path, parent_keys=None, own_keys=None, payload=None):
+        """Remove an item from a list (ITEM_REMOVE), returning its data"""
+        # pylint: disable=unused-argument
+        items = self._items(path, parent_keys or {})
+        if own_keys not in items:
+            raise DataNotFoundError(join_path(path), own_keys)
+
+        return {path[-1]: items.pop(own_keys)}
+
+    def serve(self, dispatcher=None):
+        """Register the datastore as handler for all the accessors.
+
+        Arguments:
+            dispatcher (pyang_accessors.dispatch.Dispatcher): dispatch table
+                **(optional)**. If not provided, a new one is compiled
+                from the records.
+
+        Returns:
+            pyang_accessors.dispatch.Dispatcher
+        """
+        dispatcher = dispatcher or Dispatcher(self.records)
+        for accessor in dispatcher.accessors():
+            if accessor.operation not in self.operations:
+                continue
+            dispatcher.register(
+                accessor.operation, accessor.path,
+                self._handler(accessor.operation, list(accessor.path)))
+
+        return dispatcher
+
+    def _handler(self, operation, path):
+        """Bind an operation to a path"""
+        method = self.operations[operation]
+        return lambda parent_keys, own_keys, payload: method(
+            path, parent_keys, own_keys, payload)
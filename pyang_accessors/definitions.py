@@ -19,6 +19,26 @@ ITEM_ADD_OP = 'add'
 ITEM_REMOVE_OP = 'remove'
 """``remove`` operation -  removes a child from a node"""
 
+SUBSCRIBE_OP = 'subscribe'
+"""``subscribe`` operation - receive a notification when a node changes"""
+
+UNSUBSCRIBE_OP = 'unsubscribe'
+"""``unsubscribe`` operation - stop receiving the change notifications"""
+
+# -- Bulk operations
+
+READ_MANY_OP = 'get-many'
+"""``get-many`` operation - reads all the nodes under a list item"""
+
+CHANGE_MANY_OP = 'set-many'
+"""``set-many`` operation - changes several nodes under a list item"""
+
+READ_PAGE_OP = 'get-page'
+"""``get-page`` operation - reads a limited number of items of a list"""
+
+LIST_KEYS_OP = 'list'
+"""``list`` operation - enumerates the keys of the items of a list"""
+
 # -- Extension
 
 MODIFIER_EXT = 'modifier'
@@ -75,7 +95,48 @@ adds ``add`` and ``remove`` operations.
 See :data:`INCLUDE`.
 """
 
+OBSERVABLE = 'observable'
+"""Value for ``pyang-accessor`` YANG modifier keyword.
+
+Add ``subscribe`` and ``unsubscribe`` operations to the entry-points
+of the node and its descendants. A notification is sent to the
+subscribers when the data of an entry-point changes.
+"""
+
 ITEM_NAME = 'item-name'
 """Name for an item of a list.
 The default behavior is assume the singularized list name.
 """
+
+DEPTH_EXT = 'depth'
+"""``pyang-accessor`` YANG extension keyword.
+
+Maximum number of levels of descendants copied into the payload of a
+node with the ``include`` or ``include-item`` modifier.
+
+Containers and lists deeper than this limit are removed from the
+payload, but can still be accessed through their own accessors.
+"""
+
+# -- Output modes
+
+ACCESSORS_MODE = 'accessors'
+"""Output mode with one RPC for each operation of each entry-point.
+
+This is the default behavior, e.g. ``get-username``, ``set-username``.
+"""
+
+GENERIC_MODE = 'generic'
+"""Output mode with a small fixed set of RPCs, one for each operation.
+
+The target entry-point is selected by a path argument, e.g. the
+``get`` RPC with ``path = username``.
+"""
+
+# -- Path selectors (generic mode)
+
+ENUMERATION_SELECTOR = 'enumeration'
+"""Paths are selected by an enumeration typedef, one ``enum`` per path"""
+
+IDENTITY_SELECTOR = 'identity'
+"""Paths are selected by an identityref, one ``identity`` per path"""
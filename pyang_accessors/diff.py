@@ -0,0 +1,267 @@
+# -*- coding: utf-8 -*-
+"""\
+Tools for comparing the accessors generated for two module revisions.
+
+The comparison is based on the manifest records (see
+:mod:`pyang_accessors.manifest`), indexed by module name and path: the
+entry-points are compared by operations and key signature, without
+generating or dumping the output modules. Since manifests for a whole
+catalog can be compared, just the affected handlers need to be
+redeployed when a new revision lands.
+
+This module also provides a command line interface::
+
+    pyang-accessors-diff old-revision.yang new-revision.yang
+    pyang-accessors-diff old-catalog.jsonl new-catalog.jsonl
+"""
+from __future__ import print_function
+
+import argparse
+import json
+import sys
+
+from .catalog import load_module
+from .filters import join_path
+from .generators import RPCGenerator
+from .manifest import iter_records, load_manifest
+
+__author__ = "Anderson Bravalheri"
+__copyright__ = "Copyright (C) 2016 Anderson Bravalheri"
+__license__ = "mozilla"
+
+ADDED = 'added'
+REMOVED = 'removed'
+CHANGED = 'changed'
+
+SYMBOLS = {ADDED: '+', REMOVED: '-', CHANGED: '~'}
+"""Symbol used to represent each kind of change in the text output"""
+
+
+def key_signature(record):
+    """Keys needed to reach the entry-point, in the order of the path.
+
+    Arguments:
+        record (dict): manifest record.
+
+    Returns:
+        list: ``[item_name, [key_names]]`` for each keyed parent, followed
+            by ``[target_name, [own_key_names]]`` if the target has keys.
+    """
+    parent_keys = record['parent_keys']
+    signature = [
+        [name, list(parent_keys[name])]
+        for name in record['path'] if name in parent_keys
+    ]
+    if record['own_keys']:
+        signature.append([record['path'][-1], list(record['own_keys'])])
+
+    return signature
+
+
+class Change(object):
+    """Difference between the accessors for an entry-point.
+
+    Attributes:
+        kind (str): ``added``, ``removed`` or ``changed``.
+        module (str): name of the original module.
+        path (list): path of the entry-point.
+        added_operations (list): operations available just in the new
+            revision.
+        removed_operations (list): operations available just in the old
+            revision.
+        old_keys (list): key signature in the old revision.
+        new_keys (list): key signature in the new revision.
+    """
+    __slots__ = ('kind', 'module', 'path',
+                 'added_operations', 'removed_operations',
+                 'old_keys', 'new_keys')
+
+    def __init__(self, kind, module, path,
+                 added_operations=(), removed_operations=(),
+                 old_keys=None, new_keys=None):
+        self.kind = kind
+        self.module = module
+        self.path = path
+        self.added_operations = sorted(added_operations)
+        self.removed_operations = sorted(removed_operations)
+        self.old_keys = old_keys
+        self.new_keys = new_keys
+
+    def to_dict(self):
+        """JSON serializable representation"""
+        return dict((attr, getattr(self, attr)) for attr in self.__slots__)
+
+    def __str__(self):
+        """Single line representation"""
+        text = '{} {}:{}'.format(
+            SYMBOLS[self.kind], self.module, join_path(self.path))
+        details = []
+        if self.added_operations:
+            details.append('+' + ',+'.join(self.added_operations))
+        if self.removed_operations:
+            details.append('-' + ',-'.join(self.removed_operations))
+        if self.old_keys != self.new_keys and self.kind == CHANGED:
+            details.append('keys {} -> {}'.format(
+                json.dumps(self.old_keys), json.dumps(self.new_keys)))
+
+        return text + (' ' + ' '.join(details) if details else '')
+
+
+def compare_records(old, new):
+    """Compare the records of the same entry-point in two revisions.
+
+    Returns:
+        Change: or ``None`` if the accessors are equivalent.
+    """
+    old_operations = set(old['operations'])
+    new_operations = set(new['operations'])
+    old_keys = key_signature(old)
+    new_keys = key_signature(new)
+
+    if old_operations == new_operations and old_keys == new_keys:
+        return None
+
+    return Change(
+        CHANGED, new['module'], new['path'],
+        new_operations - old_operations, old_operations - new_operations,
+        old_keys, new_keys)
+
+
+def diff_records(old_records, new_records):
+    """Compare two sets of manifest records.
+
+    Just the old records are kept in memory, the new ones are consumed
+    one by one.
+
+    Arguments:
+        old_records (iterable): records for the old revision(s).
+        new_records (iterable): records for the new revision(s).
+
+    Returns:
+        list: :class:`Change` objects, sorted by module and path.
+    """
+    index = dict(
+        ((record['module'], tuple(record['path'])), record)
+        for record in old_records
+    )
+
+    changes = []
+    for record in new_records:
+        old = index.pop((record['module'], tuple(record['path'])), None)
+        if old is None:
+            changes.append(Change(
+                ADDED, record['module'], record['path'],
+                added_operations=record['operations'],
+                new_keys=key_signature(record)))
+            continue
+
+        change = compare_records(old, record)
+        if change is not None:
+            changes.append(change)
+
+    changes.extend(
+        Change(REMOVED, record['module'], record['path'],
+               removed_operations=record['operations'],
+               old_keys=key_signature(record))
+        for record in index.values()
+    )
+
+    return sorted(changes, key=lambda change: (change.module, change.path))
+
+
+def diff_modules(generator, old_module, new_module):
+    """Compare the accessors generated for two revisions of a module.
+
+    Arguments:
+        generator (pyang_accessors.generators.RPCGenerator):
+            Generator whose configuration will be used to scan both
+            modules.
+        old_module (pyang.statements.Statement): old revision.
+        new_module (pyang.statements.Statement): new revision.
+
+    Returns:
+        list: :class:`Change` objects, see :func:`diff_records`.
+    """
+    return diff_records(
+        iter_records(generator, old_module),
+        iter_records(generator, new_module))
+
+
+def load_records(filename, search_path=None):
+    """Lazily read the records from a manifest or scan a YANG file.
+
+    Just the old records are held by :func:`diff_records`, the new ones
+    are compared as soon as they are produced.
+
+    Arguments:
+        filename (str): ``.jsonl`` manifest or ``.yang`` module.
+        search_path (list): directories with the imported modules.
+
+    Yields:
+        dict: manifest record, as soon as it is read (or produced).
+    """
+    if not filename.endswith('.yang'):
+        with open(filename) as fp:
+            for record in load_manifest(fp):
+                yield record
+        return
+
+    # each revision needs its own context, since the modules have the
+    # same name
+    (ctx, module) = load_module(filename, search_path)
+
+    for record in iter_records(RPCGenerator(ctx), module):
+        yield record
+
+
+def parse_args(args):
+    """Parse command line parameters
+
+    Arguments:
+        args (list): command line parameters as list of strings
+
+    Returns:
+        argparse.Namespace: command line parameters
+    """
+    parser = argparse.ArgumentParser(
+        description=(
+            'Compare the accessors generated for two revisions of YANG '
+            'modules (or two manifests produced with the '
+            '`rpc-accessors-manifest` format).'
+        ))
+    parser.add_argument('old', help='old revision: .yang or .jsonl file')
+    parser.add_argument('new', help='new revision: .yang or .jsonl file')
+    parser.add_argument(
+        '-p', '--path', action='append', default=[], metavar='DIR',
+        help='directory with the imported modules (can be repeated)')
+    parser.add_argument(
+        '--json', action='store_true', default=False,
+        help='write one JSON object for each change')
+
+    return parser.parse_args(args)
+
+
+def main(args):
+    """Compare two revisions, writing the changes to the standard output
+
+    Returns:
+        int: ``0`` if there are no changes, ``1`` otherwise
+            (as the ``diff`` command).
+    """
+    options = parse_args(args)
+    changes = diff_records(
+        load_records(options.old, options.path),
+        load_records(options.new, options.path))
+
+    for change in changes:
+        if options.json:
+            print(json.dumps(change.to_dict(), sort_keys=True))
+        else:
+            print(change)
+
+    return 1 if changes else 0
+
+
+def run():
+    """Entry point for console_scripts"""
+    sys.exit(main(sys.argv[1:]))
@@ -0,0 +1,263 @@
+# -*- coding: utf-8 -*-
+"""Runtime dispatch of the generated accessors to handler functions.
+
+The dispatch table is compiled from the manifest records (see
+:mod:`pyang_accessors.manifest`), so there is no need to parse YANG
+at runtime. Accessors are indexed both by RPC name (dict) and by
+``(operation, path)`` (trie), so resolving them does not depend on the
+number of accessors, just on the path length.
+
+Example::
+
+    dispatcher = Dispatcher.from_manifest(open('module.jsonl'))
+
+    @dispatcher.handler('get', 'user/name')
+    def get_user_name(parent_keys, own_keys, payload):
+        (login,) = parent_keys['user']
+        return {'name': USERS[login]['name']}
+
+    dispatcher.dispatch('get-user-name', {'login': 'joe'})
+"""
+from .exceptions import UnknownAccessorError
+from .filters import join_path, split_path
+from .manifest import load_manifest
+
+__author__ = "Anderson Bravalheri"
+__copyright__ = "Copyright (C) 2016 Anderson Bravalheri"
+__license__ = "mozilla"
+
+
+class PathTrie(object):
+    """Prefix tree indexed by the segments of a path.
+
+    Attributes:
+        children (dict): segment -> :class:`PathTrie`
+        value: object stored for the path that ends in this node
+    """
+    __slots__ = ('children', 'value')
+
+    def __init__(self):
+        """Create an empty node"""
+        self.children = {}
+        self.value = None
+
+    def node(self, path, create=False):
+        """Find the node for a path.
+
+        Arguments:
+            path (list): segments of the path
+            create (bool): create the missing nodes
+
+        Returns:
+            PathTrie: ``None`` if not found
+        """
+        node = self
+        for segment in path:
+            child = node.children.get(segment)
+            if child is None:
+                if not create:
+                    return None
+                child = node.children[segment] = type(self)()
+            node = child
+
+        return node
+
+    def insert(self, path, value):
+        """Store a value for the path"""
+        self.node(path, create=True).value = value
+
+    def lookup(self, path):
+        """Retrieve the value stored for the path (or ``None``)"""
+        node = self.node(path)
+        return node and node.value
+
+
+class Accessor(object):
+    """Compiled accessor, that unpacks the request keys for the handler.
+
+    Attributes:
+        operation (str): name of the operation.
+            See :mod:`pyang_accessors.definitions`
+        path (tuple): names of nodes, ordered from root to target
+        rpc_name (str): name of the generated RPC
+        parent_fields (tuple): ``(item_name, leaf_names)`` for each keyed
+            parent, in the order they appear in the path
+        own_fields (tuple): names of the request leafs with own keys
+        own_data_keys (tuple): names of the own keys inside the data
+            container, used when they are not part of the identification
+            (CHANGE and ITEM_ADD requests)
+        handler (callable): function that implements the accessor.
+            It is called as ``handler(parent_keys, own_keys, payload)``,
+            where ``parent_keys`` is a dict ``item name -> tuple of key
+            values``, ``own_keys`` is a tuple and ``payload`` is the
+            request without the parent keys.
+    """
+    __slots__ = ('operation', 'path', 'rpc_name', 'parent_fields',
+                 'own_fields', 'own_data_keys', 'handler')
+
+    def __init__(self, operation, path, rpc_name, keys, own_keys=()):
+        """Group the key leafs by item.
+
+        Arguments:
+            operation (str): name of the operation.
+            path (list): names of nodes, ordered from root to target
+            rpc_name (str): name of the generated RPC
+            keys (list): ``[item, key, leaf]`` lists, as in the manifest
+            own_keys (list): names of the keys of the target item
+        """
+        self.operation = operation
+        self.path = tuple(path)
+        self.rpc_name = rpc_name
+        self.handler = None
+
+        items = []
+        fields = {}
+        for (item, _, leaf) in keys:
+            if item not in fields:
+                items.append(item)
+                fields[item] = []
+            fields[item].append(leaf)
+
+        own_item = self.path[-1] if own_keys else None
+        self.own_fields = tuple(fields.pop(own_item, ()))
+        self.own_data_keys = () if self.own_fields else tuple(own_keys)
+        self.parent_fields = tuple(
+            (item, tuple(fields[item])) for item in items if item in fields)
+
+    def __repr__(self):
+        """String representation for debugging support"""
+        return '<{}.{} {} {} ({})>'.format(
+            self.__module__, self.__class__.__name__,
+            self.operation, join_path(self.path), self.rpc_name)
+
+    def unpack(self, request):
+        """Split the request in parent keys, own keys and payload."""
+        payload = dict(request or {})
+        parent_keys = {}
+        for (item, leafs) in self.parent_fields:
+            parent_keys[item] = tuple(payload.pop(leaf, None)
+                                      for leaf in leafs)
+
+        # own keys are part of the data in CHANGE and ITEM_ADD requests,
+        # inside the container named after the item
+        if self.own_fields:
+            own_keys = tuple(payload.get(leaf) for leaf in self.own_fields)
+        else:
+            data = payload.get(self.path[-1]) or {}
+            own_keys = tuple(data.get(key) for key in self.own_data_keys)
+
+        return (parent_keys, own_keys, payload)
+
+    def __call__(self, request=None):
+        """Invoke the handler with the unpacked request"""
+        if self.handler is None:
+            raise UnknownAccessorError(
+                'No handler registered for {!r}'.format(self))
+
+        return self.handler(*self.unpack(request))
+
+
+class Dispatcher(object):
+    """Resolve RPC names or ``(operation, path)`` to handler functions.
+
+    Attributes:
+        by_name (dict): RPC name -> :class:`Accessor`
+        trie (PathTrie): path -> dict (operation -> :class:`Accessor`)
+    """
+
+    def __init__(self, records=()):
+        """Compile the dispatch table.
+
+        Arguments:
+            records (iterable): manifest records, see
+                :meth:`RPCGenerator.describe
+                <pyang_accessors.generators.RPCGenerator.describe>`.
+        """
+        self.by_name = {}
+        self.trie = PathTrie()
+        for record in records:
+            self.add(record)
+
+    @classmethod
+    def from_manifest(cls, fp):
+        """Compile the dispatch table from a manifest file"""
+        return cls(load_manifest(fp))
+
+    @classmethod
+    def from_entries(cls, generator, entries):
+        """Compile the dispatch table from scanned entry-points.
+
+        Arguments:
+            generator (pyang_accessors.generators.RPCGenerator):
+                Generator whose naming rules will be used.
+            entries (list): :class:`~pyang_accessors.scan.EntryPoint`
+                elements.
+        """
+        return cls(generator.describe(entry) for entry in entries)
+
+    def add(self, record):
+        """Add the accessors described by a manifest record"""
+        path = record['path']
+        own_keys = record.get('own_keys') or ()
+
+        node = self.trie.node(path, create=True)
+        if node.value is None:
+            node.value = {}
+
+        for (operation, rpc) in record['rpcs'].items():
+            accessor = Accessor(
+                operation, path, rpc['name'], rpc['keys'], own_keys)
+            node.value[operation] = accessor
+            self.by_name[rpc['name']] = accessor
+
+    def resolve(self, operation, path):
+        """Find the accessor for an operation over a path.
+
+        Arguments:
+            operation (str): name of the operation, e.g. ``get``
+            path (str or list): ``/`` separated string or list of names
+
+        Raises:
+            UnknownAccessorError: if there is no accessor
+        """
+        accessors = self.trie.lookup(split_path(path)) or {}
+        accessor = accessors.get(operation)
+        if accessor is None:
+            raise UnknownAccessorError(
+                'No accessor for {} {}'.format(operation, path))
+
+        return accessor
+
+    def resolve_name(self, rpc_name):
+        """Find the accessor for a RPC name.
+
+        Raises:
+            UnknownAccessorError: if there is no accessor
+        """
+        accessor = self.by_name.get(rpc_name)
+        if accessor is None:
+            raise UnknownAccessorError('No accessor named ' + rpc_name)
+
+        return accessor
+
+    def register(self, operation, path, handler):
+        """Associate a handler with the accessor."""
+        self.resolve(operation, path).handler = handler
+        return handler
+
+    def handler(self, operation, path):
+        """Decorator version of :meth:`register`"""
+        return lambda fn: self.register(operation, path, fn)
+
+    def dispatch(self, rpc_name, request=None):
+        """Invoke the handler of a RPC, passing the unpacked keys"""
+        return self.resolve_name(rpc_name)(request)
+
+    def dispatch_path(self, operation, path, request=None):
+        """Invoke the handler of an operation over a path"""
+        return self.resolve(operation, path)(request)
+
+    def accessors(self):
+        """Iterate over all the accessors, sorted by RPC name"""
+        for name in sorted(self.by_name):
+            yield self.by_name[name]
@@ -0,0 +1,116 @@
+# -*- coding: utf-8 -*-
+"""\
+Tools for estimating the size of the output module without building it.
+
+The estimate is based on the names and contents planned by the generator
+for each accessor (see :meth:`RPCGenerator.estimate
+<pyang_accessors.generators.RPCGenerator.estimate>`). The number of
+statements is exact for the accessors, while the number of bytes is an
+approximation of the YANG text.
+"""
+import json
+
+__author__ = "Anderson Bravalheri"
+__copyright__ = "Copyright (C) 2016 Anderson Bravalheri"
+__license__ = "mozilla"
+
+INDENT = 2
+"""Number of spaces used for each level of indentation"""
+
+NODE_OVERHEAD = 6
+"""Bytes of each statement besides keyword, argument and indentation.
+
+Accounts for separators, quotes, braces and line breaks.
+"""
+
+
+class Estimate(object):
+    """Counters for a part of the output module.
+
+    Attributes:
+        entries (int): number of entry-points.
+        rpcs (int): number of ``rpc`` statements.
+        groupings (int): number of ``grouping`` statements.
+        nodes (int): total number of statements.
+        size (int): approximated number of bytes.
+    """
+    __slots__ = ('entries', 'rpcs', 'groupings', 'nodes', 'size')
+
+    def __init__(self):
+        self.entries = 0
+        self.rpcs = 0
+        self.groupings = 0
+        self.nodes = 0
+        self.size = 0
+
+    def add(self, other):
+        """Accumulate the counters of other estimate"""
+        for attr in self.__slots__:
+            setattr(self, attr, getattr(self, attr) + getattr(other, attr))
+
+        return self
+
+    def add_node(self, content, depth=1):
+        """Accumulate the size of a node (or list of nodes)"""
+        (nodes, size) = content_size(content, depth)
+        self.nodes += nodes
+        self.size += size
+
+    def to_dict(self):
+        """JSON serializable representation"""
+        return dict((attr, getattr(self, attr)) for attr in self.__slots__)
+
+
+def content_size(content, depth=1):
+    """Count the statements and bytes of a content, without copying it.
+
+    Arguments:
+        content: ``pyang`` statement, builder wrapper, tuple in the form
+            ``(keyword, arg, children)`` or a list of these elements.
+        depth (int): indentation level of the content.
+
+    Returns:
+        tuple: ``(nodes, size)``
+    """
+    nodes = 0
+    size = 0
+    stack = [(content, depth)]
+    while stack:
+        (node, level) = stack.pop()
+        if node is None:
+            continue
+        if hasattr(node, 'unwrap'):
+            node = node.unwrap()
+
+        if isinstance(node, list):
+            stack.extend((child, level) for child in node)
+            continue
+
+        if isinstance(node, tuple):
+            keyword = node[0]
+            arg = node[1] if len(node) > 1 else None
+            children = node[2] if len(node) > 2 else []
+        else:
+            (keyword, arg, children) = (node.keyword, node.arg, node.substmts)
+
+        nodes += 1
+        size += (level * INDENT + len(keyword) + len(arg or '') +
+                 NODE_OVERHEAD)
+        stack.extend((child, level + 1) for child in children)
+
+    return (nodes, size)
+
+
+def rpc_content(rpc_name, request_name, response_name):
+    """Tuple representation of a RPC that uses the given groupings"""
+    children = [('output', None, [('uses', response_name)])]
+    if request_name:
+        children.insert(0, ('input', None, [('uses', request_name)]))
+
+    return ('rpc', rpc_name, children)
+
+
+def dump_estimate(report, fp):
+    """Write the report produced by ``RPCGenerator.estimate`` as JSON"""
+    fp.write(json.dumps(report, indent=2, sort_keys=True))
+    fp.write('\n')
@@ -10,3 +10,59 @@ __license__ = "mozilla"
 class YangImportError(ImportError):
     """Unable to import the specified module"""
     pass
+
+
+class UnknownAccessorError(LookupError):
+    """No accessor (or handler) was found for the specified operation"""
+    pass
+
+
+class DataNotFoundError(KeyError):
+    """The requested node does not exist in the datastore"""
+    pass
+
+
+class DefinitionConflictError(ValueError):
+    """Submodules define different statements with the same name.
+
+    Attributes:
+        keyword (str): ``grouping``, ``typedef`` or ``identity``.
+        name (str): name of the definition.
+        shards (list): names of the submodules with different definitions.
+    """
+
+    def __init__(self, keyword, name, shards=()):
+        self.keyword = keyword
+        self.name = name
+        self.shards = list(shards)
+
+        super(DefinitionConflictError, self).__init__(
+            'Conflicting definitions for {} {} in: {}'.format(
+                keyword, name, ', '.join(self.shards)))
+
+
+class BudgetExceededError(RuntimeError):
+    """The generation would exceed one of the configured budgets.
+
+    Attributes:
+        budget (str): name of the exceeded budget.
+        limit (int): configured limit.
+        value (int): value that exceeded the limit.
+        paths (list): ``(path, amount)`` for the paths that contributed
+            the most to the growth of the output, in decreasing order.
+    """
+
+    def __init__(self, budget, limit, value, paths=()):
+        self.budget = budget
+        self.limit = limit
+        self.value = value
+        self.paths = list(paths)
+
+        message = 'Budget exceeded: {} = {} (limit: {})'.format(
+            budget, value, limit)
+        if self.paths:
+            message += '. Main contributors: ' + ', '.join(
+                '{} (+{})'.format(path, nodes)
+                for (path, nodes) in self.paths)
+
+        super(BudgetExceededError, self).__init__(message)
@@ -0,0 +1,141 @@
+# -*- coding: utf-8 -*-
+"""Tools for restricting the accessors produced by the scanner.
+
+Paths are matched against glob patterns, segment by segment, e.g.
+``user/*`` or ``interfaces/**/counters``. The special segment ``**``
+matches zero or more segments.
+
+A pattern selects a whole subtree: if ``user`` matches, then
+``user/name`` and ``user/address/street`` also match.
+"""
+from fnmatch import fnmatchcase
+
+__author__ = "Anderson Bravalheri"
+__copyright__ = "Copyright (C) 2016 Anderson Bravalheri"
+__license__ = "mozilla"
+
+PATH_SEPARATOR = '/'
+"""Separator used to join the names in an entry-point path"""
+
+RECURSIVE_WILDCARD = '**'
+"""Pattern segment that matches zero or more path segments"""
+
+
+def split_path(path):
+    """Split a ``/`` separated path into segments.
+
+    Lists and tuples are considered already split.
+    """
+    if isinstance(path, (list, tuple)):
+        return list(path)
+
+    return [segment for segment in path.split(PATH_SEPARATOR) if segment]
+
+
+def join_path(path):
+    """Join the segments of a path with ``/``"""
+    return PATH_SEPARATOR.join(path)
+
+
+def compile_pattern(pattern):
+    """Split a pattern in segments, extending it to the entire subtree."""
+    segments = split_path(pattern)
+    if not segments or segments[-1] != RECURSIVE_WILDCARD:
+        segments.append(RECURSIVE_WILDCARD)
+
+    return tuple(segments)
+
+
+def match_segments(pattern, path, partial=False):
+    """Match a list of path segments against a compiled pattern.
+
+    Arguments:
+        pattern (tuple): segments produced by :func:`compile_pattern`.
+        path (list): names of nodes, ordered from root to target
+        partial (bool): when the path is exhausted before the pattern,
+            consider it a match, since a descendant may still match.
+
+    Returns:
+        bool
+    """
+    if not pattern:
+        return not path
+
+    if not path:
+        return partial or all(
+            segment == RECURSIVE_WILDCARD for segment in pattern)
+
+    head = pattern[0]
+    if head == RECURSIVE_WILDCARD:
+        return (
+            match_segments(pattern[1:], path, partial) or
+            match_segments(pattern, path[1:], partial)
+        )
+
+    return (
+        fnmatchcase(path[0], head) and
+        match_segments(pattern[1:], path[1:], partial)
+    )
+
+
+class PathFilter(object):
+    """Decide which entry-points and operations should be produced.
+
+    Attributes:
+        include (list): compiled patterns for the selected subtrees.
+            When empty, everything is selected.
+        exclude (list): compiled patterns for the ignored subtrees.
+        operations (list): names of the allowed operations.
+            When empty, every operation is allowed.
+            See :mod:`pyang_accessors.definitions`
+    """
+
+    def __init__(self, include=None, exclude=None, operations=None):
+        """Compile the patterns.
+
+        Arguments:
+            include (list): glob patterns (strings or lists of segments)
+            exclude (list): glob patterns (strings or lists of segments)
+            operations (list): allowed operation names
+        """
+        self.include = [compile_pattern(p) for p in (include or [])]
+        self.exclude = [compile_pattern(p) for p in (exclude or [])]
+        self.operations = list(operations or [])
+
+    def __bool__(self):
+        """A filter without restrictions is considered empty"""
+        return bool(self.include or self.exclude or self.operations)
+
+    __nonzero__ = __bool__
+
+    def excludes(self, path):
+        """Check if the path is inside an excluded subtree."""
+        return any(match_segments(p, path) for p in self.exclude)
+
+    def selects(self, path):
+        """Check if an entry-point with the given path should be produced."""
+        path = split_path(path)
+        if self.excludes(path):
+            return False
+
+        return not self.include or any(
+            match_segments(p, path) for p in self.include)
+
+    def explores(self, path):
+        """Check if the subtree under the given path should be traversed.
+
+        A subtree is traversed if any of its descendants can be selected.
+        """
+        path = split_path(path)
+        if self.excludes(path):
+            return False
+
+        return not self.include or any(
+            match_segments(p, path, partial=True) for p in self.include)
+
+    def allowed(self, operations):
+        """Restrict a list of operations to the allowed ones"""
+        if not self.operations:
+            return list(operations)
+
+        return [op for op in operations if op in self.operations]
@@ -1,105 +1,58 @@
 # -*- coding: utf-8 -*-
 """\
 Tools for generating a RPC specification from a YANG abstract syntax tree.
+
+The optional accessor families are defined in their own modules (e.g.
+:mod:`pyang_accessors.bulk`) and mixed into :class:`RPCGenerator`.
 """
 from inflection import dasherize
 
-from pyang.util import prefix_to_modulename_and_revision
 from pyang_builder import Builder
-from pyangext.definitions import HEADER_STATEMENTS, PREFIX_SEPARATOR
-from pyangext.utils import create_context, qualify_str
-
-from .definitions import CHANGE_OP, ITEM_ADD_OP, ITEM_REMOVE_OP, READ_OP
-from .predicates import has_prefixed_arg, is_custom_type, is_extension
+from pyangext.definitions import HEADER_STATEMENTS
+from pyangext.utils import create_context
+
+from .budgets import Budget
+from .bulk import BulkAccessorsMixin
+from .conditional import ConditionalReadsMixin
+from .definitions import (
+    ACCESSORS_MODE,
+    CHANGE_OP,
+    ENUMERATION_SELECTOR,
+    GENERIC_MODE,
+    ITEM_ADD_OP,
+    ITEM_REMOVE_OP,
+    READ_OP
+)
+from .estimate import Estimate, content_size, rpc_content
+from .filters import PathFilter
+from .generic import GenericAccessorsMixin
+from .identification import IdentificationMixin
+from .keys import KeyAccessorsMixin
+from .manifest import DescribeMixin
+from .normalize import Normalizer
+from .predicates import is_list
 from .registry import ImportRegistry
-from .scan import Scanner
+from .scan import SUBSCRIPTION_OPS, Scanner, find_item_name
+from .shards import move_shared_definitions, partition_entries
+from .subscriptions import SubscriptionsMixin
 
 __author__ = "Anderson Bravalheri"
 __copyright__ = "andersonbravalheri@gmail.com"
 __license__ = "mozilla"
 
 
-class Normalizer(object):
-    """Walk the AST finding external dependencies, prefixing and importing it.
-    """
-
-    def __init__(self, ctx, registry):
-        """Creates a Normalizer object
-
-        Arguments:
-            ctx (pyang.Context): Context to be used for prefix resolution.
-            registry (ImportRegistry): New imports that should be used.
-        """
-        self.ctx = ctx
-        self.registry = registry
-
-    def namespaced_attribute(self, node, attr):
-        """Re-prefix attr in node with a valid and unique prefix.
-
-        Arguments:
-            node (pyang.statements.Statement):
-                Node whose attr will be re-prefixed.
-            attr (str): Name of the attribute to be re-prefixed,
-                e.g.: arg, keyword.
-
-        Returns:
-            tuple: (node, new_prefix, mod_name, mod_revision, attr_value)
-        """
-        # 1st: split attr in (current prefix, attr unprefixed name)
-        (prefix, value) = qualify_str(getattr(node, attr))
-
-        # 2nd: find module name and revision
-        (name, revision) = prefix_to_modulename_and_revision(
-            getattr(node, 'i_orig_module', node.i_module),
-            prefix, node.pos, self.ctx.errors)
-
-        if not prefix:
-            prefix = node.i_module.i_prefix
-
-        # 3rd: add module to the import list and retrieve a new unique prefix
-        prefix = self.registry.add(prefix, name, revision)
-
-        # 4th: Change the node itself to use the new prefix!
-        setattr(node, attr, PREFIX_SEPARATOR.join((prefix, value)))
-
-        return (node, prefix, name, revision, value)
-
-    def extension(self, node):
-        """Re-prefix extension to be used in a new module."""
-        node, prefix, name, _, value = self.namespaced_attribute(
-            node, 'raw_keyword')
-
-        node.keyword = (name, value)
-        node.raw_keyword = (prefix, value)
-
-        return node
-
-    def prefixed_arg(self, node):
-        """Re-prefix arg to be used in a new module."""
-        node, _, _, _, _ = self.namespaced_attribute(node, 'arg')
+def linkage_position(module):
+    """Position where ``import`` and ``include`` nodes should be placed.
 
-        return node
-
-    def external_definitions(self, parent):
-        """Walk AST finding nodes that should be re-prefixed.
-
-        This allows these nodes to be used in other modules.
-
-        The nodes that should be re-prefixed are extensions, typedefs
-        and other nodes with prefixed args (if-feature for example).
-
-        Argument:
-            parent (pyang_builder.StatementWrapper):
-                Node from where the recursive search will be conducted.
-        """
-        # since custom type become a prefixed arg, do not run it before
-        # prefixed arg hook
-        parent.walk(has_prefixed_arg, self.prefixed_arg)
-        parent.walk(is_custom_type, self.prefixed_arg)
-        parent.walk(is_extension, self.extension)
+    Linkage statements should be placed after the ``namespace`` and
+    ``prefix`` of a module, or after the ``belongs-to`` of a submodule.
+    """
+    return 1 if module.keyword == 'submodule' else 2
 
 
-class RPCGenerator(object):
+class RPCGenerator(IdentificationMixin, ConditionalReadsMixin,
+                   GenericAccessorsMixin, BulkAccessorsMixin,
+                   KeyAccessorsMixin, SubscriptionsMixin, DescribeMixin):
     """Generates a YANG specification of RPC service based on an input module.
 
     This service provides ways of changing the deep-most
@@ -115,6 +68,10 @@ class RPCGenerator(object):
     - an **ITEM ADD** accessor, to add elements to a list,
     - an **ITEM_REMOVE** accessor, to remove elements from a list.
 
+    Nodes marked as ``observable`` (or all of them, with the ``subscribe``
+    option) also have **SUBSCRIBE** and **UNSUBSCRIBE** accessors, and a
+    ``*-changed`` notification carrying the keys and the new data.
+
     The information transfered during RPC is listed in the table bellow,
     according to the accessor type:
 
@@ -125,6 +82,8 @@ class RPCGenerator(object):
      CHANGE           parent keys + data  error || success
      ITEM_ADD         parent keys + data  error || own keys
      ITEM_REMOVE      keys                error || data
+     SUBSCRIBE        parent + own keys   error || success
+     UNSUBSCRIBE      parent + own keys   error || success
     ================ =================== ==================
 
     Here ``data`` is the value of the node itself and ``key`` is used to
@@ -175,10 +134,143 @@ class RPCGenerator(object):
         ),
         'description_template': 'Accessors interface for module: `{}`.',
         'value_arg': 'value',
+        'include_paths': None,
+        'exclude_paths': None,
+        'allowed_operations': None,
+        'mode': ACCESSORS_MODE,
+        'path_selector': ENUMERATION_SELECTOR,
+        'path_type_name': 'accessor-path',
+        'path_leaf_name': 'path',
+        'generic_selector_name': 'accessor-selector',
+        'generic_identification_name': 'accessor-identification',
+        'generic_data_name': 'accessor-data',
+        'bulk': False,
+        'bulk_suffix': 'many',
+        'bulk_changes_suffix': 'changes',
+        'bulk_status_suffix': 'status',
+        'bulk_status_list_name': 'status',
+        'bulk_status_key_name': 'target',
+        'paginate': False,
+        'page_suffix': 'page',
+        'page_item_suffix': 'page-item',
+        'page_request_name': 'page-request',
+        'page_request_template': [
+            ('leaf', 'limit', [
+                ('type', 'uint32'),
+                ('description', 'maximum number of items in the page.'),
+            ]),
+            ('leaf', 'cursor', [
+                ('type', 'string'),
+                ('description',
+                 'opaque position returned by the previous page. '
+                 'The first page is returned if omitted.'),
+            ]),
+        ],
+        'page_cursor_template': [
+            ('leaf', 'next-cursor', [
+                ('type', 'string'),
+                ('description',
+                 'opaque position of the next page. '
+                 'Absent in the last page.'),
+            ]),
+        ],
+        'shard_size': None,
+        'shard_suffix': 'shard',
+        'shard_common_suffix': 'common',
+        'max_entries': None,
+        'max_groupings': None,
+        'max_payload_nodes': None,
+        'max_output_nodes': None,
+        'catalog': None,
+        'subscribe': False,
+        'changed_suffix': 'changed',
+        'conditional_reads': False,
+        'version_group_name': 'version-token',
+        'version_template': [
+            ('leaf', 'version', [
+                ('type', 'string'),
+                ('description', 'opaque version (e.g. etag) of the data.'),
+            ]),
+        ],
+        'not_modified_name': 'not-modified',
+        'not_modified_children_template': [
+            ('leaf', 'unchanged', [
+                ('type', 'empty'),
+                ('description',
+                 'the data did not change since the given version.'),
+            ]),
+        ],
+        'field_masks': False,
+        'field_mask_suffix': 'field-mask',
+        'field_mask_leaf_name': 'fields',
+        'projection_suffix': 'projection',
+        'max_include_depth': None,
+        'list_keys': False,
+        'keys_suffix': 'keys',
+        'normalize_once': False,
     }
     """Default configuration for the generator.
 
     This configurations the way of how the output module is built.
+
+    ``include_paths`` and ``exclude_paths`` are lists of glob patterns
+    matched against the entry-point paths (e.g. ``user/*``), while
+    ``allowed_operations`` restricts the generated accessor types.
+    See :class:`~pyang_accessors.filters.PathFilter`.
+
+    ``mode`` can be changed to ``generic`` in order to produce one RPC
+    for each operation instead of one RPC for each accessor.
+    See :mod:`pyang_accessors.generic`.
+
+    ``bulk`` adds batch accessors for list items, in addition to the
+    accessors for each node.
+    See :mod:`pyang_accessors.bulk`.
+
+    ``paginate`` adds paginated READ accessors for list items.
+    See :mod:`pyang_accessors.bulk`.
+
+    ``shard_size`` limits the number of entry-points in each submodule
+    produced by :meth:`~RPCGenerator.transform_shards`.
+
+    ``max_entries``, ``max_groupings``, ``max_payload_nodes`` (number of
+    statements in each grouping) and ``max_output_nodes`` abort the
+    generation with a :class:`~pyang_accessors.exceptions.BudgetExceededError`
+    as soon as the output grows too much. See
+    :class:`~pyang_accessors.budgets.Budget`.
+
+    ``catalog`` can be set to a
+    :class:`~pyang_accessors.registry.CatalogRegistry` shared by all the
+    modules generated in a batch, so each imported module has the same
+    prefix in every output.
+
+    ``subscribe`` adds subscription accessors and change notifications for
+    all the entry-points, instead of just the ``observable`` ones.
+    See :mod:`pyang_accessors.subscriptions`.
+
+    ``conditional_reads`` adds an optional version token to the READ
+    requests. The response carries the current version with the data,
+    or just a ``not-modified`` case if the version did not change.
+    See :mod:`pyang_accessors.conditional`.
+
+    ``field_masks`` adds a selection of fields to the READ requests of
+    containers and lists (e.g. ``include``/``atomic``), so just the
+    selected children are returned.
+    See :mod:`pyang_accessors.conditional`.
+
+    ``max_include_depth`` truncates the payloads of the ``include`` and
+    ``include-item`` nodes, as the ``depth`` extension.
+    See :func:`~pyang_accessors.scan.copy_truncated`.
+
+    ``list_keys`` adds accessors that enumerate just the keys of the list
+    items (paginated if ``paginate`` is also set).
+    See :mod:`pyang_accessors.keys`.
+
+    ``normalize_once`` re-prefixes a private copy of each original
+    statement used by the entry-points (types, ``if-feature``,
+    extensions) before the accessors copy them, instead of walking the
+    output module. With ``transform_shards``, all the modules used by
+    the entry-points are imported by each submodule.
+    See :meth:`~pyang_accessors.normalize.Normalizer.entries`.
     """
 
     def __init__(self, ctx=None, **kwargs):
@@ -192,24 +284,16 @@ class RPCGenerator(object):
 
         self.ctx = ctx or create_context()
         self.registry = None
+        self.budget = None
 
         # set properties from kwargs or default
         for prop, default in self.DEFAULT_CONFIG.items():
-            setattr(self, prop, kwargs.get(prop) or default)
-
-    def _just_default_key(self, keys):
-        """Identify if the entry has just the default key."""
-        return keys and len(keys) == 1 and keys[0].arg == self.key_suffix
-
-    def _prefix_keys(self, keys, prefix):
-        """Compose the key name with a prefix"""
-        prefixed = []
-        for key in keys:
-            new = key.copy()
-            new.arg = self.name_composer([prefix, key.arg])
-            prefixed.append(new)
-
-        return prefixed
+            value = kwargs.get(prop)
+            if default is not None:
+                value = value or default
+            # options without a default (e.g. the limits) keep an explicit
+            # 0, so it is validated instead of meaning "no limit"
+            setattr(self, prop, value)
 
     def _create_name(self, module, name):
         """Specify a name for the output module.
@@ -260,7 +344,8 @@ class RPCGenerator(object):
         return prefix or joiner.join([module_prefix, self.suffix])
 
     def _create_module_with_header(self, module, name=None, prefix=None,
-                                   namespace=None, keyword='module'):
+                                   namespace=None, keyword='module',
+                                   belongs_to=None):
         """Start the generation of a YANG abstract syntax tree for a module.
 
         Arguments:
@@ -269,6 +354,9 @@ class RPCGenerator(object):
             prefix (str): Prefix for the output module.
             namespace (str): Namespace for the output module.
             keyword (str): ``module`` or ``submodule``
+            belongs_to (str): Name of the module a submodule belongs to.
+                The ``namespace`` is ignored for submodules, and the
+                ``prefix`` is used in the ``belongs-to`` statement.
 
         Returns:
             str: Namespace if specified or a suffixed version of the
@@ -282,10 +370,16 @@ class RPCGenerator(object):
         builder = Builder(name, keyword=keyword)
         out = builder(keyword, name)
         out_raw = out.unwrap()
-        out.namespace(namespace)
-        out.prefix(prefix)
-
-        i = 2  # i is the position where the description should be placed
+        if keyword == 'submodule':
+            belongs = builder(
+                'belongs-to', belongs_to, ('prefix', prefix), parent=out_raw)
+            out_raw.substmts.append(belongs.unwrap())
+        else:
+            out.namespace(namespace)
+            out.prefix(prefix)
+
+        # i is the position where the description should be placed
+        i = len(out_raw.substmts)
         # copy header statements
         for header in HEADER_STATEMENTS:
             node = module.search_one(header)
@@ -305,7 +399,7 @@ class RPCGenerator(object):
 
         return (out, builder)
 
-    def _response_choice(self, success_grouping_name):
+    def _response_choice(self, success_grouping_name, conditional=False):
         """\
         Tuple representation for ``choice`` node that includes a failure case.
 
@@ -317,100 +411,27 @@ class RPCGenerator(object):
             success_grouping_name (str):
                 Name of the grouping containing the data nodes that
                 correspond to the RPC response.
+            conditional (bool): The response of a conditional READ.
+                The success case also carries the version token and a
+                ``not-modified`` case is added.
         """
-        return (
-            ('choice', self.choice_name, [
-                ('default', self.success_name),
-                ('case', self.success_name, [
-                    ('uses', success_grouping_name),
-                ]),
-                ('case', self.failure_name, [
-                    ('uses', self.failure_name),
-                ]),
-            ])
-        )
-
-    def _define_id_grouping(self, entry):
-        """Define an ID Grouping.
-
-        The ID Grouping should be formed of all the keys necessary
-        to achieve the entry-point. It should be named truncating
-        the path until the last keyed item, to improve sharing.
-
-        For example, consider the following YANG described structure::
-
-            list user {
-               list posts {
-                   leaf content { type string; }
-                   leaf date { type string; }
-               }
-            }
-
-        Consider the entry-point "user/post/content"
-        the ID Grouping should be::
-
-            grouping user-post-identification {
-               leaf user-id { type int32; }
-               leaf id { type int32; }  // -> ID of post
-            }
-
-        The same ID Grouping should be shared with entry-point
-        "user/post/date".
-
-        The last key should not be prefixed, but the predecessors should,
-        in order to guarantee uniqueness.
-
-        If the only key is the default key, the group name should be
-        "default" + identification_prefix.
-
-        .. note:: This method do not actually create the complete ``grouping``
-            just returns its name and content
-
-        Arguments:
-            entry: entry-point generated by scanner.
+        success = [('uses', success_grouping_name)]
+        cases = [
+            ('default', self.success_name),
+            ('case', self.success_name, success),
+            ('case', self.failure_name, [
+                ('uses', self.failure_name),
+            ]),
+        ]
+        if conditional:
+            success.append(('uses', self.version_group_name))
+            cases.append(('case', self.not_modified_name, [
+                ('uses', self.not_modified_name),
+            ]))
 
-        Returns:
-            group_name (str): the name of the grouping created.
-            content (list): nodes that uniquely references the entry-point.
-        """
-        group_name = None
-        path = entry.path
-        parent_keys = entry.parent_keys
-
-        # get the name of the nodes who have keys in the order they appear
-        keyed_items = [name for name in path if name in parent_keys]
-        if entry.own_keys:
-            keyed_items.append(entry.path[-1])  # add the item name itself
-
-        if not keyed_items:
-            return (None, [])
-
-        target = keyed_items[-1]  # <= last keyed item
-        target_keys = parent_keys.get(target) or entry.own_keys
-
-        # truncate the path before the last keyed item
-        predecessor_names = []
-        predecessor_keys = []
-        for name in path:
-            if name == target:
-                break
-            predecessor_names.append(name)
-            keys = parent_keys.get(name)
-            if keys:
-                # predecessor keys should be prefixed in order to
-                # guarantee uniqueness
-                predecessor_keys.extend(self._prefix_keys(keys, name))
-
-        if self._just_default_key(target_keys) and not predecessor_keys:
-            return (self.default_key_group_name, target_keys)
-
-        group_name = self.name_composer(
-            predecessor_names + [target, self.identification_suffix])
-
-        return (group_name, predecessor_keys + target_keys)
+        return ('choice', self.choice_name, cases)
 
-    @staticmethod
-    def _create_and_append_grouping(parent, name, content, registry):
+    def _create_and_append_grouping(self, parent, name, content, registry):
         """Create a new grouping and appends to the output if not present.
 
         Arguments:
@@ -419,20 +440,24 @@ class RPCGenerator(object):
             content (list): children to be appended
         """
         if name and name not in registry:
+            if self.budget:
+                # check before copying the content
+                self.budget.add_grouping(name, content)
             parent.grouping(name, content)
             registry.append(name)
 
     @staticmethod
     def _create_imports(module, builder, registry):
-        """Add imports from a registry to a module"""
+        """Add imports from a registry to a module.
+
+        The imports are sorted by prefix, so the output does not depend on
+        the order of the registry dicts, and spliced at once.
+        """
         raw_node = module.unwrap()
-        substmts = raw_node.substmts
 
-        # iterate in the reverse order, so each new import can be placed
-        # at the top of the previous, and in the end the order will
-        # be corrected
-        registry_data = registry.by_prefix.items()
-        for (prefix, (module_name, revision)) in reversed(registry_data):
+        import_nodes = []
+        for (prefix, (module_name, revision)) in sorted(
+                registry.by_prefix.items()):
             # creates a new import
             import_node = builder(
                 'import', module_name, ('prefix', prefix), parent=raw_node)
@@ -440,10 +465,353 @@ class RPCGenerator(object):
             if revision and revision != 'unknown':
                 import_node.revision(revision, parent=raw_node)
 
-            # the 1st node is the namespace
-            # the 2st node is the prefix
-            # all the import nodes should be after it
-            substmts.insert(2, import_node.unwrap())
+            import_nodes.append(import_node.unwrap())
+
+        # all the import nodes should be after the namespace and
+        # prefix (or belongs-to, for submodules)
+        position = linkage_position(raw_node)
+        raw_node.substmts[position:position] = import_nodes
+
+    @staticmethod
+    def _create_includes(module, builder, names):
+        """Add includes for submodules to a module"""
+        raw_node = module.unwrap()
+        position = linkage_position(raw_node)
+        raw_node.substmts[position:position] = [
+            builder('include', name, parent=raw_node).unwrap()
+            for name in names
+        ]
+
+    def _plan_accessors(self, entry):
+        """Name the RPCs and groupings required by the entry-point accessors.
+
+        No node is created by this method, the groupings content is just
+        referenced, so it can also be used to describe or estimate the
+        output.
+
+        Arguments:
+            entry: entry-point generated by scanner.
+
+        Returns:
+            list: one tuple for each operation of the entry-point, in the
+                form ``(operation, rpc_name, request_name,
+                response_choice_name, groupings)``, where ``groupings`` is
+                a list of ``(name, content)`` that should be created,
+                in order.
+        """
+        compose = self.name_composer
+
+        # all response messages should have optional failure nodes
+        # these nodes is determined by `failure_children_template` option
+        failure = (self.failure_name, self.failure_children_template)
+
+        # Default dumb success nodes are also required, because CHANGE
+        # operations return it
+        success = (self.success_name, self.success_children_template)
+
+        # The ID Grouping is used by READ and ITEM_REMOVE operations
+        # since it is necessary to specify which node is the target
+        (id_group, keys) = self._define_id_grouping(entry)
+
+        # Data Grouping is always present because READ is always present
+        # and it is the response
+        data_group = compose(entry.path + [self.data_suffix])
+
+        # For CHANGE + ITEM_ADD operations it is necessary to specify
+        # both the the keys to achieve the node and
+        # the data inserted/changed
+        # It is important to note that own keys are already present
+        # inside data. So if there is no parent keys, this group is
+        # unnecessary
+        parent_id_group, parent_id_content = (
+            self._define_parent_id_grouping(entry))
+
+        # ITEM_ADD operation returns just the keys for the node
+        # the parent keys ares already included in request
+        own_id_group = self.default_key_group_name
+        if not self._just_default_key(entry.own_keys):
+            own_id_group = compose(
+                entry.path + [self.self_identification_suffix])
+
+        plan = []
+        for operation in entry.operations:
+            # ================ =================== ==================
+            # accessor type         request             response
+            # ================ =================== ==================
+            # READ             parent + own keys   error || data
+            # CHANGE           parent keys + data  error || success
+            # ITEM_ADD         parent keys + data  error || own keys
+            # ITEM_REMOVE      parent + own keys   error || data
+            # SUBSCRIBE        parent + own keys   error || success
+            # UNSUBSCRIBE      parent + own keys   error || success
+            # ================ =================== ==================
+
+            rpc_name = compose([operation] + entry.path)
+            groupings = []
+            request = (None, None)
+            response = (None, None)
+            conditional = self.conditional_reads and operation == READ_OP
+            selective = operation == READ_OP and self._plan_selective_read(
+                entry, rpc_name, (id_group, keys))
+
+            if selective:
+                (groupings, request, response_choice_name, response) = (
+                    selective)
+            elif any(op == operation for op in (READ_OP, ITEM_REMOVE_OP)):
+                # READ/REMOVE request may specify parent + own keys
+                # (id_group).
+                request = (id_group, keys)
+                # Responds with data
+                response_choice_name = (
+                    compose(entry.path + [self.response_suffix]))
+                response = (data_group, entry.payload)
+            elif operation in SUBSCRIPTION_OPS:
+                # SUBSCRIBE/UNSUBSCRIBE request identifies the target
+                # as READ. The data is sent later, by the notification
+                request = (id_group, keys)
+            else:  # CHANGE_OP, ITEM_ADD_OP
+                # CHANGE/ADD request may specify parent + own keys and
+                # must specify data.
+                # own keys are already present in the payload (data_group)
+                if parent_id_group:
+                    groupings.append((parent_id_group, parent_id_content))
+                    groupings.append((data_group, entry.payload))
+                    request = (
+                        compose(entry.path + [self.request_suffix]),
+                        [
+                            ('uses', parent_id_group),
+                            ('uses', data_group),
+                        ]
+                    )
+                else:
+                    request = (data_group, entry.payload)
+
+            if operation == CHANGE_OP or operation in SUBSCRIPTION_OPS:
+                # CHANGE and (UN)SUBSCRIBE requests do not respond anything
+                # (except occasional error)
+                response_choice_name = self.default_response_name
+                response = success
+            elif operation == ITEM_ADD_OP:
+                # ADD request responds with own keys
+                response_choice_name = compose(
+                    [rpc_name, self.response_suffix])
+                if not parent_id_content:
+                    response = (id_group, keys)
+                else:
+                    response = (own_id_group, entry.own_keys)
+
+            groupings.extend([
+                failure,
+                request,
+                response,
+                (response_choice_name,
+                 self._response_choice(response[0], conditional)),
+            ])
+
+            plan.append((operation, rpc_name, request[0],
+                         response_choice_name, groupings))
+
+        return plan
+
+    def _define_accessors(self, out, entries, already_created):
+        """Define one RPC for each operation of each entry-point.
+
+        Arguments:
+            out (pyang_builder.StatementWrapper): output module.
+            entries (list): entry-points generated by scanner.
+            already_created (list): names of the groupings already created.
+        """
+        budget = self.budget
+        for entry in entries:
+            if budget:
+                budget.enter(entry.path)
+            plan = self._plan_accessors(entry)
+            for (_, rpc_name, request_name,
+                 response_choice_name, groupings) in plan:
+                for (group_name, content) in groupings:
+                    self._create_and_append_grouping(
+                        out, group_name, content, already_created)
+
+                if budget:
+                    (nodes, _) = content_size(rpc_content(
+                        rpc_name, request_name, response_choice_name))
+                    budget.add_nodes(nodes)
+
+                rpc = out.rpc(rpc_name)
+                if request_name:
+                    rpc.input().uses(request_name)
+                rpc.output().uses(response_choice_name)
+
+    def create_budget(self):
+        """Create a new budget from the configuration.
+
+        Returns:
+            pyang_accessors.budgets.Budget
+        """
+        return Budget(self.max_entries, self.max_groupings,
+                      self.max_payload_nodes, self.max_output_nodes)
+
+    def scan(self, module, builder=None, copy_payloads=True, budget=None):
+        """Scan a module looking for entry-points, according to the config.
+
+        Arguments:
+            module (pyang.statements.Statement):
+                Original module that describes the data structure.
+            builder (pyang_builder.Builder): Object used to generate nodes
+                **(optional)**.
+            copy_payloads (bool): If ``False``, the payloads reference
+                the original nodes (see
+                :class:`~pyang_accessors.scan.Scanner`) **(optional)**.
+            budget (pyang_accessors.budgets.Budget): Limits checked
+                during the scan. By default, a new budget is created from
+                the configuration **(optional)**.
+
+        Returns:
+            list: :class:`~pyang_accessors.scan.EntryPoint` elements.
+        """
+        builder = builder or Builder(self._create_name(module, None))
+
+        path_filter = PathFilter(
+            self.include_paths, self.exclude_paths, self.allowed_operations)
+
+        scanner = Scanner(
+            builder, self.key_template,
+            self.name_composer, self.key_suffix, self.value_arg,
+            path_filter, copy_payloads,
+            self.create_budget() if budget is None else budget,
+            self.subscribe, self.max_include_depth)
+
+        return scanner.scan(module)
+
+    def estimate(self, module):
+        """Estimate the size of the output, without generating it.
+
+        Just the scanner and the naming logic of the accessors are used:
+        the payloads are not copied (just truncated, if there is a depth
+        limit) and no node is created, normalized or validated. The
+        groupings are counted once, in the subtree that first uses them.
+        Lists are reported by their own name, not by the item name used
+        in the accessors. The extra accessors (``bulk``, ``paginate``),
+        the change notifications and the ``generic`` mode are not
+        considered.
+
+        Arguments:
+            module (pyang.statements.Statement):
+                Original module that describes the data structure.
+
+        Returns:
+            dict: JSON serializable report, with the counters (see
+                :class:`~pyang_accessors.estimate.Estimate`) for each
+                top-level node of the original module (``subtrees``)
+                and the ``total``.
+        """
+        subtrees = {}
+        already_created = set()
+        # accessor paths start with the item name for lists
+        top_level = dict(
+            (find_item_name(node) if is_list(node) else node.arg, node.arg)
+            for node in module.i_children
+        )
+        # the budgets are not applied, so the blow-up can be measured
+        entries = self.scan(module, copy_payloads=False, budget=Budget())
+        for entry in entries:
+            name = top_level.get(entry.path[0], entry.path[0])
+            subtree = subtrees.setdefault(name, Estimate())
+            subtree.entries += 1
+            plan = self._plan_accessors(entry)
+            for (_, rpc_name, request_name,
+                 response_choice_name, groupings) in plan:
+                for (group_name, content) in groupings:
+                    if not group_name or group_name in already_created:
+                        continue
+                    already_created.add(group_name)
+                    subtree.groupings += 1
+                    subtree.add_node(('grouping', group_name))
+                    subtree.add_node(content, depth=2)
+
+                subtree.rpcs += 1
+                subtree.add_node(rpc_content(
+                    rpc_name, request_name, response_choice_name))
+
+        total = Estimate()
+        for subtree in subtrees.values():
+            total.add(subtree)
+
+        return {
+            'subtrees': dict(
+                (name, subtree.to_dict())
+                for (name, subtree) in subtrees.items()
+            ),
+            'total': total.to_dict(),
+        }
+
+    def _define_entries(self, out, entries, already_created,
+                        all_entries=None):
+        """Define the accessors for the entry-points, according to the config.
+
+        Arguments:
+            out (pyang_builder.StatementWrapper): output module.
+            entries (list): entry-points generated by scanner.
+            already_created (list): names of the groupings already created.
+            all_entries (list): all the entry-points, when ``entries`` are
+                just the part placed in a shard. The accessors of a list
+                item (``bulk`` and ``list_keys``) depend on several
+                entry-points, so they are defined by the shard with the
+                first of them.
+        """
+        owned = None
+        item_entries = entries
+        if all_entries is not None:
+            owned = set(id(entry) for entry in entries)
+            item_entries = all_entries
+
+        if self.mode == GENERIC_MODE:
+            self._define_generic_accessors(out, entries, already_created)
+        else:
+            self._define_accessors(out, entries, already_created)
+            if self.bulk:
+                self._define_bulk_accessors(
+                    out, item_entries, already_created, owned)
+            if self.paginate:
+                self._define_page_accessors(out, entries, already_created)
+            if self.list_keys:
+                self._define_key_accessors(
+                    out, item_entries, already_created, owned)
+            self._define_notifications(out, entries, already_created)
+
+    def _normalize_sources(self, entries):
+        """Normalize the statements of the entry-points before copying them.
+
+        Returns:
+            Normalizer: used by :meth:`_finish`, or ``None`` if the
+                ``normalize_once`` option is not set.
+        """
+        if not self.normalize_once:
+            return None
+
+        normalize = Normalizer(self.ctx, ImportRegistry(self.catalog))
+        normalize.entries(entries)
+
+        return normalize
+
+    def _finish(self, out, builder, normalize=None):
+        """Import the external definitions used by a module.
+
+        If the entry-points were already normalized (see
+        :meth:`_normalize_sources`), just the header copied from the
+        original module is normalized, and all the modules registered by
+        the normalizer are imported.
+        """
+        if normalize is None:
+            registry = ImportRegistry(self.catalog)
+            Normalizer(self.ctx, registry).external_definitions(out)
+        else:
+            registry = normalize.registry
+            for node in out.unwrap().substmts:
+                if node.keyword in HEADER_STATEMENTS:
+                    normalize.statement(node)
+
+        self._create_imports(out, builder, registry)
 
     def transform(self, module,
                   name=None, prefix=None, namespace=None,
@@ -488,155 +856,106 @@ class RPCGenerator(object):
         (out, builder) = self._create_module_with_header(module, name, prefix,
                                                          namespace, keyword)
 
-        scanner = Scanner(
-            builder, self.key_template,
-            self.name_composer, self.key_suffix, self.value_arg)
-
-        entries = scanner.scan(module)
+        self.budget = self.create_budget()
+        entries = self.scan(module, builder, budget=self.budget)
         if not entries:
             return out
 
-        compose = self.name_composer
+        normalize = self._normalize_sources(entries)
 
         # registry of groupings already created
         already_created = []
+        self._define_entries(out, entries, already_created)
+        self._finish(out, builder, normalize)
 
-        # all response messages should have optional failure nodes
-        # these nodes is determined by `failure_children_template` option
-        failure_name = self.failure_name
-        failure_content = self.failure_children_template
+        out.validate(self.ctx, rescue=True)
 
-        # Default dumb success nodes are also required, because CHANGE
-        # operations return it
-        success_name = self.success_name
-        success_content = self.success_children_template
-
-        for entry in scanner.scan(module):
-            # The ID Grouping is used by READ and ITEM_REMOVE operations
-            # since it is necessary to specify which node is the target
-            (id_group, keys) = self._define_id_grouping(entry)
-
-            # Data Grouping is always present because READ is always present
-            # and it is the response
-            data_group = compose(entry.path + [self.data_suffix])
-
-            # For CHANGE + ITEM_ADD operations it is necessary to specify
-            # both the the keys to achieve the node and
-            # the data inserted/changed
-            # It is important to note that own keys are already present
-            # inside data. So if there is no parent keys, this group is
-            # unnecessary
-            parent_id_group = None
-            parent_id_content = None
-            if entry.parent_keys:
-                # _define_id_grouping will take the last keyed item in
-                # the path as target. If own_keys are None, the last
-                # keyed item is the parent item
-                fake_entry = entry.copy()
-                fake_entry.own_keys = None
-
-                parent_id_group, parent_id_content = (
-                    self._define_id_grouping(fake_entry)
-                )
-
-            # ITEM_ADD operation returns just the keys for the node
-            # the parent keys ares already included in request
-            own_id_group = self.default_key_group_name
-            if not self._just_default_key(entry.own_keys):
-                own_id_group = compose(
-                    entry.path + [self.self_identification_suffix])
-
-            for operation in entry.operations:
-                # ================ =================== ==================
-                # accessor type         request             response
-                # ================ =================== ==================
-                # READ             parent + own keys   error || data
-                # CHANGE           parent keys + data  error || success
-                # ITEM_ADD         parent keys + data  error || own keys
-                # ITEM_REMOVE      parent + own keys   error || data
-                # ================ =================== ==================
-
-                rpc_name = compose([operation] + entry.path)
-                request_name = None
-                request_content = None
-                response_name = None
-                response_content = None
-
-                if any(op == operation for op in (READ_OP, ITEM_REMOVE_OP)):
-                    # READ/REMOVE request may specify parent + own keys
-                    # (id_group).
-                    request_name = id_group
-                    request_content = keys
-                    # Responds with data
-                    response_choice_name = (
-                        compose(entry.path + [self.response_suffix]))
-                    response_name = data_group
-                    response_content = entry.payload
-                else:  # CHANGE_OP, ITEM_ADD_OP
-                    # CHANGE/ADD request may specify parent + own keys and
-                    # must specify data.
-                    # own keys are already present in the payload (data_group)
-                    if parent_id_group:
-                        self._create_and_append_grouping(
-                            out,
-                            parent_id_group,
-                            parent_id_content,
-                            already_created)
-                        self._create_and_append_grouping(
-                            out,
-                            data_group,
-                            entry.payload,
-                            already_created)
-                        request_name = (
-                            compose(entry.path + [self.request_suffix]))
-                        request_content = [
-                            ('uses', parent_id_group),
-                            ('uses', data_group),
-                        ]
-                    else:
-                        request_name = data_group
-                        request_content = entry.payload
-
-                if operation == CHANGE_OP:
-                    # CHANGE request does not respond anything
-                    # (except occasional error)
-                    response_choice_name = self.default_response_name
-                    response_name = success_name
-                    response_content = success_content
-                elif operation == ITEM_ADD_OP:
-                    # ADD request responds with own keys
-                    response_choice_name = compose(
-                        [rpc_name, self.response_suffix])
-                    if not parent_id_content:
-                        response_name = id_group
-                        response_content = keys
-                    else:
-                        response_name = own_id_group
-                        response_content = entry.own_keys
-
-                self._create_and_append_grouping(
-                    out, failure_name, failure_content, already_created)
-
-                self._create_and_append_grouping(
-                    out, request_name, request_content, already_created)
-                self._create_and_append_grouping(
-                    out, response_name, response_content, already_created)
-
-                self._create_and_append_grouping(
-                    out, response_choice_name,
-                    self._response_choice(response_name),
-                    already_created)
+        return out
 
-                rpc = out.rpc(rpc_name)
-                if request_name:
-                    rpc.input().uses(request_name)
-                rpc.output().uses(response_choice_name)
+    def transform_shards(self, module, name=None, prefix=None,
+                         namespace=None):
+        """Creates a RPC service definition split into submodules.
 
-        registry = ImportRegistry()
-        normalize = Normalizer(self.ctx, registry)
-        normalize.external_definitions(out)
-        self._create_imports(out, builder, registry)
+        The output is the same of :meth:`transform`, however the RPCs are
+        distributed between submodules (shards), so they can be handled
+        (e.g. compiled) in parallel. The entry-points are partitioned by
+        top-level subtree, with at most ``shard_size`` entry-points in each
+        shard (see :func:`~pyang_accessors.shards.partition_entries`).
 
-        out.validate(self.ctx, rescue=True)
+        The definitions used by more than one shard, as well as the default
+        groupings (e.g. ``failure`` and ``default-identification``), are
+        placed in a common submodule, that is included by the shards.
+        The main module just includes all the submodules. The accessors
+        of a list item (``bulk`` and ``list_keys``) are placed in the shard
+        with its first entry-point, even if the item is split.
 
-        return out
+        In the ``generic`` mode, all the RPCs are placed in a single shard.
+
+        .. note:: Since the submodules depend on each other, they are not
+            validated. Once written, they can be validated by ``pyang``.
+
+        Arguments:
+            module (pyang.statements.Statement):
+                Original module that describes the data structure.
+            name (str): Name for the main module **(optional)**.
+            prefix (str): Prefix for the main module **(optional)**.
+            namespace (str): Namespace for the main module **(optional)**.
+
+        Returns:
+            list: ``(name, pyang_builder.StatementWrapper)`` for the main
+                module, the common submodule and each shard, in this order.
+
+        Raises:
+            DefinitionConflictError: if the shards define different
+                groupings with the same name.
+        """
+        compose = self.name_composer
+        name = self._create_name(module, name)
+        (out, builder) = self._create_module_with_header(
+            module, name, prefix, namespace)
+
+        self.budget = self.create_budget()
+        entries = self.scan(module, builder, budget=self.budget)
+        if not entries:
+            return [(name, out)]
+
+        normalize = self._normalize_sources(entries)
+
+        if self.mode == GENERIC_MODE:
+            partitions = [entries]
+        else:
+            partitions = partition_entries(entries, self.shard_size)
+
+        def submodule(sub_name):
+            """Create the header of a submodule of the main module"""
+            return self._create_module_with_header(
+                module, sub_name, prefix, namespace, 'submodule', name)
+
+        common_name = compose([name, self.shard_common_suffix])
+        (common, common_builder) = submodule(common_name)
+
+        shards = []
+        for (index, partition) in enumerate(partitions, 1):
+            shard_name = compose([name, self.shard_suffix, str(index)])
+            (shard, shard_builder) = submodule(shard_name)
+            # each shard creates all the groupings it needs, but the budget
+            # counts them once (see ``move_shared_definitions``)
+            self._define_entries(shard, partition, [], entries)
+            shards.append((shard_name, shard, shard_builder))
+
+        move_shared_definitions(
+            [item[1] for item in shards], common,
+            always=(self.default_response_name, self.success_name,
+                    self.failure_name, self.default_key_group_name))
+
+        self._finish(common, common_builder, normalize)
+        for (_, shard, shard_builder) in shards:
+            self._create_includes(shard, shard_builder, [common_name])
+            self._finish(shard, shard_builder, normalize)
+
+        self._create_includes(
+            out, builder,
+            [common_name] + [item[0] for item in shards])
+
+        return ([(name, out), (common_name, common)] +
+                [item[:2] for item in shards])
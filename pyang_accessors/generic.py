@@ -0,0 +1,186 @@
+# -*- coding: utf-8 -*-
+"""\
+Tools for generating one generic RPC for each operation.
+
+In the ``generic`` mode, the ``get``, ``set``, ``add`` and ``remove``
+RPCs receive a path selector, instead of one RPC being generated for each
+accessor of each entry-point.
+"""
+from .definitions import (
+    CHANGE_OP,
+    IDENTITY_SELECTOR,
+    ITEM_REMOVE_OP,
+    READ_OP,
+    SUBSCRIBE_OP
+)
+from .filters import join_path
+from .scan import SUBSCRIPTION_OPS
+
+__author__ = "Anderson Bravalheri"
+__copyright__ = "Copyright (C) 2016 Anderson Bravalheri"
+__license__ = "mozilla"
+
+
+class GenericAccessorsMixin(object):
+    """Generic RPCs, selecting the entry-point by its path.
+
+    Used instead of the regular accessors in the ``generic`` mode.
+    """
+    # pylint: disable=no-member
+
+    def _define_generic_accessors(self, out, entries, already_created):
+        """Define one generic RPC for each operation.
+
+        Instead of ``get-X``/``set-X`` RPCs for each entry-point, the
+        generic RPCs (``get``, ``set``, ``add`` and ``remove``) receive a
+        path selector, built from the paths of all the entry-points.
+        The keys and the data are described by ``choice`` nodes, with one
+        ``case`` for each ID Grouping and each Data Grouping::
+
+            grouping accessor-selector {
+                leaf path { type accessor-path; mandatory true; }
+                uses accessor-identification;
+            }
+
+            rpc set {
+                input {
+                    uses accessor-selector;
+                    uses accessor-data;
+                }
+                output { uses default-response; }
+            }
+
+        The size of the output is then proportional to the number of
+        entry-points, without the overhead of one RPC for each accessor.
+
+        Arguments:
+            out (pyang_builder.StatementWrapper): output module.
+            entries (list): entry-points generated by scanner.
+            already_created (list): names of the groupings already created.
+        """
+        compose = self.name_composer
+        create = self._create_and_append_grouping
+
+        operations = []
+        paths = []
+        id_groups = []
+        data_groups = []
+
+        for entry in entries:
+            paths.append(entry.path)
+            operations.extend(
+                op for op in entry.operations if op not in operations)
+
+            # own + parent keys, used by READ and ITEM_REMOVE
+            # just parent keys, used by CHANGE and ITEM_ADD
+            # own keys, returned by ITEM_ADD
+            (id_group, keys) = self._define_id_grouping(entry)
+            (parent_id_group, parent_id_content) = (
+                self._define_parent_id_grouping(entry))
+            groups = [(id_group, keys), (parent_id_group, parent_id_content)]
+            if parent_id_content and entry.own_keys:
+                own_id_group = self.default_key_group_name
+                if not self._just_default_key(entry.own_keys):
+                    own_id_group = compose(
+                        entry.path + [self.self_identification_suffix])
+                groups.append((own_id_group, entry.own_keys))
+
+            for (group_name, content) in groups:
+                if group_name and group_name not in id_groups:
+                    create(out, group_name, content, already_created)
+                    id_groups.append(group_name)
+
+            data_group = compose(entry.path + [self.data_suffix])
+            create(out, data_group, entry.payload, already_created)
+            data_groups.append(data_group)
+
+        # path selector
+        if self.path_selector == IDENTITY_SELECTOR:
+            out.identity(self.path_type_name)
+            for path in paths:
+                out.identity(compose(path), [('base', self.path_type_name)])
+            path_type = ('type', 'identityref', [
+                ('base', self.path_type_name),
+            ])
+        else:
+            out.typedef(self.path_type_name, [
+                ('type', 'enumeration', [
+                    ('enum', join_path(path)) for path in paths
+                ]),
+            ])
+            path_type = ('type', self.path_type_name)
+
+        # each case is wrapped in a container, since the groupings share
+        # node names (e.g. keys)
+        def cases(group_names):
+            """One case for each grouping"""
+            return [
+                ('case', group_name, [
+                    ('container', group_name, [('uses', group_name)]),
+                ])
+                for group_name in group_names
+            ]
+
+        id_name = self.generic_identification_name
+        data_name = self.generic_data_name
+        selector_name = self.generic_selector_name
+        create(out, id_name, [
+            ('choice', id_name, cases(id_groups)),
+        ], already_created)
+        create(out, data_name, [
+            ('choice', data_name, cases(data_groups)),
+        ], already_created)
+        create(out, selector_name, [
+            ('leaf', self.path_leaf_name, [
+                path_type,
+                ('mandatory', 'true'),
+            ]),
+            ('uses', id_name),
+        ], already_created)
+
+        create(out, self.failure_name,
+               self.failure_children_template, already_created)
+
+        for operation in operations:
+            # ================ ====================== ==================
+            # accessor type         request                response
+            # ================ ====================== ==================
+            # READ             path + keys            error || data
+            # CHANGE           path + keys + data     error || success
+            # ITEM_ADD         path + keys + data     error || own keys
+            # ITEM_REMOVE      path + keys            error || data
+            # SUBSCRIBE        path + keys            error || success
+            # UNSUBSCRIBE      path + keys            error || success
+            # ================ ====================== ==================
+            request_names = [selector_name]
+            if operation in (READ_OP, ITEM_REMOVE_OP):
+                response_name = data_name
+                response_choice_name = compose(
+                    [data_name, self.response_suffix])
+            elif operation == CHANGE_OP or operation in SUBSCRIPTION_OPS:
+                if operation == CHANGE_OP:
+                    request_names.append(data_name)
+                response_name = self.success_name
+                response_choice_name = self.default_response_name
+                create(out, response_name,
+                       self.success_children_template, already_created)
+            else:  # ITEM_ADD_OP
+                request_names.append(data_name)
+                response_name = id_name
+                response_choice_name = compose(
+                    [id_name, self.response_suffix])
+
+            create(out, response_choice_name,
+                   self._response_choice(response_name), already_created)
+
+            rpc = out.rpc(operation)
+            request = rpc.input()
+            for request_name in request_names:
+                request.uses(request_name)
+            rpc.output().uses(response_choice_name)
+
+        if SUBSCRIBE_OP in operations:
+            # a single notification, selecting the changed entry-point
+            notification = out.notification(self.changed_suffix)
+            notification.uses(selector_name)
+            notification.uses(data_name)
@@ -0,0 +1,179 @@
+# -*- coding: utf-8 -*-
+"""\
+Tools for identifying the target of the accessors by its keys.
+
+The ID Groupings gather the keys of all the keyed items in the path of an
+entry-point, so every accessor family (single, bulk, paginated, list keys
+and notifications) references the nodes the same way.
+"""
+
+from .scan import KeyContext
+
+__author__ = "Anderson Bravalheri"
+__copyright__ = "Copyright (C) 2016 Anderson Bravalheri"
+__license__ = "mozilla"
+
+
+class IdentificationMixin(object):
+    """Name and content of the ID Groupings of the entry-points.
+
+    The keys are named according to the ``key_suffix`` and
+    ``identification_suffix`` options of the generator.
+    """
+    # pylint: disable=no-member
+
+    def _just_default_key(self, keys):
+        """Identify if the entry has just the default key."""
+        return keys and len(keys) == 1 and keys[0].arg == self.key_suffix
+
+    def _prefix_keys(self, keys, prefix):
+        """Compose the key name with a prefix"""
+        if isinstance(keys, KeyContext) and keys.item_name == prefix:
+            # shared by every entry-point under the list
+            return keys.prefixed(self.name_composer)
+
+        prefixed = []
+        for key in keys:
+            new = key.copy()
+            new.arg = self.name_composer([prefix, key.arg])
+            prefixed.append(new)
+
+        return prefixed
+
+    def _define_id_grouping(self, entry):
+        """Define an ID Grouping.
+
+        The ID Grouping should be formed of all the keys necessary
+        to achieve the entry-point. It should be named truncating
+        the path until the last keyed item, to improve sharing.
+
+        For example, consider the following YANG described structure::
+
+            list user {
+               list posts {
+                   leaf content { type string; }
+                   leaf date { type string; }
+               }
+            }
+
+        Consider the entry-point "user/post/content"
+        the ID Grouping should be::
+
+            grouping user-post-identification {
+               leaf user-id { type int32; }
+               leaf id { type int32; }  // -> ID of post
+            }
+
+        The same ID Grouping should be shared with entry-point
+        "user/post/date".
+
+        The last key should not be prefixed, but the predecessors should,
+        in order to guarantee uniqueness.
+
+        If the only key is the default key, the group name should be
+        "default" + identification_prefix.
+
+        .. note:: This method do not actually create the complete ``grouping``
+            just returns its name and content
+
+        Arguments:
+            entry: entry-point generated by scanner.
+
+        Returns:
+            group_name (str): the name of the grouping created.
+            content (list): nodes that uniquely references the entry-point.
+        """
+        group_name = None
+        path = entry.path
+        parent_keys = entry.parent_keys
+
+        # get the name of the nodes who have keys in the order they appear
+        keyed_items = [name for name in path if name in parent_keys]
+        if entry.own_keys:
+            keyed_items.append(entry.path[-1])  # add the item name itself
+
+        if not keyed_items:
+            return (None, [])
+
+        target = keyed_items[-1]  # <= last keyed item
+        target_keys = parent_keys.get(target) or entry.own_keys
+
+        # truncate the path before the last keyed item
+        predecessor_names = []
+        predecessor_keys = []
+        for name in path:
+            if name == target:
+                break
+            predecessor_names.append(name)
+            keys = parent_keys.get(name)
+            if keys:
+                # predecessor keys should be prefixed in order to
+                # guarantee uniqueness
+                predecessor_keys.extend(self._prefix_keys(keys, name))
+
+        if self._just_default_key(target_keys) and not predecessor_keys:
+            return (self.default_key_group_name, target_keys)
+
+        group_name = self.name_composer(
+            predecessor_names + [target, self.identification_suffix])
+
+        return (group_name, predecessor_keys + target_keys)
+
+    def _define_parent_id_grouping(self, entry):
+        """Define an ID Grouping just with the keys of the parent items.
+
+        See :meth:`_define_id_grouping`.
+
+        Returns:
+            group_name (str): the name of the grouping created.
+            content (list): nodes that uniquely references the parent.
+        """
+        if not entry.parent_keys:
+            return (None, None)
+
+        # _define_id_grouping will take the last keyed item in
+        # the path as target. If own_keys are None, the last
+        # keyed item is the parent item
+        fake_entry = type(entry)(entry.path, parent_keys=entry.parent_keys)
+
+        return self._define_id_grouping(fake_entry)
+
+    def _define_id_fields(self, entry):
+        """Relate the leafs of the ID Grouping with the keyed items.
+
+        The leafs are named as in :meth:`_define_id_grouping`, i.e.
+        the keys of the predecessors are prefixed.
+
+        Arguments:
+            entry: entry-point generated by scanner.
+
+        Returns:
+            list: ``(item_name, key_name, leaf_name)`` tuples, in the same
+                order the leafs appear in the ID Grouping.
+        """
+        path = entry.path
+        parent_keys = entry.parent_keys
+
+        keyed_items = [name for name in path if name in parent_keys]
+        if entry.own_keys:
+            keyed_items.append(entry.path[-1])
+
+        if not keyed_items:
+            return []
+
+        target = keyed_items[-1]
+        target_keys = parent_keys.get(target) or entry.own_keys
+
+        fields = []
+        for name in path:
+            if name == target:
+                break
+            keys = parent_keys.get(name) or []
+            fields.extend(
+                (name, key.arg, prefixed.arg)
+                for (key, prefixed) in zip(keys, self._prefix_keys(keys, name))
+            )
+
+        fields.extend((target, key.arg, key.arg) for key in target_keys)
+
+        return fields
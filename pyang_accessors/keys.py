@@ -0,0 +1,121 @@
+# -*- coding: utf-8 -*-
+"""\
+Tools for enumerating the keys of the list items.
+
+The ``list_keys`` accessors return just the ID Grouping of each item of a
+list, without any data.
+"""
+from .definitions import LIST_KEYS_OP
+
+__author__ = "Anderson Bravalheri"
+__copyright__ = "Copyright (C) 2016 Anderson Bravalheri"
+__license__ = "mozilla"
+
+
+class KeyAccessorsMixin(object):
+    """Accessors that enumerate the keys of the list items.
+
+    Enabled by the ``list_keys`` option.
+    """
+    # pylint: disable=no-member
+
+    def _define_key_accessors(self, out, entries, already_created,
+                              owned=None):
+        """Define accessors that enumerate the keys of the list items.
+
+        Each keyed item found by the scanner (as a parent of the
+        entry-points or as an entry-point itself) gets a ``list-*-keys``
+        RPC, that receives the parent keys and responds with the ID
+        Grouping of each item (see :mod:`pyang_accessors.identification`),
+        without any data::
+
+            grouping user-keys {
+                list user {
+                    key login;
+                    uses user-identification;
+                }
+            }
+
+            rpc list-user-keys {
+                output { uses list-user-keys-response; }
+            }
+
+        If ``paginate`` is set, the request also receives the page request
+        and the response has the next cursor, as in the paginated READ
+        accessors (see :mod:`pyang_accessors.bulk`).
+
+        Arguments:
+            out (pyang_builder.StatementWrapper): output module.
+            entries (list): entry-points generated by scanner.
+            already_created (list): names of the groupings already created.
+            owned (set): ids of the entry-points of ``out``, when it is
+                a shard (see :meth:`RPCGenerator._define_entries
+                <pyang_accessors.generators.RPCGenerator._define_entries>`).
+        """
+        compose = self.name_composer
+        create = self._create_and_append_grouping
+
+        # keyed items in the order they are found, by path
+        items = []
+        found = set()
+        for entry in entries:
+            keyed = [(index, entry.parent_keys[name])
+                     for (index, name) in enumerate(entry.path)
+                     if name in entry.parent_keys]
+            if entry.own_keys:
+                keyed.append((len(entry.path) - 1, entry.own_keys))
+
+            for (index, keys) in keyed:
+                item_path = entry.path[:index + 1]
+                if tuple(item_path) in found:
+                    continue
+                found.add(tuple(item_path))
+                if owned is not None and id(entry) not in owned:
+                    continue
+                parent_keys = dict(
+                    (name, entry.parent_keys[name])
+                    for name in item_path[:-1] if name in entry.parent_keys
+                )
+                items.append(type(entry)(
+                    item_path, parent_keys=parent_keys, own_keys=keys))
+
+        for item in items:
+            if self.budget:
+                self.budget.enter(item.path)
+
+            rpc_name = compose([LIST_KEYS_OP] + item.path + [self.keys_suffix])
+            keys_group = compose(item.path + [self.keys_suffix])
+            choice_name = compose([rpc_name, self.response_suffix])
+            (id_group, id_content) = self._define_id_grouping(item)
+            (parent_id_group, parent_id_content) = (
+                self._define_parent_id_grouping(item))
+            key_names = [field[2] for field in self._define_id_fields(item)]
+
+            keys_content = [
+                ('list', item.path[-1], [
+                    ('key', ' '.join(key_names)),
+                    ('description', 'items ordered by their keys.'),
+                    ('uses', id_group),
+                ]),
+            ]
+            if self.paginate:
+                create(out, self.page_request_name,
+                       self.page_request_template, already_created)
+                keys_content.extend(self.page_cursor_template)
+
+            create(out, self.failure_name,
+                   self.failure_children_template, already_created)
+            create(out, parent_id_group, parent_id_content, already_created)
+            create(out, id_group, id_content, already_created)
+            create(out, keys_group, keys_content, already_created)
+            create(out, choice_name,
+                   self._response_choice(keys_group), already_created)
+
+            rpc = out.rpc(rpc_name)
+            if parent_id_group or self.paginate:
+                request = rpc.input()
+                if parent_id_group:
+                    request.uses(parent_id_group)
+                if self.paginate:
+                    request.uses(self.page_request_name)
+            rpc.output().uses(choice_name)
@@ -0,0 +1,138 @@
+# -*- coding: utf-8 -*-
+"""Tools for exporting the entry-points as a manifest.
+
+The manifest is a JSON Lines file, with one record for each entry-point,
+as described by :meth:`RPCGenerator.describe
+<pyang_accessors.generators.RPCGenerator.describe>`. It can be loaded by
+downstream code generators or runtime dispatchers, without parsing
+the original module (or the generated one) again.
+"""
+import json
+
+from .definitions import ITEM_REMOVE_OP, READ_OP, SUBSCRIBE_OP
+from .scan import SUBSCRIPTION_OPS
+
+__author__ = "Anderson Bravalheri"
+__copyright__ = "Copyright (C) 2016 Anderson Bravalheri"
+__license__ = "mozilla"
+
+
+class DescribeMixin(object):
+    """Description of the accessors of each entry-point.
+
+    The naming rules of the generator are used, so the records match the
+    generated module.
+    """
+    # pylint: disable=no-member
+
+    def describe(self, entry):
+        """Describe the accessors of an entry-point, without creating them.
+
+        The names are the same used by :meth:`RPCGenerator.transform
+        <pyang_accessors.generators.RPCGenerator.transform>` in the
+        default mode (``accessors``).
+
+        Arguments:
+            entry: entry-point generated by scanner.
+
+        Returns:
+            dict: JSON serializable description of the entry-point, with
+                the following items: ``path``, ``operations``,
+                ``parent_keys`` (item name -> key names), ``own_keys``,
+                ``groupings`` (role -> grouping name) and ``rpcs``
+                (operation -> description of the RPC).
+                The description of each RPC includes the names of its
+                ``input`` and ``output`` groupings and the ``keys`` used to
+                identify the target node, as ``[item, key, leaf]`` lists.
+                For CHANGE and ITEM_ADD, the own keys are not listed, since
+                they are part of the data.
+        """
+        compose = self.name_composer
+        (id_group, _) = self._define_id_grouping(entry)
+        (parent_id_group, _) = self._define_parent_id_grouping(entry)
+
+        # CHANGE and ITEM_ADD requests carry own keys inside data,
+        # so just the parent keys are used for identification
+        parent_fields = self._define_id_fields(
+            type(entry)(entry.path, parent_keys=entry.parent_keys))
+
+        rpcs = {}
+        for (operation, rpc_name, request_name,
+             response_choice_name, _) in self._plan_accessors(entry):
+            if (operation in (READ_OP, ITEM_REMOVE_OP) or
+                    operation in SUBSCRIPTION_OPS):
+                fields = self._define_id_fields(entry)
+            else:
+                fields = parent_fields
+            rpcs[operation] = {
+                'name': rpc_name,
+                'input': request_name,
+                'output': response_choice_name,
+                'keys': [list(field) for field in fields],
+            }
+            if operation == SUBSCRIBE_OP:
+                rpcs[operation]['notification'] = compose(
+                    entry.path + [self.changed_suffix])
+
+        return {
+            'path': list(entry.path),
+            'operations': list(entry.operations),
+            'parent_keys': dict(
+                (name, [key.arg for key in keys])
+                for (name, keys) in entry.parent_keys.items()
+            ),
+            'own_keys': [key.arg for key in entry.own_keys],
+            'groupings': {
+                'identification': id_group,
+                'parent_identification': parent_id_group,
+                'data': compose(entry.path + [self.data_suffix]),
+            },
+            'rpcs': rpcs,
+        }
+
+
+def iter_records(generator, module):
+    """Lazily describe each entry-point found in the module.
+
+    Arguments:
+        generator (pyang_accessors.generators.RPCGenerator):
+            Generator whose configuration and naming rules will be used.
+        module (pyang.statements.Statement):
+            Original module that describes the data structure.
+
+    Yields:
+        dict: manifest record, including the name of the original
+            ``module``.
+    """
+    # the records do not include the payloads, so they are not copied
+    for entry in generator.scan(module, copy_payloads=False):
+        record = generator.describe(entry)
+        record['module'] = module.arg
+        yield record
+
+
+def dump_manifest(records, fp):
+    """Write each record as a JSON line, as soon as it is produced.
+
+    Arguments:
+        records (iterable): dicts produced by :func:`iter_records`.
+        fp (file): writable file-like object.
+    """
+    for record in records:
+        fp.write(json.dumps(record, sort_keys=True))
+        fp.write('\n')
+
+
+def load_manifest(fp):
+    """Lazily read the records from a manifest file.
+
+    Arguments:
+        fp (file): readable file-like object, or any iterable of lines.
+
+    Yields:
+        dict: manifest record
+    """
+    for line in fp:
+        line = line.strip()
+        if line:
+            yield json.loads(line)
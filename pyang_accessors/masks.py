@@ -0,0 +1,115 @@
+# -*- coding: utf-8 -*-
+"""\
+Tools for reading just some fields of a complex node (field masks).
+
+The READ request of an ``include``/``atomic`` node can select which of
+its children should be returned. Since the fields not selected are
+absent from the response, the response uses a projection of the data
+grouping, where the nodes are refined to be optional::
+
+    grouping admin-projection {
+        uses admin-data {
+            refine "admin/email" { mandatory false; }
+        }
+    }
+"""
+from .payloads import unwrap
+
+__author__ = "Anderson Bravalheri"
+__copyright__ = "Copyright (C) 2016 Anderson Bravalheri"
+__license__ = "mozilla"
+
+FIELD_KEYWORDS = ('leaf', 'leaf-list', 'container', 'list',
+                  'anyxml', 'anydata')
+"""Keywords of the nodes that can be selected by a field mask"""
+
+MASKABLE_KEYWORDS = ('container', 'list')
+"""Keywords of the payloads whose READ accessors can have a field mask"""
+
+
+def schema_children(node):
+    """Children of a node in the schema tree.
+
+    The expanded children (``i_children``) are used if available, so the
+    nodes from ``uses`` statements are also considered.
+    """
+    children = getattr(node, 'i_children', None)
+    if children is None:
+        children = [
+            child for child in node.substmts
+            if child.keyword in FIELD_KEYWORDS + ('choice', 'case')
+        ]
+
+    return children
+
+
+def is_maskable(payload):
+    """Check if the READ accessor of a payload can have a field mask"""
+    return getattr(unwrap(payload), 'keyword', None) in MASKABLE_KEYWORDS
+
+
+def mask_fields(payload):
+    """Names of the children that can be selected by a field mask.
+
+    The children of ``choice`` and ``case`` nodes are considered direct
+    children of the payload.
+
+    Arguments:
+        payload (pyang.statements.Statement): data of the entry-point.
+
+    Returns:
+        list: names, in the schema order.
+    """
+    fields = []
+    stack = list(reversed(schema_children(unwrap(payload))))
+    while stack:
+        node = stack.pop()
+        if node.keyword in ('choice', 'case'):
+            stack.extend(reversed(schema_children(node)))
+        elif node.keyword in FIELD_KEYWORDS:
+            fields.append(node.arg)
+
+    return fields
+
+
+def optional_refines(payload):
+    """Refinements that allow any field of the payload to be absent.
+
+    ``mandatory`` and ``min-elements`` are relaxed for the children of
+    the payload and, since an absent field has no descendants, for the
+    descendants that would make a non-presence container mandatory.
+
+    Arguments:
+        payload (pyang.statements.Statement): data of the entry-point.
+
+    Returns:
+        list: ``refine`` nodes in the tuple form, relative to a grouping
+            with the payload as its single child.
+    """
+    payload = unwrap(payload)
+    refines = []
+    stack = [
+        (child, [payload.arg])
+        for child in reversed(schema_children(payload))
+    ]
+    while stack:
+        (node, parent_path) = stack.pop()
+        path = parent_path + [node.arg]
+
+        changes = []
+        mandatory = node.search_one('mandatory')
+        if mandatory is not None and mandatory.arg == 'true':
+            changes.append(('mandatory', 'false'))
+        min_elements = node.search_one('min-elements')
+        if min_elements is not None and min_elements.arg != '0':
+            changes.append(('min-elements', '0'))
+        if changes:
+            refines.append(('refine', '/'.join(path), changes))
+
+        if (node.keyword in ('choice', 'case') or
+                (node.keyword == 'container' and
+                 node.search_one('presence') is None)):
+            stack.extend(
+                (child, path) for child in reversed(schema_children(node)))
+
+    return refines
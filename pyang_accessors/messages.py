@@ -0,0 +1,227 @@
+# -*- coding: utf-8 -*-
+"""\
+Tools for generating precompiled codecs for the RPCs of the output module.
+
+For each RPC, the input fields and the cases of the response ``choice``
+(e.g. ``success``/``failure``) are resolved at generation time, following
+the ``uses`` chains. The generated Python module encodes/decodes NETCONF
+XML and RFC 7951 JSON messages using just these static tables, without
+walking the YANG schema for each message::
+
+    from acme_interface_codecs import RPCS
+
+    element = RPCS['get-user-name'].encode_input_xml({'login': 'joe'})
+    (case, data) = RPCS['get-user-name'].decode_output_json(reply)
+"""
+from .payloads import (
+    MULTIPLE,
+    PRELUDE,
+    grouping_fields,
+    local_groupings,
+    unwrap
+)
+
+__author__ = "Anderson Bravalheri"
+__copyright__ = "Copyright (C) 2016 Anderson Bravalheri"
+__license__ = "mozilla"
+
+CODEC_PRELUDE = '''
+from xml.etree.ElementTree import Element
+
+MODULE = {module!r}
+
+_JSON_PARSE = {{
+    'int64': int,
+    'decimal': Decimal,
+    'empty': lambda value: True,
+}}
+
+
+def _json_value(type_name, value):
+    """Convert a Python value in a RFC 7951 JSON value"""
+    if type_name in ('int64', 'decimal'):
+        return text(value)
+    if type_name == 'empty':
+        return [None]
+    return value
+
+
+def _to_json(fields, data):
+    """Convert data in a RFC 7951 JSON object"""
+    obj = {{}}
+    for (name, _, keyword, type_name, children) in fields:
+        value = data.get(name)
+        if value is None:
+            continue
+        multiple = keyword in {multiple!r}
+        items = value if multiple else [value]
+        if children:
+            items = [_to_json(children, item) for item in items]
+        else:
+            items = [_json_value(type_name, item) for item in items]
+        obj[name] = items if multiple else items[0]
+    return obj
+
+
+def _from_json(fields, obj):
+    """Read data from a RFC 7951 JSON object"""
+    data = {{}}
+    for (name, _, keyword, type_name, children) in fields:
+        value = obj.get(name)
+        if value is None:
+            continue
+        multiple = keyword in {multiple!r}
+        items = value if multiple else [value]
+        if children:
+            items = [_from_json(children, item) for item in items]
+        else:
+            parse = _JSON_PARSE.get(type_name)
+            if parse:
+                items = [parse(item) for item in items]
+        data[name] = items if multiple else items[0]
+    return data
+
+
+def _detect_case(cases, decode, message):
+    """Find the first case with data in the message"""
+    for (case, fields) in cases:
+        data = decode(fields, message)
+        if data:
+            return (case, data)
+    return (cases[0][0], {{}})
+
+
+class _RPC(object):
+    """Precompiled codec for a RPC.
+
+    Attributes:
+        name (str): name of the RPC
+        tag (str): qualified XML tag of the RPC element
+        input_fields (tuple): field table for the input
+        output_cases (tuple): ``(case, fields)`` for each case of the
+            response. The case is ``None`` if the output has no choice.
+    """
+    __slots__ = ('name', 'tag', 'input_fields', 'output_cases', '_cases')
+
+    def __init__(self, name, input_fields, output_cases):
+        self.name = name
+        self.tag = '{{%s}}%s' % (NAMESPACE, name)
+        self.input_fields = input_fields
+        self.output_cases = output_cases or ((None, ()),)
+        self._cases = dict(self.output_cases)
+
+    def encode_input_xml(self, data):
+        """Create the RPC element (to be placed inside ``<rpc>``)"""
+        element = Element(self.tag)
+        _encode(element, self.input_fields, data)
+        return element
+
+    def decode_input_xml(self, element):
+        """Read the input from the RPC element"""
+        return _decode(element, self.input_fields)
+
+    def encode_output_xml(self, parent, case, data):
+        """Append the output of a case as children of ``<rpc-reply>``"""
+        _encode(parent, self._cases[case], data)
+        return parent
+
+    def decode_output_xml(self, parent):
+        """Read ``(case, data)`` from the children of ``<rpc-reply>``"""
+        return _detect_case(
+            self.output_cases, lambda fields, el: _decode(el, fields), parent)
+
+    def encode_input_json(self, data):
+        """Create the RFC 7951 JSON object for the input"""
+        return {{MODULE + ':input': _to_json(self.input_fields, data)}}
+
+    def decode_input_json(self, obj):
+        """Read the input from a RFC 7951 JSON object"""
+        return _from_json(self.input_fields, obj.get(MODULE + ':input', {{}}))
+
+    def encode_output_json(self, case, data):
+        """Create the RFC 7951 JSON object for the output of a case"""
+        return {{MODULE + ':output': _to_json(self._cases[case], data)}}
+
+    def decode_output_json(self, obj):
+        """Read ``(case, data)`` from a RFC 7951 JSON object"""
+        return _detect_case(
+            self.output_cases, _from_json, obj.get(MODULE + ':output', {{}}))
+'''
+
+
+def find_choice(parent, groupings):
+    """Find the first ``choice`` under a node, following ``uses`` chains"""
+    for node in unwrap(parent).substmts:
+        if node.keyword == 'choice':
+            return node
+        if node.keyword == 'uses':
+            grouping = (getattr(node, 'i_grouping', None) or
+                        groupings.get(node.arg))
+            choice = grouping is not None and find_choice(grouping, groupings)
+            if choice:
+                return choice
+
+    return None
+
+
+def output_cases(output, groupings, namespace):
+    """Describe each case of the response choice of a RPC output.
+
+    Returns:
+        list: ``(case_name, fields)`` for each case. If the output has no
+            choice, a single case named ``None`` is returned.
+    """
+    if output is None:
+        return []
+
+    choice = find_choice(output, groupings)
+    if choice is None:
+        return [(None, tuple(grouping_fields(output, groupings, namespace)))]
+
+    return [
+        (case.arg, tuple(grouping_fields(case, groupings, namespace)))
+        for case in choice.substmts if case.keyword == 'case'
+    ]
+
+
+def write_codecs(module, fp):
+    """Write precompiled XML/JSON codecs for the RPCs of a module.
+
+    Arguments:
+        module (pyang_builder.StatementWrapper): output module, produced
+            by :meth:`RPCGenerator.transform
+            <pyang_accessors.generators.RPCGenerator.transform>`.
+        fp (file): writable file-like object.
+    """
+    module = unwrap(module)
+    namespace = module.search_one('namespace')
+    namespace = namespace.arg if namespace is not None else ''
+    groupings = local_groupings(module)
+
+    fp.write('\n'.join([
+        '# -*- coding: utf-8 -*-',
+        '"""Precompiled RPC codecs for the ``{}`` module.'.format(module.arg),
+        '',
+        'DO NOT MODIFY! File automatically generated using '
+        '`pyang-accessors`.',
+        '"""',
+        PRELUDE.format(namespace=namespace, multiple=MULTIPLE),
+        CODEC_PRELUDE.format(module=module.arg, multiple=MULTIPLE),
+        '',
+        'RPCS = {',
+    ]))
+
+    for rpc in module.substmts:
+        if rpc.keyword != 'rpc':
+            continue
+        input_ = rpc.search_one('input')
+        input_fields = tuple(
+            grouping_fields(input_, groupings, namespace)
+            if input_ is not None else ())
+        cases = tuple(output_cases(
+            rpc.search_one('output'), groupings, namespace))
+        fp.write('\n    {!r}: _RPC(\n        {!r},\n        {!r},\n'
+                 '        {!r}),'.format(rpc.arg, rpc.arg,
+                                         input_fields, cases))
+
+    fp.write('\n}\n')
@@ -0,0 +1,187 @@
+# -*- coding: utf-8 -*-
+"""\
+Tools for re-prefixing the external definitions used by the output.
+
+The types, extensions and other prefixed arguments copied from the
+original module (and its imports) are re-prefixed, and the corresponding
+modules are added to an :class:`~pyang_accessors.registry.ImportRegistry`.
+"""
+from pyang.util import prefix_to_modulename_and_revision
+from pyangext.definitions import PREFIX_SEPARATOR
+from pyangext.utils import qualify_str
+
+from .payloads import unwrap
+from .predicates import has_prefixed_arg, is_custom_type, is_extension
+from .scan import KeyContext
+
+__author__ = "Anderson Bravalheri"
+__copyright__ = "Copyright (C) 2016 Anderson Bravalheri"
+__license__ = "mozilla"
+
+
+class Normalizer(object):
+    """Walk the AST finding external dependencies, prefixing and importing it.
+    """
+
+    def __init__(self, ctx, registry):
+        """Creates a Normalizer object
+
+        Arguments:
+            ctx (pyang.Context): Context to be used for prefix resolution.
+            registry (ImportRegistry): New imports that should be used.
+        """
+        self.ctx = ctx
+        self.registry = registry
+        # id(original) -> (original, normalized copy)
+        self.sources = {}
+        # id(original key context) -> (original, normalized key context)
+        self.key_contexts = {}
+
+    def namespaced_attribute(self, node, attr):
+        """Re-prefix attr in node with a valid and unique prefix.
+
+        Arguments:
+            node (pyang.statements.Statement):
+                Node whose attr will be re-prefixed.
+            attr (str): Name of the attribute to be re-prefixed,
+                e.g.: arg, keyword.
+
+        Returns:
+            tuple: (node, new_prefix, mod_name, mod_revision, attr_value)
+        """
+        # 1st: split attr in (current prefix, attr unprefixed name)
+        (prefix, value) = qualify_str(getattr(node, attr))
+
+        # 2nd: find module name and revision
+        (name, revision) = prefix_to_modulename_and_revision(
+            getattr(node, 'i_orig_module', node.i_module),
+            prefix, node.pos, self.ctx.errors)
+
+        if not prefix:
+            prefix = node.i_module.i_prefix
+
+        # 3rd: add module to the import list and retrieve a new unique prefix
+        prefix = self.registry.add(prefix, name, revision)
+
+        # 4th: Change the node itself to use the new prefix!
+        setattr(node, attr, PREFIX_SEPARATOR.join((prefix, value)))
+
+        return (node, prefix, name, revision, value)
+
+    def extension(self, node):
+        """Re-prefix extension to be used in a new module."""
+        node, prefix, name, _, value = self.namespaced_attribute(
+            node, 'raw_keyword')
+
+        node.keyword = (name, value)
+        node.raw_keyword = (prefix, value)
+
+        return node
+
+    def prefixed_arg(self, node):
+        """Re-prefix arg to be used in a new module."""
+        node, _, _, _, _ = self.namespaced_attribute(node, 'arg')
+
+        return node
+
+    def external_definitions(self, parent):
+        """Walk AST finding nodes that should be re-prefixed.
+
+        This allows these nodes to be used in other modules.
+
+        The nodes that should be re-prefixed are extensions, typedefs
+        and other nodes with prefixed args (if-feature for example).
+
+        Argument:
+            parent (pyang_builder.StatementWrapper):
+                Node from where the recursive search will be conducted.
+        """
+        # since custom type become a prefixed arg, do not run it before
+        # prefixed arg hook
+        parent.walk(has_prefixed_arg, self.prefixed_arg)
+        parent.walk(is_custom_type, self.prefixed_arg)
+        parent.walk(is_extension, self.extension)
+
+    def statement(self, statement):
+        """Re-prefix a statement and its descendants, in a single pass.
+
+        Each node is re-prefixed just once: a custom type that is already
+        prefixed is not visited again.
+
+        Arguments:
+            statement (pyang.statements.Statement): node to be changed.
+
+        Returns:
+            pyang.statements.Statement: the same node.
+        """
+        stack = [statement]
+        while stack:
+            node = stack.pop()
+            if has_prefixed_arg(node) or is_custom_type(node):
+                self.prefixed_arg(node)
+            if is_extension(node):
+                self.extension(node)
+            stack.extend(node.substmts)
+
+        return statement
+
+    def source(self, statement):
+        """Normalized private copy of a statement of the original module.
+
+        The copy is memoized by the identity of the statement, so the
+        statements shared by many entry-points (e.g. keys) are resolved
+        just once. The original statement is not changed.
+
+        Arguments:
+            statement (pyang.statements.Statement): original statement,
+                or a builder wrapper.
+
+        Returns:
+            pyang.statements.Statement
+        """
+        statement = unwrap(statement)
+        (original, normalized) = self.sources.get(id(statement), (None, None))
+        if original is not statement:
+            normalized = self.statement(statement.copy())
+            self.sources[id(statement)] = (statement, normalized)
+
+        return normalized
+
+    def key_context(self, keys):
+        """Key context (or list of keys) with the normalized keys"""
+        if not isinstance(keys, KeyContext):
+            return [self.source(key) for key in keys]
+
+        (original, normalized) = self.key_contexts.get(id(keys), (None, None))
+        if original is not keys:
+            normalized = KeyContext(
+                keys.item_name, [self.source(key) for key in keys])
+            self.key_contexts[id(keys)] = (keys, normalized)
+
+        return normalized
+
+    def entries(self, entries):
+        """Replace the statements of the entry-points by normalized copies.
+
+        The accessors just copy the payloads and keys of the entry-points,
+        so the output module does not need to be walked again: the
+        normalization cost depends on the size of the original module,
+        not on the number of copies.
+
+        Arguments:
+            entries (list): entry-points generated by scanner. They are
+                changed in place.
+
+        Returns:
+            list: the same entry-points.
+        """
+        for entry in entries:
+            if entry.payload is not None:
+                entry.payload = self.source(entry.payload)
+            entry.own_keys = self.key_context(entry.own_keys)
+            entry.parent_keys = dict(
+                (name, self.key_context(keys))
+                for (name, keys) in entry.parent_keys.items()
+            )
+
+        return entries
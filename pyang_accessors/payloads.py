@@ -0,0 +1,352 @@
+# -*- coding: utf-8 -*-
+"""\
+Tools for generating Python payload classes from the output module.
+
+One class is produced for each ``*-data`` and ``*-identification``
+grouping created by :meth:`RPCGenerator.transform
+<pyang_accessors.generators.RPCGenerator.transform>`. The classes use
+``__slots__`` and have explicit ``to_dict``/``from_dict`` methods. The
+values are converted according to the YANG types of the leafs when the
+payloads are created.
+``to_xml``/``from_xml`` rely on static field tables, with the tags
+(and namespaces) resolved at generation time.
+"""
+from keyword import iskeyword
+
+from inflection import camelize, underscore
+
+from pyangext.definitions import BUILT_IN_TYPES
+
+__author__ = "Anderson Bravalheri"
+__copyright__ = "Copyright (C) 2016 Anderson Bravalheri"
+__license__ = "mozilla"
+
+INTEGER_TYPES = ('int8', 'int16', 'int32',
+                 'uint8', 'uint16', 'uint32')
+
+PYTHON_TYPES = {
+    'int64': 'int64',
+    'uint64': 'int64',
+    'decimal64': 'decimal',
+    'boolean': 'bool',
+    'empty': 'empty',
+}
+"""YANG built-in type -> name of the conversion used in generated code.
+
+Other integer types are converted to ``int`` and the remaining
+types to ``text``. 64-bit integers are distinguished, since they are
+encoded as strings in JSON (RFC 7951).
+"""
+
+MULTIPLE = ('leaf-list', 'list')
+"""Keywords of nodes that correspond to sequences of values"""
+
+RESERVED_NAMES = ('self', 'to_dict', 'from_dict', 'to_xml', 'from_xml')
+"""Names used by the payload classes, that cannot be used as attributes"""
+
+PRELUDE = '''\
+from decimal import Decimal
+from xml.etree.ElementTree import SubElement
+
+try:
+    text = unicode  # noqa pylint: disable=invalid-name,undefined-variable
+except NameError:
+    text = str  # pylint: disable=invalid-name
+
+NAMESPACE = {namespace!r}
+
+_PARSE = {{
+    'int': int,
+    'int64': int,
+    'decimal': Decimal,
+    'bool': lambda value: value == 'true',
+    'empty': lambda value: True,
+    'text': text,
+}}
+
+_CONVERT = dict(
+    _PARSE,
+    decimal=lambda value: Decimal(text(value)),
+    bool=lambda value: (
+        value == 'true' if isinstance(value, (str, text)) else bool(value)),
+)
+
+
+def _convert_item(keyword, type_name, children, item):
+    """Convert a single value according to the type of a field"""
+    if keyword in ('anyxml', 'anydata'):
+        return item
+    if children:
+        return _convert_data(children, item)
+    return _CONVERT[type_name](item)
+
+
+def _convert(field, value):
+    """Convert the value of a field, item by item for sequences"""
+    (_, _, keyword, type_name, children) = field
+    if value is None:
+        return None
+    if keyword in {multiple!r}:
+        return [_convert_item(keyword, type_name, children, item)
+                for item in value]
+    return _convert_item(keyword, type_name, children, value)
+
+
+def _convert_data(fields, data):
+    """Convert the values of a dict with the children of a node"""
+    converted = {{}}
+    for field in fields:
+        value = _convert(field, data.get(field[0]))
+        if value is not None:
+            converted[field[0]] = value
+    return converted
+
+
+def _format(type_name, value):
+    """Convert a Python value in XML text"""
+    if type_name == 'bool':
+        return 'true' if value else 'false'
+    if type_name == 'empty':
+        return None
+    return text(value)
+
+
+def _encode(parent, fields, data):
+    """Append the data as children of an XML element"""
+    for (name, tag, keyword, type_name, children) in fields:
+        value = data.get(name)
+        if value is None:
+            continue
+        for item in (value if keyword in {multiple!r} else [value]):
+            node = SubElement(parent, tag)
+            if children:
+                _encode(node, children, item)
+            else:
+                node.text = _format(type_name, item)
+
+
+def _decode(element, fields):
+    """Read the data from the children of an XML element"""
+    data = {{}}
+    for (name, tag, keyword, type_name, children) in fields:
+        nodes = element.findall(tag)
+        if not nodes:
+            continue
+        if children:
+            values = [_decode(node, children) for node in nodes]
+        else:
+            values = [_PARSE[type_name](node.text or '') for node in nodes]
+        data[name] = values if keyword in {multiple!r} else values[0]
+    return data
+'''
+
+
+def unwrap(node):
+    """Retrieve the raw ``pyang`` statement from a builder wrapper"""
+    return node.unwrap() if hasattr(node, 'unwrap') else node
+
+
+def builtin_type(type_stmt):
+    """Follow the typedef chain until a YANG built-in type is found"""
+    while type_stmt is not None and type_stmt.arg not in BUILT_IN_TYPES:
+        typedef = getattr(type_stmt, 'i_typedef', None)
+        if typedef is None:
+            return None
+        type_stmt = typedef.search_one('type')
+
+    return type_stmt and type_stmt.arg
+
+
+def python_type(type_stmt):
+    """Name of the conversion used for the values of a leaf"""
+    name = builtin_type(type_stmt)
+    if name in INTEGER_TYPES:
+        return 'int'
+
+    return PYTHON_TYPES.get(name, 'text')
+
+
+def attribute_name(name):
+    """Valid Python identifier for a YANG node name"""
+    attr = underscore(name.replace('-', '_').replace('.', '_'))
+    return attr + '_' if iskeyword(attr) else attr
+
+
+def attribute_names(names):
+    """Unique attribute names for the fields of a payload class.
+
+    Names that collide with the methods of the class (see
+    :data:`RESERVED_NAMES`), or with each other, receive a ``_`` suffix.
+    """
+    taken = set(RESERVED_NAMES)
+    attrs = []
+    for name in names:
+        attr = attribute_name(name)
+        while attr in taken:
+            attr += '_'
+        taken.add(attr)
+        attrs.append(attr)
+
+    return attrs
+
+
+def class_name(name):
+    """Python class name for a grouping name"""
+    return camelize(attribute_name(name))
+
+
+def local_groupings(module):
+    """Index the top-level groupings of a module by name"""
+    return dict(
+        (node.arg, node) for node in unwrap(module).substmts
+        if node.keyword == 'grouping'
+    )
+
+
+def grouping_fields(parent, groupings, namespace):
+    """Describe the data nodes under a grouping (or other data node).
+
+    ``uses`` statements are expanded and the children of ``choice`` and
+    ``case`` are considered direct children of the parent.
+
+    Arguments:
+        parent (pyang.statements.Statement): grouping, container or list.
+        groupings (dict): groupings that can be used, by name.
+        namespace (str): XML namespace of the nodes.
+
+    Returns:
+        list: ``(name, tag, keyword, type_name, children)`` for each node,
+            where ``children`` is a tuple with the same structure.
+    """
+    fields = []
+    for node in unwrap(parent).substmts:
+        keyword = node.keyword
+        if keyword == 'uses':
+            grouping = (getattr(node, 'i_grouping', None) or
+                        groupings.get(node.arg))
+            if grouping is not None:
+                fields.extend(grouping_fields(grouping, groupings, namespace))
+        elif keyword in ('choice', 'case'):
+            fields.extend(grouping_fields(node, groupings, namespace))
+        elif keyword in ('leaf', 'leaf-list', 'anyxml', 'anydata'):
+            fields.append((
+                node.arg, '{%s}%s' % (namespace, node.arg), keyword,
+                python_type(node.search_one('type')), ()))
+        elif keyword in ('container', 'list'):
+            fields.append((
+                node.arg, '{%s}%s' % (namespace, node.arg), keyword, None,
+                tuple(grouping_fields(node, groupings, namespace))))
+
+    return fields
+
+
+def payload_class(grouping_name, fields):
+    """Python source code for a payload class.
+
+    Arguments:
+        grouping_name (str): name of the grouping.
+        fields (list): produced by :func:`grouping_fields`.
+
+    Returns:
+        str
+    """
+    attrs = attribute_names(field[0] for field in fields)
+    lines = [
+        'class {}(object):'.format(class_name(grouping_name)),
+        '    """``{}`` grouping.'.format(grouping_name),
+    ]
+    if fields:
+        lines.extend(['', '    Attributes:'])
+        lines.extend(
+            '        {} ({}): ``{}`` {}'.format(
+                attr, 'dict' if type_name is None else type_name,
+                name, keyword)
+            for (attr, (name, _, keyword, type_name, _)) in zip(attrs, fields)
+        )
+    lines.extend([
+        '    """',
+        '',
+        '    __slots__ = ({})'.format(
+            ''.join(repr(attr) + ', ' for attr in attrs).rstrip()),
+        '    _FIELDS = {!r}'.format(tuple(fields)),
+        '',
+        '    def __init__(self{}):'.format(
+            ''.join(', {}=None'.format(attr) for attr in attrs)),
+    ])
+    lines.extend(
+        '        self.{0} = _convert(self._FIELDS[{1}], {0})'.format(
+            attr, index)
+        for (index, attr) in enumerate(attrs)
+    )
+    if not attrs:
+        lines.append('        pass')
+
+    lines.extend([
+        '',
+        '    def to_dict(self):',
+        '        """Convert the payload in a dict, omitting empty fields"""',
+        '        data = {}',
+    ])
+    for (attr, field) in zip(attrs, fields):
+        lines.extend([
+            '        if self.{} is not None:'.format(attr),
+            '            data[{!r}] = self.{}'.format(field[0], attr),
+        ])
+    lines.extend([
+        '        return data',
+        '',
+        '    @classmethod',
+        '    def from_dict(cls, data):',
+        '        """Create a payload from a dict"""',
+        '        get = data.get',
+        '        return cls({})'.format(', '.join(
+            'get({!r})'.format(field[0]) for field in fields)),
+        '',
+        '    def to_xml(self, parent):',
+        '        """Append the fields as children of an XML element"""',
+        '        _encode(parent, self._FIELDS, self.to_dict())',
+        '',
+        '    @classmethod',
+        '    def from_xml(cls, element):',
+        '        """Create a payload from the children of an XML element"""',
+        '        return cls.from_dict(_decode(element, cls._FIELDS))',
+    ])
+
+    return '\n'.join(lines)
+
+
+def write_payload_classes(module, fp, suffixes=('data', 'identification')):
+    """Write Python payload classes for the groupings of a module.
+
+    Arguments:
+        module (pyang_builder.StatementWrapper): output module, produced
+            by :meth:`RPCGenerator.transform
+            <pyang_accessors.generators.RPCGenerator.transform>`.
+        fp (file): writable file-like object.
+        suffixes (tuple): a class is produced for each grouping whose
+            name ends with one of these suffixes.
+    """
+    module = unwrap(module)
+    namespace = module.search_one('namespace')
+    namespace = namespace.arg if namespace is not None else ''
+    groupings = local_groupings(module)
+
+    fp.write('\n'.join([
+        '# -*- coding: utf-8 -*-',
+        '"""Payload classes for the ``{}`` module.'.format(module.arg),
+        '',
+        'DO NOT MODIFY! File automatically generated using '
+        '`pyang-accessors`.',
+        '"""',
+        PRELUDE.format(namespace=namespace, multiple=MULTIPLE),
+    ]))
+
+    for node in module.substmts:
+        if node.keyword != 'grouping':
+            continue
+        if not any(node.arg.endswith(suffix) for suffix in suffixes):
+            continue
+        fields = grouping_fields(node, groupings, namespace)
+        fp.write('\n\n')
+        fp.write(payload_class(node.arg, fields))
+        fp.write('\n')
@@ -3,10 +3,26 @@
 """Plugin for pyang that applies the RPCGenerator to the input module"""
 import optparse  # pylint: disable=deprecated-module
 import re
+import sys
+from os.path import join
 
 from pyang import plugin
 
+from pyang_accessors.definitions import (
+    ACCESSORS_MODE,
+    ENUMERATION_SELECTOR,
+    GENERIC_MODE,
+    IDENTITY_SELECTOR
+)
+from pyang_accessors.estimate import dump_estimate
+from pyang_accessors.exceptions import (
+    BudgetExceededError,
+    DefinitionConflictError
+)
 from pyang_accessors.generators import RPCGenerator
+from pyang_accessors.manifest import dump_manifest, iter_records
+from pyang_accessors.messages import write_codecs
+from pyang_accessors.payloads import write_payload_classes
 
 __author__ = "Anderson Bravalheri"
 __copyright__ = "andersonbravalheri@gmail.com"
@@ -14,6 +30,20 @@ __license__ = "mozilla"
 
 FILENAME_REGEX = re.compile(r"^(.*?)(\@(\d{4}-\d{2}-\d{2}))?\.(\w+)$")
 
+YANG_FORMAT = 'rpc-accessors'
+MANIFEST_FORMAT = 'rpc-accessors-manifest'
+PYTHON_FORMAT = 'rpc-accessors-python'
+CODECS_FORMAT = 'rpc-accessors-codecs'
+ESTIMATE_FORMAT = 'rpc-accessors-estimate'
+
+
+def check_positive(option, opt_str, value, parser):
+    """Callback for options that only accept positive integers"""
+    if value < 1:
+        raise optparse.OptionValueError(
+            '{} should be a positive integer, not {}'.format(opt_str, value))
+    setattr(parser.values, option.dest, value)
+
 
 def pyang_plugin_init():
     """Register plugin in ``pyang`` control structures"""
@@ -49,20 +79,209 @@ class RPCAccessorsPlugin(plugin.PyangPlugin):
                 '--output-module-prefix', default=None,
                 help='The generated module will have this prefix'
             ),
+            optparse.make_option(
+                '--accessors-include', action='append', default=None,
+                metavar='PATTERN',
+                help=(
+                    'Just generate accessors for the paths matching this '
+                    'glob pattern, e.g.: `user/*` (can be repeated)'
+                )
+            ),
+            optparse.make_option(
+                '--accessors-exclude', action='append', default=None,
+                metavar='PATTERN',
+                help=(
+                    'Do not generate accessors for the paths matching this '
+                    'glob pattern (can be repeated)'
+                )
+            ),
+            optparse.make_option(
+                '--accessors-operation', action='append', default=None,
+                metavar='OPERATION',
+                help=(
+                    'Just generate accessors for this operation, '
+                    'e.g.: `get` (can be repeated)'
+                )
+            ),
+            optparse.make_option(
+                '--accessors-mode', default=ACCESSORS_MODE,
+                choices=[ACCESSORS_MODE, GENERIC_MODE],
+                help=(
+                    '`accessors`: one RPC for each accessor (default)\n'
+                    '`generic`: one RPC for each operation, receiving '
+                    'the path as argument'
+                )
+            ),
+            optparse.make_option(
+                '--accessors-path-selector', default=ENUMERATION_SELECTOR,
+                choices=[ENUMERATION_SELECTOR, IDENTITY_SELECTOR],
+                help=(
+                    'Type used to select paths in the `generic` mode: '
+                    '`enumeration` (default) or `identity`'
+                )
+            ),
+            optparse.make_option(
+                '--accessors-bulk', action='store_true', default=False,
+                help=(
+                    'Add `get-many`/`set-many` accessors for all the nodes '
+                    'under each list item'
+                )
+            ),
+            optparse.make_option(
+                '--accessors-paginate', action='store_true', default=False,
+                help=(
+                    'Add `get-page` accessors, that read a limited number '
+                    'of list items starting from a cursor'
+                )
+            ),
+            optparse.make_option(
+                '--accessors-list-keys', action='store_true', default=False,
+                help=(
+                    'Add `list-*-keys` accessors, that enumerate just the '
+                    'keys of the items of each list'
+                )
+            ),
+            optparse.make_option(
+                '--accessors-normalize-once', action='store_true',
+                default=False,
+                help=(
+                    'Resolve the prefixes used by each original statement '
+                    'just once, instead of once for each copy'
+                )
+            ),
+            optparse.make_option(
+                '--accessors-conditional-reads', action='store_true',
+                default=False,
+                help=(
+                    'Add an optional version token to the `get` requests, '
+                    'so the response can be just `not-modified`'
+                )
+            ),
+            optparse.make_option(
+                '--accessors-field-masks', action='store_true',
+                default=False,
+                help=(
+                    'Add a selection of fields to the `get` requests of '
+                    'containers and lists'
+                )
+            ),
+            optparse.make_option(
+                '--accessors-max-include-depth', type='int', default=None,
+                metavar='N', action='callback', callback=check_positive,
+                help=(
+                    'Copy at most N levels of descendants into the payloads '
+                    'of `include`/`include-item` nodes'
+                )
+            ),
+            optparse.make_option(
+                '--accessors-subscribe', action='store_true', default=False,
+                help=(
+                    'Add `subscribe`/`unsubscribe` accessors and `*-changed` '
+                    'notifications for all the nodes (not just the ones '
+                    'with the `observable` modifier)'
+                )
+            ),
+            optparse.make_option(
+                '--accessors-shard-dir', default=None, metavar='DIR',
+                help=(
+                    'Split the generated module into submodules, written '
+                    'to this directory. The main module, that includes '
+                    'them, is written to the regular output'
+                )
+            ),
+            optparse.make_option(
+                '--accessors-shard-size', type='int', default=None,
+                metavar='N', action='callback', callback=check_positive,
+                help=(
+                    'Maximum number of entry-points in each submodule. '
+                    'By default, one submodule is written for each '
+                    'top-level node'
+                )
+            ),
+            optparse.make_option(
+                '--accessors-max-entries', type='int', default=None,
+                metavar='N',
+                help='Abort if more than N entry-points are found'
+            ),
+            optparse.make_option(
+                '--accessors-max-groupings', type='int', default=None,
+                metavar='N',
+                help='Abort if more than N groupings would be generated'
+            ),
+            optparse.make_option(
+                '--accessors-max-payload-nodes', type='int', default=None,
+                metavar='N',
+                help=(
+                    'Abort if a payload (or grouping) with more than N '
+                    'statements would be generated'
+                )
+            ),
+            optparse.make_option(
+                '--accessors-max-output-nodes', type='int', default=None,
+                metavar='N',
+                help=(
+                    'Abort if the output would have more than N statements'
+                )
+            ),
         ])
 
     def add_output_format(self, fmts):
         """Register output formats handled by plugin"""
 
         self.multiple_modules = False
-        fmts['rpc-accessors'] = self
+        fmts[YANG_FORMAT] = self
+        fmts[MANIFEST_FORMAT] = self
+        fmts[PYTHON_FORMAT] = self
+        fmts[CODECS_FORMAT] = self
+        fmts[ESTIMATE_FORMAT] = self
 
     def emit(self, ctx, modules, fp):
-        """Generate YANG/YIN file with RPC definitions"""
+        """Generate YANG/YIN file with RPC definitions
+
+        The ``rpc-accessors-manifest`` format writes instead one JSON line
+        for each entry-point (see :mod:`pyang_accessors.manifest`).
+
+        The ``rpc-accessors-python`` format writes Python payload classes
+        for the generated groupings (see :mod:`pyang_accessors.payloads`).
+
+        The ``rpc-accessors-codecs`` format writes Python XML/JSON codecs
+        for the generated RPCs (see :mod:`pyang_accessors.messages`).
+
+        The ``rpc-accessors-estimate`` format writes a JSON report with the
+        number of RPCs, groupings and the approximated size of the output,
+        without generating it (see :mod:`pyang_accessors.estimate`).
+
+        If ``--accessors-shard-dir`` is given, the generated module is
+        split into submodules, written to that directory (see
+        :meth:`RPCGenerator.transform_shards
+        <pyang_accessors.generators.RPCGenerator.transform_shards>`).
+        Submodules with conflicting definitions abort the generation.
+
+        If a budget (e.g. ``--accessors-max-output-nodes``) is exceeded,
+        the generation is aborted and the paths that contributed the most
+        for the growth of the output are reported.
+        """
+        try:
+            self.emit_format(ctx, modules, fp)
+        except (BudgetExceededError, DefinitionConflictError) as ex:
+            sys.stderr.write('{}\n'.format(ex))
+            sys.exit(1)
+
+    @staticmethod
+    def emit_format(ctx, modules, fp):
+        """Write the output in the format selected in the command line"""
+        generator = create_generator(ctx)
+
+        if ctx.opts.format == MANIFEST_FORMAT:
+            dump_manifest(iter_records(generator, modules[0]), fp)
+            return
+
+        if ctx.opts.format == ESTIMATE_FORMAT:
+            dump_estimate(generator.estimate(modules[0]), fp)
+            return
 
         options = ctx.opts
         name = options.output_module_name
-        suffix = options.output_module_suffix
         generator_options = {
             'namespace': options.output_module_namespace,
             'prefix': options.output_module_prefix,
@@ -76,7 +295,60 @@ class RPCAccessorsPlugin(plugin.PyangPlugin):
 
         generator_options['name'] = name
 
-        generator = RPCGenerator(ctx, suffix=suffix)
+        if options.accessors_shard_dir and ctx.opts.format == YANG_FORMAT:
+            emit_shards(ctx, generator, modules[0], generator_options, fp)
+            return
+
         out = generator.transform(modules[0], **generator_options)
 
+        if ctx.opts.format == PYTHON_FORMAT:
+            # the suffixes are set from RPCGenerator.DEFAULT_CONFIG
+            # pylint: disable=no-member
+            write_payload_classes(out, fp, suffixes=(
+                generator.data_suffix, generator.identification_suffix))
+            return
+
+        if ctx.opts.format == CODECS_FORMAT:
+            write_codecs(out, fp)
+            return
+
         out.dump(fp, ctx=ctx)
+
+
+def create_generator(ctx):
+    """Instantiate a RPCGenerator from the command line options"""
+    options = ctx.opts
+
+    return RPCGenerator(
+        ctx, suffix=options.output_module_suffix,
+        include_paths=options.accessors_include,
+        exclude_paths=options.accessors_exclude,
+        allowed_operations=options.accessors_operation,
+        mode=options.accessors_mode,
+        path_selector=options.accessors_path_selector,
+        bulk=options.accessors_bulk,
+        paginate=options.accessors_paginate,
+        list_keys=options.accessors_list_keys,
+        normalize_once=options.accessors_normalize_once,
+        subscribe=options.accessors_subscribe,
+        conditional_reads=options.accessors_conditional_reads,
+        field_masks=options.accessors_field_masks,
+        max_include_depth=options.accessors_max_include_depth,
+        shard_size=options.accessors_shard_size,
+        max_entries=options.accessors_max_entries,
+        max_groupings=options.accessors_max_groupings,
+        max_payload_nodes=options.accessors_max_payload_nodes,
+        max_output_nodes=options.accessors_max_output_nodes)
+
+
+def emit_shards(ctx, generator, module, generator_options, fp):
+    """Write the main module to ``fp`` and the submodules to the shard dir"""
+    outputs = generator.transform_shards(module, **generator_options)
+    (_, main) = outputs[0]
+
+    for (name, submodule) in outputs[1:]:
+        path = join(ctx.opts.accessors_shard_dir, name + '.yang')
+        with open(path, 'w') as shard_fp:
+            submodule.dump(shard_fp, ctx=ctx)
+
+    main.dump(fp, ctx=ctx)
@@ -15,7 +15,8 @@ from .definitions import (
     ATOMIC_ITEM,
     INCLUDE,
     INCLUDE_ITEM,
-    MODIFIER_EXT
+    MODIFIER_EXT,
+    OBSERVABLE
 )
 
 __author__ = "Anderson Bravalheri"
@@ -61,6 +62,10 @@ def is_leaf_list(statement):
     return statement.keyword == 'leaf-list'
 
 
+def is_observable(statement):
+    return find(statement, MODIFIER_EXT, OBSERVABLE, ignore_prefix=True)
+
+
 def is_plain(statement):
     return statement.keyword in ('leaf', 'anyxml')
 
@@ -2,6 +2,8 @@
 """Tools for managing the imported modules, its prefixed and revisions."""
 from __future__ import unicode_literals
 
+import threading
+
 import inflection
 
 from pyangext.definitions import URL_SEPARATOR
@@ -13,8 +15,25 @@ __copyright__ = "Copyright (C) 2016 Anderson Bravalheri"
 __license__ = "mozilla"
 
 
+_PREFIXES = {}
+
+
 def prefixify(name, separator='-'):
-    """Creates a valid prefix from module name or namespace"""
+    """Creates a valid prefix from module name or namespace
+
+    The results are memoized, since the same modules are imported by
+    many others.
+    """
+    key = (name, separator)
+    prefix = _PREFIXES.get(key)
+    if prefix is None:
+        prefix = _PREFIXES[key] = _prefixify(name, separator)
+
+    return prefix
+
+
+def _prefixify(name, separator):
+    """Non-memoized version of :func:`prefixify`"""
     # remove urn
     name = name.replace('http://', '').replace('urn:', '')
 
@@ -36,13 +55,18 @@ class ImportRegistry(object):
     This class can be used to manage prefixes and revisions of the
     imported module.
 
+    If a ``catalog`` is given, the prefixes are allocated by it, so the
+    same module is imported with the same prefix by all the modules that
+    share the catalog. The indexes just hold the imports of this module.
+
     Attributes:
         by_prefix (dict): ``prefix -> (module_name, revision)``
         by_name (dict): ``module_name -> (prefix, revision)``
         prefixes_reserved (list): list of prefixes disallowed.
+        catalog (CatalogRegistry): shared prefix allocation.
     """
 
-    def __init__(self):
+    def __init__(self, catalog=None):
         """Initialize the registry"""
         # Indexes
         self.by_prefix = {}
@@ -50,6 +74,7 @@ class ImportRegistry(object):
         # Collisions counters
         self.prefix_request = {}
         self.prefixes_reserved = []
+        self.catalog = catalog
 
     def add(self, prefix, name, revision):
         """Add a module in the prefix registry.
@@ -66,6 +91,13 @@ class ImportRegistry(object):
         Returns:
             str: The prefix that should be used for the module.
         """
+        if self.catalog is not None:
+            # revision conflicts are detected by the catalog
+            prefix = self.catalog.add(prefix, name, revision)
+            self.by_prefix[prefix] = (name, revision)
+            self.by_name[name] = (prefix, revision)
+            return prefix
+
         # See if module was already registered
         some_prefix, some_revision = self.by_name.get(name, (None, None))
 
@@ -100,6 +132,72 @@ class ImportRegistry(object):
     def reserve_prefix(self, *prefixes):
         """After reserved prefix, cannot be taken"""
 
+        if self.catalog is not None:
+            self.catalog.reserve_prefix(*prefixes)
+
         for prefix in prefixes:
             self.prefixes_reserved.append(prefix)
             self.prefix_request[prefix] = 1
+
+
+class CatalogRegistry(ImportRegistry):
+    """Prefix allocation shared by all the modules of a catalog.
+
+    Each module is assigned to a single prefix (and revision) in the
+    whole catalog, so importing the same module with two different
+    revisions is detected across modules.
+
+    The registry can be shared between threads, or pickled and merged
+    by drivers running in separated processes (see :meth:`merge`).
+    """
+
+    def __init__(self):
+        """Initialize the registry"""
+        super(CatalogRegistry, self).__init__()
+        self._lock = threading.Lock()
+
+    def add(self, prefix, name, revision):
+        """Add a module in the prefix registry.
+
+        See :meth:`ImportRegistry.add`.
+        """
+        with self._lock:
+            return super(CatalogRegistry, self).add(prefix, name, revision)
+
+    def reserve_prefix(self, *prefixes):
+        """After reserved prefix, cannot be taken"""
+        with self._lock:
+            super(CatalogRegistry, self).reserve_prefix(*prefixes)
+
+    def merge(self, other):
+        """Add the modules registered in other registry.
+
+        Arguments:
+            other (ImportRegistry): e.g. a catalog filled by a worker.
+
+        Raises:
+            YangImportError: If the same module is registered with
+                different revisions.
+
+        Returns:
+            dict: ``module_name -> prefix`` for the modules whose prefix in
+                this catalog is different from the prefix in ``other``.
+        """
+        renamed = {}
+        for (name, (prefix, revision)) in sorted(other.by_name.items()):
+            new_prefix = self.add(prefix, name, revision)
+            if new_prefix != prefix:
+                renamed[name] = new_prefix
+
+        return renamed
+
+    def __getstate__(self):
+        """Locks cannot be pickled"""
+        state = self.__dict__.copy()
+        del state['_lock']
+        return state
+
+    def __setstate__(self, state):
+        """Recreate the lock after unpickling"""
+        self.__dict__.update(state)
+        self._lock = threading.Lock()
@@ -2,19 +2,23 @@
 """\
 Tools for searching a YANG module looking for nodes that can be accessed.
 """
-from itertools import chain as concat
+from copy import copy as shallow_copy
 
 from inflection import singularize
 
+from pyang.error import add_error_code, err_add
 from pyang_builder import ListWrapper
-from pyangext.utils import find, select
+from pyangext.utils import find
 
 from .definitions import (  # constants and identifiers
     CHANGE_OP,
+    DEPTH_EXT,
     ITEM_ADD_OP,
     ITEM_NAME,
     ITEM_REMOVE_OP,
-    READ_OP
+    READ_OP,
+    SUBSCRIBE_OP,
+    UNSUBSCRIBE_OP
 )
 from .predicates import (
     is_atomic,
@@ -24,6 +28,7 @@ from .predicates import (
     is_included_item,
     is_leaf_list,
     is_list,
+    is_observable,
     is_read_only,
     is_top_level
 )
@@ -34,6 +39,17 @@ _PRUNE = GeneratorExit()
 READ_ONLY_OPS = [READ_OP]
 DEFAULT_OPS = READ_ONLY_OPS + [CHANGE_OP]
 DEFAULT_ITEM_OPS = DEFAULT_OPS + [ITEM_ADD_OP, ITEM_REMOVE_OP]
+SUBSCRIPTION_OPS = [SUBSCRIBE_OP, UNSUBSCRIBE_OP]
+
+SCHEMA_KEYWORDS = ('container', 'list', 'choice', 'case',
+                   'leaf', 'leaf-list', 'anyxml', 'anydata',
+                   'uses', 'augment')
+"""Statements replaced by the expanded children when a payload is truncated"""
+
+DEPTH_ERROR = 'ACCESSORS_BAD_DEPTH'
+add_error_code(
+    DEPTH_ERROR, 3,
+    'the depth of an included node should be a positive integer, not "%s"')
 
 
 def ensure_validated(statement):
@@ -52,10 +68,13 @@ def find_keys(statement):
     """Find the key nodes for a list, specified in the ``key`` statement."""
     key = statement.search_one('key')
 
-    return key and [
-        select(statement.i_children, arg=name)[0]
-        for name in key.arg.split(' ')
-    ]
+    if not key:
+        return key
+
+    # index the children once, instead of searching for each key
+    children = dict((child.arg, child) for child in statement.i_children)
+
+    return [children[name] for name in key.arg.split()]
 
 
 def find_item_name(statement):
@@ -64,12 +83,92 @@ def find_item_name(statement):
     # of the item
     item_name = find(statement, ITEM_NAME, ignore_prefix=True)
     if item_name:
-        print item_name[0].arg
         return item_name[0].arg
 
     return singularize(statement.arg)
 
 
+def find_include_depth(statement):
+    """Discover the maximum depth of the payload of an included node.
+
+    Values that are not positive integers are reported as errors in the
+    context of the module, and ignored.
+    """
+    depth = find(statement, DEPTH_EXT, ignore_prefix=True)
+    if not depth:
+        return None
+
+    value = depth[0].arg
+    try:
+        levels = int(value)
+    except (TypeError, ValueError):
+        levels = 0
+
+    if levels > 0:
+        return levels
+
+    err_add(statement.i_module.i_ctx.errors, depth[0].pos,
+            DEPTH_ERROR, value)
+    return None
+
+
+def copy_truncated(statement, depth):
+    """Copy a data node, keeping just ``depth`` levels of descendants.
+
+    Containers and lists deeper than ``depth`` are not copied at all, so
+    the memory used is bounded by the size of the result.
+
+    The children in the schema tree (``i_children``) replace the data
+    definition statements, so the nodes from ``uses`` are expanded and
+    truncated as well. ``choice`` and ``case`` nodes do not count as
+    levels.
+
+    Arguments:
+        statement (pyang.statements.Statement): node to be copied.
+        depth (int): number of levels of descendants, e.g. with ``1``
+            just the leaves directly under the node are copied.
+
+    Returns:
+        pyang.statements.Statement
+    """
+    root = shallow_copy(statement)
+    stack = [(statement, root, 1)]
+    while stack:
+        (original, new, level) = stack.pop()
+        children = getattr(original, 'i_children', None)
+        if children is None:
+            children = [
+                child for child in original.substmts
+                if child.keyword in SCHEMA_KEYWORDS
+            ]
+
+        kept = []
+        for child in children:
+            if child.keyword in ('choice', 'case'):
+                child_level = level
+            elif child.keyword in ('container', 'list'):
+                if level >= depth:
+                    continue
+                child_level = level + 1
+            else:
+                kept.append(child.copy(new))
+                continue
+
+            new_child = shallow_copy(child)
+            new_child.parent = new
+            kept.append(new_child)
+            stack.append((child, new_child, child_level))
+
+        new.substmts = [
+            node.copy(new) for node in original.substmts
+            if node.keyword not in SCHEMA_KEYWORDS
+        ] + kept
+        if hasattr(original, 'i_children'):
+            new.i_children = kept
+
+    return root
+
+
 class EntryPoint(object):
     """Store information about an entry-point.
 
@@ -117,13 +216,26 @@ class EntryPoint(object):
             ')>',
         ])
 
-    def copy(self):
-        """Copy the entry-point avoiding overriding it."""
+    def copy(self, copy_payload=True):
+        """Copy the entry-point avoiding overriding it.
 
-        payload = self.payload and (
-            self.payload.invoke('copy')
-            if isinstance(self.payload, ListWrapper)
-            else self.payload.copy()
+        Arguments:
+            copy_payload (bool): if ``False``, the copy shares the payload
+                with the original entry-point.
+        """
+        payload = self.payload
+        if copy_payload:
+            payload = payload and (
+                payload.invoke('copy')
+                if isinstance(payload, ListWrapper)
+                else payload.copy()
+            )
+
+        own_keys = self.own_keys
+        own_keys = (
+            KeyContext(own_keys.item_name, own_keys)
+            if isinstance(own_keys, KeyContext)
+            else own_keys[:]
         )
 
         return type(self)(
@@ -131,7 +243,93 @@ class EntryPoint(object):
             payload,
             self.operations[:],
             self.parent_keys.copy(),
-            self.own_keys[:])
+            own_keys)
+
+
+class KeyContext(list):
+    """Key statements of a list, computed once for each list.
+
+    The same object is shared by all the entry-points under the list
+    (as ``own_keys`` or as a value of ``parent_keys``), therefore it
+    also memoizes the data derived from the keys.
+
+    Attributes:
+        item_name (str): name of the list item.
+        names (frozenset): arguments of the key statements.
+    """
+
+    def __init__(self, item_name, keys):
+        super(KeyContext, self).__init__(keys)
+        self.item_name = item_name
+        self.names = frozenset(key.arg for key in keys)
+        self._prefixed = {}
+
+    def prefixed(self, name_composer):
+        """Copies of the keys with names prefixed by the item name.
+
+        Arguments:
+            name_composer (function): used to compose the name,
+                e.g. ``['user', 'id'] -> 'user-id'``.
+
+        Returns:
+            list: key statements, the same list for each ``name_composer``.
+        """
+        prefixed = self._prefixed.get(name_composer)
+        if prefixed is None:
+            prefixed = []
+            for key in self:
+                new = key.copy()
+                new.arg = name_composer([self.item_name, key.arg])
+                prefixed.append(new)
+            self._prefixed[name_composer] = prefixed
+
+        return prefixed
+
+
+class ScanFrame(object):
+    """Context inherited by the descendants of a node during the scan.
+
+    Attributes:
+        path (list): accessor path of the node (including the
+            ``parent_path`` passed to :meth:`Scanner.scan`).
+        read_only (bool): the node or one of its ancestors is read-only.
+        key_names (frozenset): names of the keys of the ancestor lists,
+            that should not produce entry-points.
+        keys (tuple): ``(item_name, key_context)`` for each ancestor list,
+            ordered from the innermost to the outermost.
+        observable (bool): the node or one of its ancestors has the
+            ``observable`` modifier.
+    """
+    __slots__ = ('path', 'read_only', 'key_names', 'keys', 'observable')
+
+    def __init__(self, path, read_only=False,
+                 key_names=frozenset(), keys=(), observable=False):
+        self.path = path
+        self.read_only = read_only
+        self.key_names = key_names
+        self.keys = keys
+        self.observable = observable
+
+    def descend(self, path, read_only=False, keys=None, observable=False):
+        """Create the frame for the children of a node.
+
+        Arguments:
+            path (list): accessor path of the node.
+            read_only (bool): the node is read-only.
+            keys (KeyContext): keys, if the node is a list.
+            observable (bool): the node has the ``observable`` modifier.
+        """
+        read_only = self.read_only or read_only
+        observable = self.observable or observable
+        if not keys:
+            return type(self)(path, read_only, self.key_names, self.keys,
+                              observable)
+
+        return type(self)(
+            path, read_only,
+            self.key_names | keys.names,
+            ((keys.item_name, keys),) + self.keys,
+            observable)
 
 
 class Scanner(object):
@@ -150,7 +348,9 @@ class Scanner(object):
     """
 
     def __init__(self, builder, key_template,
-                 name_composer, key_name=None, value_arg='value'):
+                 name_composer, key_name=None, value_arg='value',
+                 path_filter=None, copy_payloads=True, budget=None,
+                 subscribe=False, max_include_depth=None):
         """Initialize the scanner object.
 
         Arguments:
@@ -182,6 +382,28 @@ class Scanner(object):
                         leaf value { type string; }
                     }
 
+            path_filter (pyang_accessors.filters.PathFilter): Restricts the
+                paths and operations of the produced entry-points.
+                Subtrees that cannot be selected are not traversed.
+            copy_payloads (bool): If ``False``, the payloads of the
+                entry-points reference the original statements, instead
+                of copies (except the truncated payloads, see
+                ``max_include_depth``), and the default key is shared.
+                The produced entry-points can be used to name and measure
+                the output, but not to generate it.
+            budget (pyang_accessors.budgets.Budget): Limits for the
+                number of entry-points and the size of the payloads,
+                checked before the payloads are copied.
+            subscribe (bool): Add ``SUBSCRIBE`` and ``UNSUBSCRIBE``
+                operations to all the entry-points, as if the module
+                had the ``observable`` modifier.
+            max_include_depth (int): Maximum depth of the payloads of
+                ``include`` and ``include-item`` nodes without a smaller
+                ``depth`` annotation. See :func:`copy_truncated`.
+
+        Raises:
+            ValueError: if ``max_include_depth`` is not positive.
+
         Returns:
             list: :class:`EntryPoint` elements.
         """
@@ -190,16 +412,99 @@ class Scanner(object):
         self.key_name = key_name
         self.name_composer = name_composer
         self.value_arg = value_arg
+        self.path_filter = path_filter
+        self.copy_payloads = copy_payloads
+        self.budget = budget
+        self.subscribe = subscribe
+        if max_include_depth is not None and max_include_depth < 1:
+            raise ValueError(
+                'max_include_depth should be a positive integer, not {}'
+                .format(max_include_depth))
+        self.max_include_depth = max_include_depth
+        self._default_key = None
+
+    def selects(self, path):
+        """Check if an entry-point should be produced for the path"""
+        return not self.path_filter or self.path_filter.selects(path)
+
+    def explores(self, path):
+        """Check if the subtree under the path should be traversed"""
+        return not self.path_filter or self.path_filter.explores(path)
+
+    def restrict_operations(self, entries):
+        """Remove operations that are not allowed by the filter.
+
+        Entry-points left without operations are discarded.
+        """
+        if not self.path_filter or not self.path_filter.operations:
+            return list(entries)
+
+        restricted = []
+        for entry in entries:
+            operations = self.path_filter.allowed(entry.operations)
+            if operations:
+                entry.operations = operations
+                restricted.append(entry)
+
+        return restricted
+
+    def include_depth(self, statement):
+        """Depth limit for the payload of an included node.
+
+        Returns:
+            int: or ``None`` if the whole subtree should be included.
+        """
+        depth = find_include_depth(statement)
+        limit = self.max_include_depth
+        if limit is not None and (depth is None or depth > limit):
+            return limit
+
+        return depth
+
+    def copy_payload(self, statement, path, depth=None):
+        """Copy the payload of an included node, checking the budget.
+
+        The size of the original node is checked before copying it, while
+        the truncated copies are checked after, since just the copy is
+        bounded.
+        """
+        if depth is None:
+            if self.budget:
+                self.budget.check_payload(statement, path)
+            return statement.copy()
+
+        payload = copy_truncated(statement, depth)
+        if self.budget:
+            self.budget.check_payload(payload, path)
+
+        return payload
 
     def default_key(self):
         """Render the default key template into a Statement"""
+        if not self.copy_payloads:
+            # the key is just referenced, so it can be shared
+            if self._default_key is None:
+                self._default_key = self._render_default_key()
+            return self._default_key
+
+        return self._render_default_key()
+
+    def _render_default_key(self):
+        """Create a new statement from the default key template"""
         key = self.builder.from_tuple(self.key_template).unwrap()
         if self.key_name:
             key.arg = self.key_name
         return key
 
-    def singularize_list(self, statement, item_name):
-        """Generates a data description for one element of the list."""
+    def singularize_list(self, statement, item_name, depth=None):
+        """Generates a data description for one element of the list.
+
+        Arguments:
+            statement (pyang.statements.Statement): list or leaf-list.
+            item_name (str): name of the item.
+            depth (int): depth limit for the item, see
+                :func:`copy_truncated` **(optional)**.
+        """
         if is_leaf_list(statement):
             # singularize node:
             #   leaf-list => container with "leaf value" inside
@@ -209,7 +514,8 @@ class Scanner(object):
         else:
             # singularize node:
             #   list => container
-            item_node = statement.copy()
+            item_node = (statement.copy() if depth is None
+                         else copy_truncated(statement, depth))
             item_node.keyword = 'container'
             item_node.raw_keyword = 'container'
             item_node.arg = item_name
@@ -217,7 +523,7 @@ class Scanner(object):
 
         return item_node
 
-    def scan_list(self, statement, read_only):
+    def scan_list(self, statement, read_only, parent_path=()):
         """Scans a list looking for entry-points"""
         entries = []
         # should not include name of the list, use instead the name
@@ -229,14 +535,29 @@ class Scanner(object):
 
         # a list item needs key(s) to be found. Use default if not explicit
         key_nodes = find_keys(statement)
-        keys = key_nodes or [self.default_key()]
+        keys = KeyContext(item_name, key_nodes or [self.default_key()])
 
         # items should be included
         if atomic_item or include_item:
-            payload = self.singularize_list(statement, item_name)
-            if not key_nodes:
-                # add the default key in the data structure itself
-                payload.append(keys[0])
+            depth = self.include_depth(statement) if include_item else None
+            if self.copy_payloads:
+                path = list(parent_path) + accessor_path
+                # truncated copies are bounded, so they are checked after
+                if self.budget and depth is None:
+                    self.budget.check_payload(statement, path)
+                payload = self.singularize_list(statement, item_name, depth)
+                if self.budget and depth is not None:
+                    self.budget.check_payload(payload, path)
+                if not key_nodes:
+                    # add the default key in the data structure itself
+                    payload.append(keys[0])
+            elif depth is not None:
+                # truncated copies are bounded, so they are also used to
+                # measure the output
+                payload = copy_truncated(statement, depth)
+            else:
+                # reference the list itself, instead of a singularized copy
+                payload = statement
 
             entries.append(EntryPoint(
                 accessor_path, payload=payload, own_keys=keys,
@@ -249,39 +570,26 @@ class Scanner(object):
 
         return (keys, entries, accessor_path)
 
-    def scan(self, statement):
-        """Generates a list of entry-points for the deep-most data nodes.
-
-        .. note: experimental function: relies on ``i_children``
-            undocumented feature.
-
-        The default behavior is just include entry-points for the ``leaf``
-        and ``leaf-list`` nodes. ``READ`` and ``CHANGE``
-        (unless ``config false;``) operations are defined by default.
-        ``ITEM_ADD`` and ``ITEM_REMOVE`` are additionally
-        defined for ``leaf-list`` nodes.
-
-        The extensions defined in the ``pyang-accessors.yang`` can be used
-        to control the scanner behavior.
-        This extensions define the following modifiers::
+    def visit(self, statement, frame):
+        """Produce the entry-points of a single node.
 
-            ATOMIC, ATOMIC_ITEM, INCLUDE, INCLUDE_ITEM
+        Arguments:
+            statement (pyang.statements.Statement): node to be visited.
+            frame (ScanFrame): context inherited from the parent node.
 
-        .. seealso: extensions :module:`pyang_accessors.definitions`
+        Returns:
+            tuple: ``(entries, child_frame)``. The path of the entries is
+                relative to the parent node. ``child_frame`` is ``None``
+                when the children of the node should not be traversed.
         """
-        # If is top-level, scan children
-        if is_top_level(statement):
-            ensure_validated(statement)
-            children = statement.i_children
-            return concat(*[self.scan(child) for child in children])
-
         # If not data, abort
         if not is_data(statement):
-            return []
+            return ([], None)
 
         # prepare a default entry-point
         read_only = is_read_only(statement)
         accessor_path = [statement.arg]
+        selected = self.selects(frame.path + accessor_path)
         entry = EntryPoint(
             accessor_path, payload=statement,
             operations=(READ_ONLY_OPS if read_only else DEFAULT_OPS),
@@ -291,50 +599,126 @@ class Scanner(object):
         # should be retrieved/modified as an entire entity
         # no need to dive in tree
         if is_atomic(statement):
-            return [entry]
+            return ([entry] if selected else [], None)
 
         entries = []
 
         # if node has modifier `include`, add it to entry-points as
         # an entire entity
-        if is_included(statement):
-            entries.append(entry.copy())
+        if selected and is_included(statement):
+            included = entry.copy(copy_payload=False)
+            depth = self.include_depth(statement)
+            if self.copy_payloads:
+                included.payload = self.copy_payload(
+                    statement, frame.path + accessor_path, depth)
+            elif depth is not None:
+                included.payload = copy_truncated(statement, depth)
+            entries.append(included)
 
         keys = None
         if is_list(statement):
             (keys, list_entries, accessor_path) = self.scan_list(
-                statement, read_only)
-            entries.extend(list_entries)
+                statement, read_only, frame.path)
+            entries.extend(
+                list_entry for list_entry in list_entries
+                if self.selects(frame.path + list_entry.path))
 
-            if keys == _PRUNE:
-                return entries
+            if keys is _PRUNE:
+                return (entries, None)
 
-        # continue tree traversal for non-atomic
-        # use `i_children`undocumented feature:
-        #   - pyang resolves `uses`, `augment`, ... and store
-        #     it under ``i_children``
-        for child in statement.i_children:
+        # prune subtrees without selectable nodes
+        path = frame.path + accessor_path
+        if not self.explores(path):
+            return (entries, None)
 
-            child_entries = self.scan(child)
-            for entry in child_entries:
-                if read_only:
-                    entry.operations = READ_ONLY_OPS
-                if keys:
-                    parent_name = accessor_path[-1]
-                    node_name = entry.path[-1]
-                    key_names = [key.arg for key in keys]
-                    # keys cannot be changed
-                    # and there is no sense in reading it, because they are
-                    # necessary to do this operation
-                    # therefore, skip keys
-                    if node_name in key_names:
-                        continue
-
-                    # relate keys with the last node name
-                    entry.parent_keys[parent_name] = keys
+        return (entries, frame.descend(
+            path, read_only, keys, is_observable(statement)))
 
+    def scan(self, statement, parent_path=None):
+        """Generates a list of entry-points for the deep-most data nodes.
+
+        .. note: experimental function: relies on ``i_children``
+            undocumented feature.
+
+        The default behavior is just include entry-points for the ``leaf``
+        and ``leaf-list`` nodes. ``READ`` and ``CHANGE``
+        (unless ``config false;``) operations are defined by default.
+        ``ITEM_ADD`` and ``ITEM_REMOVE`` are additionally
+        defined for ``leaf-list`` nodes.
+
+        The extensions defined in the ``pyang-accessors.yang`` can be used
+        to control the scanner behavior.
+        This extensions define the following modifiers::
+
+            ATOMIC, ATOMIC_ITEM, INCLUDE, INCLUDE_ITEM, OBSERVABLE
+
+        ``SUBSCRIBE`` and ``UNSUBSCRIBE`` operations are added to the
+        entry-points under ``OBSERVABLE`` nodes (or to all of them, if the
+        scanner was created with ``subscribe``), including read-only ones.
+
+        The tree is traversed in pre-order using an explicit stack of
+        ``(statement, frame)`` pairs, so the depth of the schema is not
+        limited by the Python recursion limit.
+
+        Arguments:
+            statement (pyang.statements.Statement): node to be scanned.
+            parent_path (list): accessor path of the parent node, used to
+                prune the subtrees rejected by the ``path_filter``.
+
+        .. seealso: extensions :module:`pyang_accessors.definitions`
+        """
+        if parent_path is None:
+            parent_path = []
+
+        # paths of the entry-points are relative to the scanned statement
+        offset = len(parent_path)
+        root = ScanFrame(list(parent_path), observable=self.subscribe)
+
+        # If is top-level, scan children
+        top_level = is_top_level(statement)
+        if top_level:
+            ensure_validated(statement)
+            stack = [(child, root) for child in reversed(statement.i_children)]
+        else:
+            stack = [(statement, root)]
+
+        entries = []
+        while stack:
+            (node, frame) = stack.pop()
+            (node_entries, child_frame) = self.visit(node, frame)
+            observable = node_entries and (
+                frame.observable or is_observable(node))
+
+            for entry in node_entries:
+                # keys cannot be changed
+                # and there is no sense in reading it, because they are
+                # necessary to do this operation
+                # therefore, skip keys
+                if entry.path[-1] in frame.key_names:
+                    continue
+                if frame.read_only:
+                    entry.operations = READ_ONLY_OPS
+                if observable:
+                    entry.operations = entry.operations + SUBSCRIPTION_OPS
+                # relate keys with the item names of the parent lists
+                for (item_name, keys) in frame.keys:
+                    entry.parent_keys[item_name] = keys
                 # prefix path with the parent path
-                entry.path = accessor_path + entry.path
+                entry.path = frame.path[offset:] + entry.path
                 entries.append(entry)
+                if self.budget:
+                    self.budget.add_entry(entry.path)
+
+            # continue tree traversal for non-atomic
+            # use `i_children`undocumented feature:
+            #   - pyang resolves `uses`, `augment`, ... and store
+            #     it under ``i_children``
+            if child_frame is not None:
+                stack.extend(
+                    (child, child_frame)
+                    for child in reversed(node.i_children))
+
+        if top_level:
+            return self.restrict_operations(entries)
 
         return entries
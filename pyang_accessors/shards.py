@@ -0,0 +1,175 @@
+# -*- coding: utf-8 -*-
+"""\
+Tools for splitting the output module into submodules (shards).
+
+The entry-points are partitioned following the top-level subtrees of the
+original module, within a size budget. The definitions needed by more
+than one shard are moved to a common submodule, that is included by
+all the shards.
+"""
+from itertools import groupby
+
+from .exceptions import DefinitionConflictError
+
+__author__ = "Anderson Bravalheri"
+__copyright__ = "Copyright (C) 2016 Anderson Bravalheri"
+__license__ = "mozilla"
+
+DEFINITION_KEYWORDS = ('grouping', 'typedef', 'identity')
+"""Top-level statements that can be shared between submodules"""
+
+REFERENCE_KEYWORDS = {
+    'uses': 'grouping',
+    'type': 'typedef',
+    'base': 'identity',
+}
+"""Statements that refer to a definition, with the keyword of the definition"""
+
+
+def partition_entries(entries, size=None):
+    """Partition the entry-points by top-level subtree.
+
+    Consecutive subtrees are packed in the same partition while the
+    number of entry-points fits the ``size``. Subtrees bigger than
+    ``size`` are split into several partitions.
+
+    Arguments:
+        entries (list): entry-points generated by scanner, in order.
+        size (int): maximum number of entry-points in each partition.
+            If ``None``, each top-level subtree is a partition.
+
+    Returns:
+        list: lists of entry-points.
+    """
+    partitions = []
+    current = []
+    for (_, subtree) in groupby(entries, lambda entry: entry.path[0]):
+        subtree = list(subtree)
+        if not size:
+            partitions.append(subtree)
+            continue
+
+        if current and len(current) + len(subtree) > size:
+            partitions.append(current)
+            current = []
+
+        while len(subtree) > size:
+            partitions.append(subtree[:size])
+            subtree = subtree[size:]
+
+        current.extend(subtree)
+
+    if current:
+        partitions.append(current)
+
+    return partitions
+
+
+def signature(node):
+    """Structure of a statement, comparable with the one of other statements.
+
+    Returns:
+        list: ``(depth, keyword, arg)`` for the statement and its
+            descendants, in pre-order.
+    """
+    nodes = []
+    stack = [(0, node)]
+    while stack:
+        (depth, current) = stack.pop()
+        nodes.append((depth, current.keyword, current.arg))
+        stack.extend(
+            (depth + 1, child) for child in reversed(current.substmts))
+
+    return nodes
+
+
+def references(node):
+    """Local definitions used by a statement or its descendants.
+
+    Returns:
+        list: ``(keyword, name)`` of the definitions, in pre-order.
+    """
+    found = []
+    stack = list(reversed(node.substmts))
+    while stack:
+        current = stack.pop()
+        stack.extend(reversed(current.substmts))
+        keyword = REFERENCE_KEYWORDS.get(current.keyword)
+        # prefixed names belong to other modules
+        if keyword and current.arg and ':' not in current.arg:
+            found.append((keyword, current.arg))
+
+    return found
+
+
+def move_shared_definitions(shards, common, always=()):
+    """Move the definitions used by more than one shard to a common node.
+
+    Since each shard creates all the definitions it needs, a definition
+    is shared if it appears in more than one shard. The occurrences should
+    be identical: the first one is moved to the common node and the others
+    are discarded. The local definitions used by the moved ones are moved
+    as well, so the common node does not depend on any shard.
+
+    Arguments:
+        shards (list): ``pyang_builder.StatementWrapper`` for each shard.
+        common (pyang_builder.StatementWrapper): common submodule.
+        always (list): names of definitions that should be moved to the
+            common node, even if they appear in a single shard.
+
+    Returns:
+        list: ``(keyword, name)`` of the moved definitions, in order.
+
+    Raises:
+        DefinitionConflictError: if the shards have different definitions
+            with the same name.
+    """
+    occurrences = {}
+    order = []
+    for shard in shards:
+        shard_raw = shard.unwrap()
+        for node in shard_raw.substmts:
+            if node.keyword not in DEFINITION_KEYWORDS:
+                continue
+            identifier = (node.keyword, node.arg)
+            if identifier not in occurrences:
+                occurrences[identifier] = []
+                order.append(identifier)
+            occurrences[identifier].append((shard_raw, node))
+
+    shared = set(
+        identifier for identifier in order
+        if len(occurrences[identifier]) > 1 or identifier[1] in always
+    )
+    # the common node cannot use definitions left in the shards
+    stack = list(shared)
+    while stack:
+        (_, node) = occurrences[stack.pop()][0]
+        for identifier in references(node):
+            if identifier in occurrences and identifier not in shared:
+                shared.add(identifier)
+                stack.append(identifier)
+
+    common_raw = common.unwrap()
+    moved = []
+    for identifier in order:
+        if identifier not in shared:
+            continue
+
+        nodes = occurrences[identifier]
+        (_, node) = nodes[0]
+        expected = signature(node)
+        conflicts = [parent.arg for (parent, other) in nodes[1:]
+                     if signature(other) != expected]
+        if conflicts:
+            raise DefinitionConflictError(
+                identifier[0], identifier[1], [nodes[0][0].arg] + conflicts)
+
+        for (shard_raw, other) in nodes:
+            shard_raw.substmts.remove(other)
+
+        node.parent = common_raw
+        common_raw.substmts.append(node)
+        moved.append(identifier)
+
+    return moved
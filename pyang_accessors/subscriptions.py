@@ -0,0 +1,56 @@
+# -*- coding: utf-8 -*-
+"""\
+Tools for notifying the changes of the subscribed entry-points.
+
+The ``subscribe``/``unsubscribe`` accessors are planned as the other
+accessors, while each subscribed entry-point gets a ``*-changed``
+notification.
+"""
+from .definitions import SUBSCRIBE_OP
+
+__author__ = "Anderson Bravalheri"
+__copyright__ = "Copyright (C) 2016 Anderson Bravalheri"
+__license__ = "mozilla"
+
+
+class SubscriptionsMixin(object):
+    """Change notifications for the subscribed entry-points."""
+    # pylint: disable=no-member
+
+    def _define_notifications(self, out, entries, already_created):
+        """Define the change notifications for the subscribed entry-points.
+
+        Each entry-point with the ``subscribe`` operation gets a
+        notification, carrying the keys of the changed node and its new
+        data. Servers can then push the changes to the subscribers,
+        instead of answering repeated ``get`` RPCs::
+
+            notification user-name-changed {
+                uses default-identification;
+                uses user-name-data;
+            }
+
+        Arguments:
+            out (pyang_builder.StatementWrapper): output module.
+            entries (list): entry-points generated by scanner.
+            already_created (list): names of the groupings already created.
+        """
+        compose = self.name_composer
+        create = self._create_and_append_grouping
+
+        for entry in entries:
+            if SUBSCRIBE_OP not in entry.operations:
+                continue
+            if self.budget:
+                self.budget.enter(entry.path)
+
+            (id_group, keys) = self._define_id_grouping(entry)
+            data_group = compose(entry.path + [self.data_suffix])
+            create(out, id_group, keys, already_created)
+            create(out, data_group, entry.payload, already_created)
+
+            notification = out.notification(
+                compose(entry.path + [self.changed_suffix]))
+            if id_group:
+                notification.uses(id_group)
+            notification.uses(data_group)
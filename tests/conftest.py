@@ -10,12 +10,39 @@
 """
 from __future__ import absolute_import, division, print_function
 
+import sys
+
 import pytest
 
 from pyangext.utils import create_context
 
 from pyang_accessors.generators import RPCGenerator
 
+collect_ignore = []
+if sys.version_info < (3, 7):
+    # uses the ``async`` syntax and ``asyncio.get_running_loop``
+    collect_ignore.append('test_aio.py')
+
+BATCH_TYPES = """
+    module batch-types {
+        namespace "http://acme.example.com/batch-types";
+        prefix "btypes";
+
+        typedef host { type string; }
+    }
+    """
+
+BATCH_TEMPLATE = """
+    module batch-{0} {{
+        namespace "http://acme.example.com/batch-{0}";
+        prefix "b{0}";
+
+        import batch-types {{ prefix "bt"; }}
+
+        leaf host-{0} {{ type bt:host; }}
+    }}
+    """
+
 
 @pytest.fixture(scope='session')
 def module_dir(tmpdir_factory):
@@ -33,3 +60,19 @@ def ctx(module_dir):
 def generator(ctx):
     """Pre-instantiated Accessor Generator"""
     return RPCGenerator(ctx)
+
+
+@pytest.fixture
+def batch_paths(tmpdir):
+    """YANG files importing the same module"""
+    with open(str(tmpdir.join('batch-types.yang')), 'w') as fp:
+        fp.write(BATCH_TYPES)
+
+    names = []
+    for index in range(4):
+        filename = str(tmpdir.join('batch-{}.yang'.format(index)))
+        with open(filename, 'w') as fp:
+            fp.write(BATCH_TEMPLATE.format(index))
+        names.append(filename)
+
+    return names
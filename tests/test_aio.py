@@ -0,0 +1,132 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+# pylint: disable=redefined-outer-name
+"""
+Tests for the asyncio front end (Python 3.7+ only, see ``conftest.py``)
+"""
+import asyncio
+import threading
+import time
+from concurrent import futures
+
+import pytest
+
+from pyang_accessors import aio
+
+__author__ = "Anderson Bravalheri"
+__copyright__ = "andersonbravalheri@gmail.com"
+__license__ = "mozilla"
+
+
+@pytest.fixture
+def loop():
+    """Event loop for a single test"""
+    loop = asyncio.new_event_loop()
+    yield loop
+    loop.close()
+
+
+async def collect(batch, on_result=None):
+    """Consume all the results of a batch"""
+    results = []
+    async for result in batch:
+        results.append(result)
+        if on_result:
+            on_result(result)
+
+    return results
+
+
+async def collect_one(batch):
+    """Await a single result"""
+    return await batch.__anext__()
+
+
+def test_transform_many(loop, batch_paths, tmpdir):
+    """
+    should generate all the files in a process pool
+    should report the errors without stopping the batch
+    """
+    broken = str(tmpdir.join('missing.yang'))
+    results = loop.run_until_complete(collect(aio.transform_many(
+        batch_paths + [broken], max_pending=2)))
+
+    assert sorted(result.path for result in results) == sorted(
+        batch_paths + [broken])
+    outputs = dict((result.path, result) for result in results)
+    assert isinstance(outputs[broken].error, (IOError, OSError))
+    for (index, path) in enumerate(batch_paths):
+        assert outputs[path].error is None
+        assert 'rpc get-host-{}'.format(index) in outputs[path].output
+
+
+def test_timeout_keeps_bound(loop, batch_paths, monkeypatch):
+    """
+    should report the jobs that take too long, while they still run
+    should not submit new jobs before the abandoned ones finish
+    """
+    release = threading.Event()
+    lock = threading.Lock()
+    counters = {'running': 0, 'peak': 0}
+
+    def transform_file(path, *_):
+        """Block the first file until released"""
+        with lock:
+            counters['running'] += 1
+            counters['peak'] = max(counters['peak'], counters['running'])
+        if path == batch_paths[0]:
+            release.wait(5)
+        else:
+            time.sleep(0.05)
+        with lock:
+            counters['running'] -= 1
+        return path
+
+    def on_result(result):
+        """Release the blocked file once it is reported"""
+        if isinstance(result.error, futures.TimeoutError):
+            release.set()
+
+    monkeypatch.setattr(aio, 'transform_file', transform_file)
+
+    with futures.ThreadPoolExecutor(4) as executor:
+        results = loop.run_until_complete(collect(aio.transform_many(
+            batch_paths, executor=executor, max_pending=2, timeout=0.5),
+            on_result))
+
+    assert sorted(result.path for result in results) == sorted(batch_paths)
+    errors = [result for result in results if result.error is not None]
+    assert [result.path for result in errors] == [batch_paths[0]]
+    assert counters['peak'] <= 2
+
+
+def test_cancel(loop, batch_paths, monkeypatch):
+    """
+    should cancel the jobs not started when the consumer is cancelled
+    should not consume the remaining paths
+    """
+    release = threading.Event()
+    started = []
+
+    def transform_file(path, *_):
+        """Block until released"""
+        started.append(path)
+        release.wait(5)
+        return path
+
+    monkeypatch.setattr(aio, 'transform_file', transform_file)
+    paths = iter(batch_paths)
+
+    with futures.ThreadPoolExecutor(1) as executor:
+        batch = aio.transform_many(paths, executor=executor, max_pending=2)
+        task = loop.create_task(collect(batch))
+        loop.run_until_complete(asyncio.sleep(0.1))
+        task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            loop.run_until_complete(task)
+        release.set()
+
+    assert started == batch_paths[:1]
+    assert list(paths) == batch_paths[2:]
+    with pytest.raises(StopAsyncIteration):
+        loop.run_until_complete(collect_one(batch))
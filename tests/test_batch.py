@@ -0,0 +1,94 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+# pylint: disable=redefined-outer-name
+"""
+Tests for the parallel generation of many files
+"""
+import threading
+import time
+from concurrent import futures
+
+import pytest
+
+from pyang_accessors import batch
+from pyang_accessors.registry import CatalogRegistry
+
+__author__ = "Anderson Bravalheri"
+__copyright__ = "andersonbravalheri@gmail.com"
+__license__ = "mozilla"
+
+
+def test_transform_many(batch_paths, tmpdir):
+    """
+    should generate all the files in a process pool
+    should report the errors without stopping the batch
+    """
+    broken = str(tmpdir.join('missing.yang'))
+    results = list(batch.transform_many(batch_paths + [broken], max_pending=2))
+
+    assert sorted(result.path for result in results) == sorted(
+        batch_paths + [broken])
+    outputs = dict((result.path, result) for result in results)
+    assert isinstance(outputs[broken].error, (IOError, OSError))
+    for (index, path) in enumerate(batch_paths):
+        assert outputs[path].error is None
+        assert 'rpc get-host-{}'.format(index) in outputs[path].output
+
+
+def test_transform_many_with_catalog(batch_paths):
+    """
+    should share the catalog between the workers
+    should not accept a catalog with a process pool
+    """
+    catalog = CatalogRegistry()
+    results = list(batch.transform_many(
+        batch_paths, generator_options={'catalog': catalog}, max_pending=2))
+
+    assert all(result.error is None for result in results)
+    (prefix, _) = catalog.by_name['batch-types']
+    for result in results:
+        assert 'type {}:host;'.format(prefix) in result.output
+
+    with futures.ProcessPoolExecutor(1) as executor:
+        with pytest.raises(ValueError):
+            next(batch.transform_many(
+                batch_paths, generator_options={'catalog': catalog},
+                executor=executor))
+
+
+def test_timeout_keeps_bound(batch_paths, monkeypatch):
+    """
+    should report the jobs that take too long
+    should not submit new jobs before the abandoned ones finish
+    """
+    release = threading.Event()
+    lock = threading.Lock()
+    counters = {'running': 0, 'peak': 0}
+
+    def transform_file(path, *_):
+        """Block the first file until released"""
+        with lock:
+            counters['running'] += 1
+            counters['peak'] = max(counters['peak'], counters['running'])
+        if path == batch_paths[0]:
+            release.wait(5)
+        else:
+            time.sleep(0.05)
+        with lock:
+            counters['running'] -= 1
+        return path
+
+    monkeypatch.setattr(batch, 'transform_file', transform_file)
+
+    with futures.ThreadPoolExecutor(4) as executor:
+        results = []
+        for result in batch.transform_many(
+                batch_paths, executor=executor, max_pending=2, timeout=0.5):
+            results.append(result)
+            if isinstance(result.error, futures.TimeoutError):
+                release.set()
+
+    assert sorted(result.path for result in results) == sorted(batch_paths)
+    errors = [result for result in results if result.error is not None]
+    assert [result.path for result in errors] == [batch_paths[0]]
+    assert counters['peak'] <= 2
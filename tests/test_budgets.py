@@ -0,0 +1,103 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+# pylint: disable=redefined-outer-name
+"""
+Tests for the generation budgets
+"""
+from os.path import join
+
+import pytest
+
+from pyangext.utils import parse
+
+from pyang_accessors.exceptions import BudgetExceededError
+from pyang_accessors.generators import RPCGenerator
+
+__author__ = "Anderson Bravalheri"
+__copyright__ = "andersonbravalheri@gmail.com"
+__license__ = "mozilla"
+
+
+@pytest.fixture()
+def budget_example(ctx, module_dir):
+    """YANG example with a misplaced include modifier"""
+    text = """
+        module budget-example {
+            namespace "http://acme.example.com/budget";
+            prefix "acbudget";
+
+            import pyang-accessors { prefix acc; }
+
+            revision 2007-11-05 {
+                description "Initial revision.";
+            }
+
+            leaf host-name { type string; }
+
+            container system {
+                acc:modifier include;
+                container network {
+                    leaf address { type string; }
+                    leaf gateway { type string; }
+                    leaf mask { type string; }
+                }
+                container clock {
+                    leaf timezone { type string; }
+                    leaf server { type string; }
+                }
+            }
+        }
+        """
+    with open(join(module_dir, 'budget-example.yang'), 'w') as fp:
+        fp.write(text)
+
+    module = parse(text, ctx)
+    ctx.add_parsed_module(module)
+
+    return module
+
+
+def test_unlimited_by_default(generator, budget_example):
+    """
+    should not check budgets without limits
+    """
+    assert generator.transform(budget_example)
+
+
+def test_max_entries(ctx, budget_example):
+    """
+    should abort the scan when there are too many entry-points
+    should report the number of entry-points of each top-level node
+    """
+    generator = RPCGenerator(ctx, max_entries=3)
+    with pytest.raises(BudgetExceededError) as info:
+        generator.transform(budget_example)
+    assert info.value.budget == 'entries'
+
+    paths = dict(info.value.paths)
+    assert 'system' in paths
+    assert set(paths) <= set(['host-name', 'system'])
+    assert sum(paths.values()) == info.value.value
+
+
+def test_max_payload_nodes(ctx, budget_example):
+    """
+    should abort before copying a big payload
+    should report the path of the payload
+    """
+    generator = RPCGenerator(ctx, max_payload_nodes=10)
+    with pytest.raises(BudgetExceededError) as info:
+        generator.transform(budget_example)
+    assert info.value.budget == 'payload_nodes'
+    assert info.value.paths[0][0] == 'system'
+
+
+def test_max_output_nodes(ctx, budget_example):
+    """
+    should report the paths that contributed the most for the growth
+    """
+    generator = RPCGenerator(ctx, max_output_nodes=60)
+    with pytest.raises(BudgetExceededError) as info:
+        generator.transform(budget_example)
+    assert info.value.budget == 'output_nodes'
+    assert 'system' in [path for (path, _) in info.value.paths]
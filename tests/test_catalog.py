@@ -0,0 +1,112 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+# pylint: disable=redefined-outer-name
+"""
+Tests for the catalog processing
+"""
+import pytest
+
+from pyang_accessors.catalog import (
+    import_order,
+    last_uses,
+    process_catalog,
+    scan_header
+)
+
+__author__ = "Anderson Bravalheri"
+__copyright__ = "andersonbravalheri@gmail.com"
+__license__ = "mozilla"
+
+CATALOG = {
+    'catalog-user': """
+        module catalog-user {
+            namespace "http://acme.example.com/catalog-user";
+            prefix "cuser";
+
+            // import catalog-unrelated { prefix cunrel; }
+            import catalog-types { prefix "ctypes"; }
+
+            description "This module imports catalog-types";
+
+            leaf login { type ctypes:login; }
+        }
+        """,
+    'catalog-types': """
+        module catalog-types {
+            namespace "http://acme.example.com/catalog-types";
+            prefix "ctypes";
+
+            typedef login { type string; }
+
+            leaf version { type string; }
+        }
+        """,
+    'catalog-unrelated': """
+        module catalog-unrelated {
+            namespace "http://acme.example.com/catalog-unrelated";
+            prefix "cunrel";
+
+            leaf host-name { type string; }
+        }
+        """,
+}
+
+
+@pytest.fixture
+def filenames(tmpdir):
+    """Catalog files, the importer first"""
+    names = []
+    for name in ('catalog-user', 'catalog-types', 'catalog-unrelated'):
+        filename = str(tmpdir.join(name + '.yang'))
+        with open(filename, 'w') as fp:
+            fp.write(CATALOG[name])
+        names.append(filename)
+
+    return names
+
+
+def test_scan_header(filenames):
+    """
+    should find the module name and its imports
+    should ignore comments
+    """
+    header = scan_header(filenames[0])
+    assert header.keyword == 'module'
+    assert header.name == 'catalog-user'
+    assert header.dependencies == ['catalog-types']
+
+
+def test_import_order(filenames):
+    """
+    should place the dependencies before the importers
+    should release each module after its last importer
+    """
+    order = import_order([scan_header(filename) for filename in filenames])
+    assert [header.name for header in order] == [
+        'catalog-types', 'catalog-unrelated', 'catalog-user']
+
+    uses = last_uses(order)
+    assert uses['catalog-types'] == 2
+    assert uses['catalog-unrelated'] == 1
+
+
+def test_process_catalog(filenames, tmpdir):
+    """
+    should generate all the modules
+    should release the modules from the context
+    """
+    outputs = {}
+    contexts = []
+
+    def emit(filename, out, ctx):
+        """Keep just the text of the output"""
+        outputs[filename] = out.dump(ctx=ctx)
+        contexts.append(ctx)
+
+    report = process_catalog(filenames, emit)
+
+    assert report['modules'] == 3
+    assert report['released'] >= 3
+    assert not contexts[-1].modules
+    assert 'rpc get-login' in outputs[str(tmpdir.join('catalog-user.yang'))]
+    assert 'rpc get-host-name' in outputs[filenames[2]]
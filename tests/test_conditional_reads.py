@@ -0,0 +1,95 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+# pylint: disable=redefined-outer-name
+"""
+Tests for the conditional READ accessors
+"""
+from os.path import join
+
+import pytest
+
+from pyangext.utils import parse
+
+from pyang_accessors.generators import RPCGenerator
+
+__author__ = "Anderson Bravalheri"
+__copyright__ = "andersonbravalheri@gmail.com"
+__license__ = "mozilla"
+
+
+@pytest.fixture()
+def conditional_example(ctx, module_dir):
+    """YANG example with a list"""
+    text = """
+        module conditional-example {
+            namespace "http://acme.example.com/conditional";
+            prefix "accond";
+
+            leaf host-name { type string; }
+
+            list users {
+                key login;
+                leaf login { type string; }
+                leaf name { type string; }
+            }
+        }
+        """
+    with open(join(module_dir, 'conditional-example.yang'), 'w') as fp:
+        fp.write(text)
+
+    module = parse(text, ctx)
+    ctx.add_parsed_module(module)
+
+    return module
+
+
+@pytest.fixture
+def rpc_module(ctx, conditional_example):
+    """Output with conditional reads"""
+    generator = RPCGenerator(ctx, conditional_reads=True)
+    return generator.transform(conditional_example)
+
+
+def test_version_in_request(rpc_module):
+    """
+    should add the version token to the READ request
+    should keep the identification in the READ request
+    should not change the other requests
+    """
+    assert rpc_module.find('grouping', 'version-token')
+
+    request = rpc_module.find('grouping', 'get-user-name-request')
+    assert request.find('uses', 'user-identification')
+    assert request.find('uses', 'version-token')
+    rpc = rpc_module.find('rpc', 'get-user-name')
+    assert rpc.find('input')[0].find('uses', 'get-user-name-request')
+
+    request = rpc_module.find('grouping', 'get-host-name-request')
+    assert request.find('uses', 'version-token')
+
+    rpc = rpc_module.find('rpc', 'set-user-name')
+    assert not rpc.find('input')[0].find('uses', 'version-token')
+
+
+def test_not_modified_response(rpc_module):
+    """
+    should have a not-modified case in the READ response
+    should return the version with the data
+    """
+    rpc = rpc_module.find('rpc', 'get-user-name')
+    assert rpc.find('output')[0].find('uses', 'get-user-name-response')
+
+    group = rpc_module.find('grouping', 'get-user-name-response')
+    choice = group.find('choice', 'response')[0]
+    assert choice.find('case', 'not-modified')
+    assert choice.find('case', 'failure')
+    success = choice.find('case', 'success')[0]
+    assert success.find('uses', 'user-name-data')
+    assert success.find('uses', 'version-token')
+
+
+def test_valid_yang(rpc_module, ctx):
+    """
+    module produced with conditional reads should be valid
+    """
+    assert rpc_module.validate(ctx)
@@ -0,0 +1,97 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+# pylint: disable=redefined-outer-name
+"""
+Tests for the in-memory reference datastore
+"""
+from os.path import join
+
+import pytest
+
+from pyangext.utils import parse
+
+from pyang_accessors.datastore import Datastore
+from pyang_accessors.exceptions import DataNotFoundError
+from pyang_accessors.manifest import iter_records
+
+__author__ = "Anderson Bravalheri"
+__copyright__ = "andersonbravalheri@gmail.com"
+__license__ = "mozilla"
+
+
+@pytest.fixture()
+def datastore_example(ctx, module_dir):
+    """YANG example with a keyed list and a leaf-list"""
+    text = """
+        module datastore-example {
+            namespace "http://acme.example.com/datastore";
+            prefix "acdatastore";
+
+            revision 2007-11-05 {
+                description "Initial revision.";
+            }
+
+            leaf host-name { type string; }
+
+            list users {
+                key login;
+                leaf login { type string; }
+                leaf name { type string; }
+                leaf-list phones { type string; }
+            }
+        }
+        """
+    with open(join(module_dir, 'datastore-example.yang'), 'w') as fp:
+        fp.write(text)
+
+    module = parse(text, ctx)
+    ctx.add_parsed_module(module)
+
+    return module
+
+
+@pytest.fixture
+def server(generator, datastore_example):
+    """Dispatcher served by an empty datastore"""
+    return Datastore(iter_records(generator, datastore_example)).serve()
+
+
+def test_set_and_get(server):
+    """
+    should retrieve the value previously changed
+    should store values under the keyed item
+    """
+    server.dispatch('set-host-name', {'host-name': 'acme'})
+    server.dispatch('set-user-name', {'login': 'joe', 'name': 'Joe'})
+    server.dispatch('set-user-name', {'login': 'ann', 'name': 'Ann'})
+
+    assert server.dispatch('get-host-name') == {'host-name': 'acme'}
+    assert server.dispatch('get-user-name', {'login': 'joe'}) == {
+        'name': 'Joe'}
+
+
+def test_generate_ids_for_leaf_lists(server):
+    """
+    should generate the default key when adding items
+    should remove items by key
+    """
+    first = server.dispatch(
+        'add-user-phone', {'login': 'joe', 'phone': {'value': '1234'}})
+    second = server.dispatch(
+        'add-user-phone', {'login': 'joe', 'phone': {'value': '5678'}})
+    assert first['id'] != second['id']
+
+    request = {'user-login': 'joe', 'id': first['id']}
+    assert server.dispatch('get-user-phone', request)['phone']['value'] == (
+        '1234')
+    server.dispatch('remove-user-phone', request)
+    with pytest.raises(DataNotFoundError):
+        server.dispatch('get-user-phone', request)
+
+
+def test_missing_data(server):
+    """
+    should raise an error for nodes never changed
+    """
+    with pytest.raises(DataNotFoundError):
+        server.dispatch('get-user-name', {'login': 'nobody'})
@@ -0,0 +1,158 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+# pylint: disable=redefined-outer-name
+"""
+Tests for the depth limit of included payloads
+"""
+from os.path import join
+
+import pytest
+
+from pyangext.utils import parse
+
+from pyang_accessors.generators import RPCGenerator
+from pyang_accessors.scan import DEPTH_ERROR
+
+__author__ = "Anderson Bravalheri"
+__copyright__ = "andersonbravalheri@gmail.com"
+__license__ = "mozilla"
+
+
+@pytest.fixture()
+def depth_example(ctx, module_dir):
+    """YANG example with deep included nodes"""
+    text = """
+        module depth-example {
+            namespace "http://acme.example.com/depth";
+            prefix "acdepth";
+
+            import pyang-accessors { prefix accessor; }
+
+            grouping address {
+                container address {
+                    leaf street { type string; }
+                    container geo {
+                        leaf latitude { type decimal64 { fraction-digits 6; } }
+                    }
+                }
+            }
+
+            container company {
+                leaf name { type string; }
+                uses address;
+                accessor:modifier include;
+                accessor:depth 1;
+            }
+
+            list users {
+                key login;
+                leaf login { type string; }
+                uses address;
+                accessor:modifier include-item;
+            }
+        }
+        """
+    with open(join(module_dir, 'depth-example.yang'), 'w') as fp:
+        fp.write(text)
+
+    module = parse(text, ctx)
+    ctx.add_parsed_module(module)
+
+    return module
+
+
+def test_depth_annotation(generator, depth_example):
+    """
+    should truncate the included payload
+    should keep the accessors for the deeper nodes
+    """
+    out = generator.transform(depth_example)
+
+    company = out.find('grouping', 'company-data')[0].find(
+        'container', 'company')[0]
+    assert company.find('leaf', 'name')
+    assert not company.find('container', 'address')
+    assert not company.find('uses', 'address')
+    assert out.find('rpc', 'get-company-address-street')
+
+    user = out.find('grouping', 'user-data')[0].find('container', 'user')[0]
+    assert user.find('uses', 'address')
+
+
+def test_max_include_depth(ctx, depth_example):
+    """
+    should truncate all the included payloads
+    should expand the groupings of the truncated payloads
+    """
+    generator = RPCGenerator(ctx, max_include_depth=2)
+    out = generator.transform(depth_example)
+
+    user = out.find('grouping', 'user-data')[0].find('container', 'user')[0]
+    address = user.find('container', 'address')[0]
+    assert address.find('leaf', 'street')
+    assert not address.find('container', 'geo')
+    assert out.find('rpc', 'get-user-address-geo-latitude')
+    assert out.validate(ctx)
+
+
+def test_estimate_truncated_payloads(ctx, depth_example):
+    """
+    should measure the truncated payloads instead of the original nodes
+    """
+    full = RPCGenerator(ctx).estimate(depth_example)['total']
+    truncated = RPCGenerator(ctx, max_include_depth=1).estimate(
+        depth_example)['total']
+
+    assert truncated['rpcs'] == full['rpcs']
+    assert truncated['nodes'] < full['nodes']
+
+    out = RPCGenerator(ctx, max_include_depth=1).transform(depth_example)
+    user = out.find('grouping', 'user-data')[0].find('container', 'user')[0]
+    assert not user.find('container', 'address')
+
+
+def test_invalid_depth(ctx, module_dir):
+    """
+    should report depths that are not positive integers
+    should ignore the invalid depths
+    should not accept a maximum depth that is not positive
+    """
+    text = """
+        module bad-depth-example {
+            namespace "http://acme.example.com/bad-depth";
+            prefix "acbdepth";
+
+            import pyang-accessors { prefix accessor; }
+
+            container company {
+                container address {
+                    leaf street { type string; }
+                }
+                accessor:modifier include;
+                accessor:depth two;
+            }
+
+            container office {
+                container address {
+                    leaf street { type string; }
+                }
+                accessor:modifier include;
+                accessor:depth 0;
+            }
+        }
+        """
+    with open(join(module_dir, 'bad-depth-example.yang'), 'w') as fp:
+        fp.write(text)
+
+    module = parse(text, ctx)
+    ctx.add_parsed_module(module)
+
+    out = RPCGenerator(ctx).transform(module)
+    errors = [args for (_, tag, args) in ctx.errors if tag == DEPTH_ERROR]
+    assert sorted(errors) == ['0', 'two']
+    for name in ('company', 'office'):
+        data = out.find('grouping', name + '-data')[0]
+        assert data.find('container', name)[0].find('container', 'address')
+
+    with pytest.raises(ValueError):
+        RPCGenerator(ctx, max_include_depth=0).transform(module)
@@ -0,0 +1,106 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+# pylint: disable=redefined-outer-name
+"""
+Tests for the comparison between revisions
+"""
+import pytest
+
+from pyangext.utils import create_context, parse
+
+from pyang_accessors.diff import ADDED, CHANGED, REMOVED, diff_modules
+
+__author__ = "Anderson Bravalheri"
+__copyright__ = "andersonbravalheri@gmail.com"
+__license__ = "mozilla"
+
+OLD_REVISION = """
+    module diff-example {
+        namespace "http://acme.example.com/diff";
+        prefix "acdiff";
+
+        revision 2007-11-05 {
+            description "Initial revision.";
+        }
+
+        leaf host-name { type string; }
+        leaf uptime { type uint32; }
+
+        list users {
+            key login;
+            leaf login { type string; }
+            leaf name { type string; }
+            leaf age { type uint8; config false; }
+        }
+    }
+    """
+
+NEW_REVISION = """
+    module diff-example {
+        namespace "http://acme.example.com/diff";
+        prefix "acdiff";
+
+        revision 2008-01-01 {
+            description "Users are identified by company and login.";
+        }
+        revision 2007-11-05 {
+            description "Initial revision.";
+        }
+
+        leaf host-name { type string; }
+
+        list users {
+            key "company login";
+            leaf company { type string; }
+            leaf login { type string; }
+            leaf name { type string; }
+            leaf age { type uint8; }
+        }
+    }
+    """
+
+
+def load(text, module_dir):
+    """Parse a revision in a new context"""
+    ctx = create_context(module_dir)
+    module = parse(text, ctx)
+    ctx.add_parsed_module(module)
+
+    return module
+
+
+@pytest.fixture
+def changes(generator, module_dir):
+    """Changes between the revisions, by path"""
+    return dict(
+        ('/'.join(change.path), change)
+        for change in diff_modules(
+            generator,
+            load(OLD_REVISION, module_dir),
+            load(NEW_REVISION, module_dir))
+    )
+
+
+def test_added_and_removed(changes):
+    """
+    should report the removed entry-points
+    should not report the unchanged entry-points
+    """
+    assert changes['uptime'].kind == REMOVED
+    assert 'host-name' not in changes
+    assert all(change.kind != ADDED for change in changes.values())
+
+
+def test_changed(changes):
+    """
+    should report new operations
+    should report changes in the key signature
+    """
+    age = changes['user/age']
+    assert age.kind == CHANGED
+    assert age.added_operations == ['set']
+
+    name = changes['user/name']
+    assert name.kind == CHANGED
+    assert name.old_keys == [['user', ['login']]]
+    assert name.new_keys == [['user', ['company', 'login']]]
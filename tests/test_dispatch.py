@@ -0,0 +1,107 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+# pylint: disable=redefined-outer-name
+"""
+Tests for the runtime accessor dispatcher
+"""
+from os.path import join
+
+import pytest
+
+from pyangext.utils import parse
+
+from pyang_accessors.dispatch import Dispatcher, PathTrie
+from pyang_accessors.exceptions import UnknownAccessorError
+
+__author__ = "Anderson Bravalheri"
+__copyright__ = "andersonbravalheri@gmail.com"
+__license__ = "mozilla"
+
+
+@pytest.fixture()
+def dispatch_example(ctx, module_dir):
+    """YANG example with nested keyed lists and leaf-lists"""
+    text = """
+        module dispatch-example {
+            namespace "http://acme.example.com/dispatch";
+            prefix "acdispatch";
+
+            revision 2007-11-05 {
+                description "Initial revision.";
+            }
+
+            list users {
+                key login;
+                leaf login { type string; }
+                leaf name { type string; }
+                leaf-list phones { type string; }
+            }
+        }
+        """
+    with open(join(module_dir, 'dispatch-example.yang'), 'w') as fp:
+        fp.write(text)
+
+    module = parse(text, ctx)
+    ctx.add_parsed_module(module)
+
+    return module
+
+
+@pytest.fixture
+def dispatcher(generator, dispatch_example):
+    """Dispatcher compiled from the scanned entry-points"""
+    entries = generator.scan(dispatch_example)
+    return Dispatcher.from_entries(generator, entries)
+
+
+def test_trie():
+    """
+    should store and retrieve values by path
+    should return None for unknown paths
+    """
+    trie = PathTrie()
+    trie.insert(['user', 'name'], 1)
+    trie.insert(['user'], 2)
+    assert trie.lookup(['user', 'name']) == 1
+    assert trie.lookup(['user']) == 2
+    assert trie.lookup(['user', 'login']) is None
+
+
+def test_resolve_by_name_and_path(dispatcher):
+    """
+    should resolve the same accessor by RPC name and by path
+    """
+    accessor = dispatcher.resolve('set', 'user/name')
+    assert dispatcher.resolve_name('set-user-name') is accessor
+    assert dispatcher.resolve('set', ['user', 'name']) is accessor
+    with pytest.raises(UnknownAccessorError):
+        dispatcher.resolve('add', 'user/name')
+
+
+def test_unpack_keys(dispatcher):
+    """
+    should pass parent keys by item name
+    should pass own keys as tuple
+    should remove the parent keys from the payload
+    """
+    calls = []
+
+    @dispatcher.handler('get', 'user/phone')
+    def get_phone(parent_keys, own_keys, payload):
+        """fake handler"""
+        calls.append((parent_keys, own_keys, payload))
+        return {'value': '555-1234'}
+
+    response = dispatcher.dispatch(
+        'get-user-phone', {'user-login': 'joe', 'id': 3})
+
+    assert response == {'value': '555-1234'}
+    assert calls == [({'user': ('joe',)}, (3,), {'id': 3})]
+
+
+def test_missing_handler(dispatcher):
+    """
+    should raise an error if no handler was registered
+    """
+    with pytest.raises(UnknownAccessorError):
+        dispatcher.dispatch('get-user-name', {'login': 'joe'})
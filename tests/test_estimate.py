@@ -0,0 +1,94 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+# pylint: disable=redefined-outer-name
+"""
+Tests for the output estimate
+"""
+from os.path import join
+
+import pytest
+
+from pyangext.utils import parse
+
+from pyang_accessors.estimate import INDENT, NODE_OVERHEAD, content_size
+
+__author__ = "Anderson Bravalheri"
+__copyright__ = "andersonbravalheri@gmail.com"
+__license__ = "mozilla"
+
+
+@pytest.fixture()
+def estimate_example(ctx, module_dir):
+    """YANG example with included nodes"""
+    text = """
+        module estimate-example {
+            namespace "http://acme.example.com/estimate";
+            prefix "acestimate";
+
+            import pyang-accessors { prefix acc; }
+
+            revision 2007-11-05 {
+                description "Initial revision.";
+            }
+
+            leaf host-name { type string; }
+
+            container profile {
+                acc:modifier include;
+                leaf name { type string; }
+                leaf email { type string; }
+            }
+
+            list users {
+                acc:modifier include-item;
+                key login;
+                leaf login { type string; }
+                leaf name { type string; }
+                leaf-list phones { type string; }
+            }
+        }
+        """
+    with open(join(module_dir, 'estimate-example.yang'), 'w') as fp:
+        fp.write(text)
+
+    module = parse(text, ctx)
+    ctx.add_parsed_module(module)
+
+    return module
+
+
+def test_content_size():
+    """
+    should count nested tuples
+    should consider the indentation
+    """
+    (nodes, size) = content_size(('leaf', 'ok', [('type', 'boolean')]), 0)
+    assert nodes == 2
+    assert size == (
+        len('leaf') + len('ok') + NODE_OVERHEAD +
+        INDENT + len('type') + len('boolean') + NODE_OVERHEAD)
+
+
+def test_count_the_same_rpcs_and_groupings(generator, estimate_example):
+    """
+    should count exactly the RPCs and groupings generated by transform
+    should report each top-level subtree, by the name of the schema node
+    """
+    report = generator.estimate(estimate_example)
+    assert sorted(report['subtrees']) == ['host-name', 'profile', 'users']
+
+    out = generator.transform(estimate_example).unwrap()
+    keywords = [node.keyword for node in out.substmts]
+    assert report['total']['rpcs'] == keywords.count('rpc')
+    assert report['total']['groupings'] == keywords.count('grouping')
+    assert report['total']['size'] > 0
+
+
+def test_do_not_change_the_original_module(generator, estimate_example):
+    """
+    should not replace the original list by a container
+    """
+    generator.estimate(estimate_example)
+    users = estimate_example.search_one('list', 'users')
+    assert users is not None
+    assert users.keyword == 'list'
@@ -0,0 +1,102 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+# pylint: disable=redefined-outer-name
+"""
+Tests for the READ accessors with field masks
+"""
+from os.path import join
+
+import pytest
+
+from pyangext.utils import parse
+
+from pyang_accessors.generators import RPCGenerator
+
+__author__ = "Anderson Bravalheri"
+__copyright__ = "andersonbravalheri@gmail.com"
+__license__ = "mozilla"
+
+
+@pytest.fixture()
+def mask_example(ctx, module_dir):
+    """YANG example with an atomic container"""
+    text = """
+        module mask-example {
+            namespace "http://acme.example.com/mask";
+            prefix "acmask";
+
+            import pyang-accessors { prefix accessor; }
+
+            container admin {
+                leaf name { type string; }
+                leaf email { type string; mandatory true; }
+                leaf-list phones { type string; min-elements 1; }
+                accessor:modifier atomic;
+            }
+
+            leaf host-name { type string; }
+        }
+        """
+    with open(join(module_dir, 'mask-example.yang'), 'w') as fp:
+        fp.write(text)
+
+    module = parse(text, ctx)
+    ctx.add_parsed_module(module)
+
+    return module
+
+
+@pytest.fixture
+def rpc_module(ctx, mask_example):
+    """Output with field masks"""
+    generator = RPCGenerator(ctx, field_masks=True)
+    return generator.transform(mask_example)
+
+
+def test_field_mask_in_request(rpc_module):
+    """
+    should add a field mask with the children of the payload
+    should not add field masks for leaves
+    """
+    mask = rpc_module.find('grouping', 'admin-field-mask')
+    assert mask
+    fields = mask.find('leaf-list', 'fields')[0]
+    enumeration = fields.find('type', 'enumeration')[0]
+    assert enumeration.find('enum', 'name')
+    assert enumeration.find('enum', 'email')
+    assert enumeration.find('enum', 'phones')
+
+    rpc = rpc_module.find('rpc', 'get-admin')
+    assert rpc.find('input')[0].find('uses', 'get-admin-request')
+    request = rpc_module.find('grouping', 'get-admin-request')
+    assert request.find('uses', 'admin-field-mask')
+
+    assert not rpc_module.find('grouping', 'host-name-field-mask')
+    assert not rpc_module.find('grouping', 'get-host-name-request')
+
+
+def test_optional_response(rpc_module):
+    """
+    should respond with a projection of the data with optional nodes
+    should keep the data grouping for the changes
+    """
+    projection = rpc_module.find('grouping', 'admin-projection')
+    assert projection
+    uses = projection.find('uses', 'admin-data')[0]
+    assert uses.find('refine', 'admin/email')[0].find('mandatory', 'false')
+    assert uses.find('refine', 'admin/phones')[0].find('min-elements', '0')
+    assert not uses.find('refine', 'admin/name')
+
+    response = rpc_module.find('grouping', 'get-admin-response')
+    assert response.find('choice', 'response')[0].find(
+        'case', 'success')[0].find('uses', 'admin-projection')
+
+    rpc = rpc_module.find('rpc', 'set-admin')
+    assert rpc.find('input')[0].find('uses', 'admin-data')
+
+
+def test_valid_yang(rpc_module, ctx):
+    """
+    module produced with field masks should be valid
+    """
+    assert rpc_module.validate(ctx)
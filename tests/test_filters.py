@@ -0,0 +1,119 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+# pylint: disable=redefined-outer-name
+"""
+Tests for path-pattern filtering
+"""
+from os.path import join
+
+import pytest
+
+from pyangext.utils import parse
+
+from pyang_accessors.filters import PathFilter
+from pyang_accessors.generators import RPCGenerator
+
+__author__ = "Anderson Bravalheri"
+__copyright__ = "andersonbravalheri@gmail.com"
+__license__ = "mozilla"
+
+
+@pytest.fixture()
+def filter_example(ctx, module_dir):
+    """YANG example with a few independent subtrees"""
+    text = """
+        module filter-example {
+            namespace "http://acme.example.com/filter";
+            prefix "acfilter";
+
+            revision 2007-11-05 {
+                description "Initial revision.";
+            }
+
+            list users {
+                key login;
+                leaf login { type string; }
+                leaf name { type string; }
+                container address {
+                    leaf street { type string; }
+                    leaf city { type string; }
+                }
+            }
+
+            container system {
+                leaf host-name { type string; }
+                leaf uptime { type int32; config false; }
+            }
+        }
+        """
+    with open(join(module_dir, 'filter-example.yang'), 'w') as fp:
+        fp.write(text)
+
+    module = parse(text, ctx)
+    ctx.add_parsed_module(module)
+
+    return module
+
+
+def test_patterns_select_subtrees():
+    """
+    should select the whole subtree under a matched path
+    should explore the ancestors of a possible match
+    should not explore excluded subtrees
+    """
+    path_filter = PathFilter(['user/*'], ['user/address'])
+    assert path_filter.selects('user/name')
+    assert path_filter.selects(['user', 'name'])
+    assert not path_filter.selects('system/host-name')
+    assert not path_filter.selects('user/address/city')
+    assert path_filter.explores(['user'])
+    assert not path_filter.explores(['system'])
+    assert not path_filter.explores(['user', 'address'])
+
+
+def test_recursive_wildcard():
+    """
+    should match zero or more segments with ``**``
+    """
+    path_filter = PathFilter(['**/city'])
+    assert path_filter.selects('user/address/city')
+    assert path_filter.selects('city')
+    assert not path_filter.selects('user/address/street')
+    assert path_filter.explores(['system'])
+
+
+def test_operation_allowlist():
+    """
+    should keep just the allowed operations, preserving order
+    """
+    path_filter = PathFilter(operations=['get'])
+    assert path_filter.allowed(['get', 'set']) == ['get']
+    assert PathFilter().allowed(['get', 'set']) == ['get', 'set']
+
+
+def test_generate_just_selected_paths(ctx, filter_example):
+    """
+    should generate accessors just for the selected subtrees
+    should not generate accessors for excluded subtrees
+    """
+    generator = RPCGenerator(
+        ctx, include_paths=['user'], exclude_paths=['user/address'])
+    rpc_module = generator.transform(filter_example)
+
+    assert rpc_module.find('rpc', 'get-user-name')
+    assert rpc_module.find('rpc', 'set-user-name')
+    assert not rpc_module.find('rpc', 'get-user-address-city')
+    assert not rpc_module.find('rpc', 'get-system-host-name')
+
+
+def test_generate_just_allowed_operations(ctx, filter_example):
+    """
+    should generate just the allowed accessor types
+    """
+    generator = RPCGenerator(ctx, allowed_operations=['get'])
+    rpc_module = generator.transform(filter_example)
+
+    assert rpc_module.find('rpc', 'get-system-host-name')
+    assert rpc_module.find('rpc', 'get-system-uptime')
+    assert not rpc_module.find('rpc', 'set-system-host-name')
+    assert not rpc_module.find('rpc', 'set-user-name')
@@ -0,0 +1,105 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+# pylint: disable=redefined-outer-name
+"""
+Tests for the generic (path-addressed) output mode
+"""
+from os.path import join
+
+import pytest
+
+from pyangext.utils import parse
+
+from pyang_accessors.generators import RPCGenerator
+
+__author__ = "Anderson Bravalheri"
+__copyright__ = "andersonbravalheri@gmail.com"
+__license__ = "mozilla"
+
+
+@pytest.fixture()
+def generic_example(ctx, module_dir):
+    """YANG example with leafs, keyed lists and leaf-lists"""
+    text = """
+        module generic-example {
+            namespace "http://acme.example.com/generic";
+            prefix "acgeneric";
+
+            revision 2007-11-05 {
+                description "Initial revision.";
+            }
+
+            leaf host-name { type string; }
+
+            list users {
+                key login;
+                leaf login { type string; }
+                leaf name { type string; }
+                leaf-list phones { type string; }
+            }
+        }
+        """
+    with open(join(module_dir, 'generic-example.yang'), 'w') as fp:
+        fp.write(text)
+
+    module = parse(text, ctx)
+    ctx.add_parsed_module(module)
+
+    return module
+
+
+@pytest.fixture
+def rpc_module(ctx, generic_example):
+    """Output from generator in generic mode"""
+    return RPCGenerator(ctx, mode='generic').transform(generic_example)
+
+
+def test_one_rpc_per_operation(rpc_module):
+    """
+    should generate one RPC for each operation
+    should not generate RPCs for each accessor
+    """
+    for rpc_name in ('get', 'set', 'add', 'remove'):
+        assert rpc_module.find('rpc', rpc_name)
+    assert not rpc_module.find('rpc', 'get-host-name')
+    assert not rpc_module.find('rpc', 'set-user-name')
+
+
+def test_path_enumeration(rpc_module):
+    """
+    should enumerate each entry-point path in the selector typedef
+    """
+    typedef = rpc_module.find('typedef', 'accessor-path')
+    assert typedef
+    type_ = typedef.find('type', 'enumeration')[0]
+    for path in ('host-name', 'user/name', 'user/phone'):
+        assert type_.find('enum', path)
+
+
+def test_path_identities(ctx, generic_example):
+    """
+    should create one identity for each entry-point path
+    """
+    generator = RPCGenerator(ctx, mode='generic', path_selector='identity')
+    rpc_module = generator.transform(generic_example)
+    assert rpc_module.find('identity', 'accessor-path')
+    assert rpc_module.find('identity', 'user-name')
+    assert not rpc_module.find('typedef', 'accessor-path')
+
+
+def test_data_choice(rpc_module):
+    """
+    should have one case for each data grouping
+    """
+    group = rpc_module.find('grouping', 'accessor-data')
+    assert group
+    choice = group.find('choice', 'accessor-data')[0]
+    assert choice.find('case', 'user-name-data')
+    assert choice.find('case', 'host-name-data')
+
+
+def test_valid_yang(rpc_module, ctx):
+    """
+    module produced in generic mode should be valid
+    """
+    assert rpc_module.validate(ctx)
@@ -10,6 +10,9 @@ import pytest
 
 from pyangext.utils import parse
 
+from pyang_accessors import generators
+from pyang_accessors.generators import RPCGenerator
+
 __author__ = "Anderson Bravalheri"
 __copyright__ = "andersonbravalheri@gmail.com"
 __license__ = "mozilla"
@@ -112,3 +115,170 @@ def test_cannot_access_keys(rpc_module):
     assert not rpc_module.find('rpc', 'get-domain-url')
     assert not rpc_module.find('rpc', 'set-domain-url')
     assert not rpc_module.find('grouping', 'domain-url-data')
+
+
+@pytest.fixture
+def bulk_module(ctx, list_example):
+    """Output from generator with bulk accessors"""
+    return RPCGenerator(ctx, bulk=True).transform(list_example)
+
+
+def test_bulk_read_for_list_items(bulk_module):
+    """
+    should generate one batch READ for each keyed item
+    should respond with all the nodes under the item, except keys
+    """
+    rpc = bulk_module.find('rpc', 'get-many-user')
+    assert rpc
+    assert rpc.find('input')[0].find('uses', 'user-identification')
+    data = bulk_module.find('grouping', 'user-many-data')
+    assert data
+    assert data.find('container', 'name')
+    assert data.find('container', 'surname')
+    assert not data.find('container', 'login')
+
+
+def test_bulk_change_with_status(bulk_module, ctx):
+    """
+    should generate one batch CHANGE for each keyed item
+    should respond with a status for each change
+    """
+    rpc = bulk_module.find('rpc', 'set-many-domain')
+    assert rpc
+    assert bulk_module.find('grouping', 'domain-many-changes')
+    status = bulk_module.find('grouping', 'domain-many-status')
+    assert status
+    assert status.find('list', 'status')
+    assert bulk_module.validate(ctx)
+
+
+@pytest.fixture
+def page_module(ctx, list_example):
+    """Output from generator with paginated accessors"""
+    return RPCGenerator(ctx, paginate=True).transform(list_example)
+
+
+def test_paginated_read_for_items(page_module, ctx):
+    """
+    should generate paginated READ accessors for list items
+    should receive the parent keys and the page request
+    should respond with a list of items keyed as the original list
+    should place the keys and the item fields directly under the list
+    """
+    rpc = page_module.find('rpc', 'get-page-user-phone')
+    assert rpc
+    input_ = rpc.find('input')[0]
+    assert input_.find('uses', 'user-identification')
+    assert input_.find('uses', 'page-request')
+    page = page_module.find('grouping', 'user-phone-page')
+    assert page
+    items = page.find('list', 'phone')[0]
+    assert items.find('key', 'id')
+    assert items.find('uses', 'default-identification')
+    assert items.find('uses', 'user-phone-page-item')
+    assert page_module.find('grouping', 'user-phone-page-item')[0].find(
+        'leaf', 'value')
+    assert page.find('leaf', 'next-cursor')
+    assert not page_module.find('rpc', 'get-page-company-name')
+    assert page_module.validate(ctx)
+
+
+@pytest.fixture
+def keys_module(ctx, list_example):
+    """Output from generator with key enumeration accessors"""
+    return RPCGenerator(ctx, list_keys=True).transform(list_example)
+
+
+def test_list_keys_for_items(keys_module):
+    """
+    should generate one key enumeration for each keyed item
+    should respond with the ID grouping of each item, without data
+    """
+    rpc = keys_module.find('rpc', 'list-user-keys')
+    assert rpc
+    assert not rpc.find('input')
+    keys = keys_module.find('grouping', 'user-keys')
+    items = keys.find('list', 'user')[0]
+    assert items.find('key', 'company login')
+    assert items.find('uses', 'user-identification')
+    assert not items.find('uses', 'user-name-data')
+
+
+def test_list_keys_for_nested_items(keys_module, ctx):
+    """
+    should receive the parent keys for nested items
+    """
+    rpc = keys_module.find('rpc', 'list-company-address-keys')
+    assert rpc
+    assert rpc.find('input')[0].find('uses', 'default-identification')
+    keys = keys_module.find('grouping', 'company-address-keys')
+    items = keys.find('list', 'address')[0]
+    assert items.find('key', 'company-id id')
+    assert keys_module.validate(ctx)
+
+
+def test_paginated_list_keys(ctx, list_example):
+    """
+    should receive the page request if paginated
+    """
+    out = RPCGenerator(
+        ctx, list_keys=True, paginate=True).transform(list_example)
+    rpc = out.find('rpc', 'list-domain-keys')
+    assert rpc.find('input')[0].find('uses', 'page-request')
+    assert out.find('grouping', 'domain-keys')[0].find('leaf', 'next-cursor')
+
+
+def test_normalize_once(ctx, module_dir, monkeypatch):
+    """
+    should produce the same module when the statements are normalized
+        before being copied
+    should resolve the prefixes just once for each original statement
+    """
+    text = """
+        module typed-list-example {
+            namespace "http://acme.example.com/typed-list";
+            prefix "actyped";
+
+            typedef login-type { type string; }
+
+            list users {
+                key login;
+                leaf login { type login-type; }
+                leaf name { type login-type; }
+                leaf-list phone { type login-type; }
+                list posts {
+                    key title;
+                    leaf title { type actyped:login-type; }
+                    leaf content { type string; }
+                }
+            }
+        }
+        """
+    with open(join(module_dir, 'typed-list-example.yang'), 'w') as fp:
+        fp.write(text)
+
+    module = parse(text, ctx)
+    ctx.add_parsed_module(module)
+
+    calls = []
+    resolve = generators.prefix_to_modulename_and_revision
+
+    def counted(module, prefix, pos, errors):
+        """Record the position of each resolved statement"""
+        calls.append((pos.ref, pos.line))
+        return resolve(module, prefix, pos, errors)
+
+    monkeypatch.setattr(
+        generators, 'prefix_to_modulename_and_revision', counted)
+
+    expected = RPCGenerator(ctx).transform(module).dump(ctx=ctx)
+    repeated = len(calls)
+    del calls[:]
+
+    out = RPCGenerator(ctx, normalize_once=True).transform(module)
+
+    assert out.dump(ctx=ctx) == expected
+    assert 'type actyped:login-type;' in expected
+    assert sorted(set(calls)) == sorted(calls)
+    assert len(calls) < repeated
+    assert out.validate(ctx)
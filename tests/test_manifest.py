@@ -0,0 +1,111 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+# pylint: disable=redefined-outer-name
+"""
+Tests for the entry-point manifest
+"""
+from os.path import join
+
+import pytest
+
+from pyangext.utils import parse
+
+from pyang_accessors.manifest import dump_manifest, iter_records, load_manifest
+
+__author__ = "Anderson Bravalheri"
+__copyright__ = "andersonbravalheri@gmail.com"
+__license__ = "mozilla"
+
+
+@pytest.fixture()
+def manifest_example(ctx, module_dir):
+    """YANG example with nested keyed lists"""
+    text = """
+        module manifest-example {
+            namespace "http://acme.example.com/manifest";
+            prefix "acmanifest";
+
+            revision 2007-11-05 {
+                description "Initial revision.";
+            }
+
+            leaf host-name { type string; }
+
+            list users {
+                key login;
+                leaf login { type string; }
+                leaf name { type string; }
+                list posts {
+                    key date;
+                    leaf date { type string; }
+                    leaf content { type string; }
+                }
+            }
+        }
+        """
+    with open(join(module_dir, 'manifest-example.yang'), 'w') as fp:
+        fp.write(text)
+
+    module = parse(text, ctx)
+    ctx.add_parsed_module(module)
+
+    return module
+
+
+@pytest.fixture
+def records(generator, manifest_example):
+    """Manifest records indexed by path"""
+    return dict(
+        ('/'.join(record['path']), record)
+        for record in iter_records(generator, manifest_example)
+    )
+
+
+def test_one_record_per_entry_point(records):
+    """
+    should describe each entry-point
+    should not describe keys
+    """
+    assert sorted(records) == [
+        'host-name', 'user/name', 'user/post/content']
+
+
+def test_record_names(records, generator, manifest_example):
+    """
+    should use the same names used by ``transform``
+    """
+    record = records['user/post/content']
+    assert record['module'] == 'manifest-example'
+    assert record['parent_keys'] == {'user': ['login'], 'post': ['date']}
+    assert record['groupings']['data'] == 'user-post-content-data'
+    rpc_module = generator.transform(manifest_example)
+    for rpc in record['rpcs'].values():
+        assert rpc_module.find('rpc', rpc['name'])
+        if rpc['input']:
+            assert rpc_module.find('grouping', rpc['input'])
+        assert rpc_module.find('grouping', rpc['output'])
+
+
+def test_record_keys(records):
+    """
+    should relate the request leafs with the keyed items
+    """
+    keys = records['user/post/content']['rpcs']['get']['keys']
+    assert keys == [['user', 'login', 'user-login'], ['post', 'date', 'date']]
+    assert records['host-name']['rpcs']['set']['keys'] == []
+
+
+def test_dump_and_load(records, module_dir):
+    """
+    should write and read one JSON record per line
+    """
+    path = join(module_dir, 'manifest.jsonl')
+    with open(path, 'w') as fp:
+        dump_manifest(records.values(), fp)
+
+    with open(path) as fp:
+        loaded = list(load_manifest(fp))
+
+    assert len(loaded) == len(records)
+    assert sorted(r['path'] for r in loaded) == sorted(
+        r['path'] for r in records.values())
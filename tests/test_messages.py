@@ -0,0 +1,105 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+# pylint: disable=redefined-outer-name,exec-used
+"""
+Tests for the generated RPC codecs
+"""
+from os.path import join
+from xml.etree.ElementTree import Element
+
+import pytest
+
+from pyangext.utils import parse
+
+from pyang_accessors.messages import write_codecs
+
+__author__ = "Anderson Bravalheri"
+__copyright__ = "andersonbravalheri@gmail.com"
+__license__ = "mozilla"
+
+
+@pytest.fixture()
+def codec_example(ctx, module_dir):
+    """YANG example with a keyed list"""
+    text = """
+        module codec-example {
+            namespace "http://acme.example.com/codec";
+            prefix "accodec";
+
+            revision 2007-11-05 {
+                description "Initial revision.";
+            }
+
+            list users {
+                key login;
+                leaf login { type string; }
+                leaf age { type int32; }
+                leaf balance { type int64; }
+            }
+        }
+        """
+    with open(join(module_dir, 'codec-example.yang'), 'w') as fp:
+        fp.write(text)
+
+    module = parse(text, ctx)
+    ctx.add_parsed_module(module)
+
+    return module
+
+
+@pytest.fixture
+def rpcs(generator, codec_example, module_dir):
+    """Codecs produced by running the generated code"""
+    path = join(module_dir, 'codec_example_codecs.py')
+    with open(path, 'w') as fp:
+        write_codecs(generator.transform(codec_example), fp)
+
+    namespace = {}
+    with open(path) as fp:
+        exec(fp.read(), namespace)
+
+    return namespace['RPCS']
+
+
+def test_resolve_uses_chains(rpcs):
+    """
+    should have one codec for each RPC
+    should resolve the fields through the ``uses`` statements
+    should describe the cases of the response choice
+    """
+    codec = rpcs['get-user-age']
+    assert [field[0] for field in codec.input_fields] == ['login']
+    cases = dict(codec.output_cases)
+    assert [field[0] for field in cases['success']] == ['age']
+    assert [field[0] for field in cases['failure']] == [
+        'error-code', 'error-message']
+
+
+def test_xml_round_trip(rpcs):
+    """
+    should encode the input inside the RPC element
+    should detect the response case
+    """
+    codec = rpcs['get-user-age']
+    element = codec.encode_input_xml({'login': 'joe'})
+    assert element.tag.endswith('}get-user-age')
+    assert codec.decode_input_xml(element) == {'login': 'joe'}
+
+    reply = codec.encode_output_xml(Element('rpc-reply'), 'success', {
+        'age': 42})
+    assert codec.decode_output_xml(reply) == ('success', {'age': 42})
+
+    reply = codec.encode_output_xml(Element('rpc-reply'), 'failure', {
+        'error-code': 1})
+    assert codec.decode_output_xml(reply) == ('failure', {'error-code': 1})
+
+
+def test_json_round_trip(rpcs):
+    """
+    should qualify the top-level member with the module name
+    should encode 64-bit integers as strings (RFC 7951)
+    """
+    codec = rpcs['get-user-balance']
+    message = codec.encode_output_json('success', {'balance': 10})
+    assert message == {'codec-example-interface:output': {'balance': '10'}}
+    assert codec.decode_output_json(message) == ('success', {'balance': 10})
@@ -0,0 +1,135 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+# pylint: disable=redefined-outer-name,exec-used
+"""
+Tests for the generated Python payload classes
+"""
+from os.path import join
+from xml.etree.ElementTree import Element
+
+import pytest
+
+from pyangext.utils import parse
+
+from pyang_accessors.payloads import write_payload_classes
+
+__author__ = "Anderson Bravalheri"
+__copyright__ = "andersonbravalheri@gmail.com"
+__license__ = "mozilla"
+
+
+@pytest.fixture()
+def payload_example(ctx, module_dir):
+    """YANG example with typed leafs and a keyed list"""
+    text = """
+        module payload-example {
+            namespace "http://acme.example.com/payload";
+            prefix "acpayload";
+
+            revision 2007-11-05 {
+                description "Initial revision.";
+            }
+
+            typedef counter { type uint32; }
+
+            container system {
+                leaf host-name { type string; }
+                leaf enabled { type boolean; }
+                leaf uptime { type counter; }
+                leaf load {
+                    type decimal64 { fraction-digits 2; }
+                }
+                leaf-list ports { type uint16; }
+            }
+
+            list users {
+                key login;
+                leaf login { type string; }
+                leaf age { type int32; }
+                leaf to-dict { type string; }
+            }
+        }
+        """
+    with open(join(module_dir, 'payload-example.yang'), 'w') as fp:
+        fp.write(text)
+
+    module = parse(text, ctx)
+    ctx.add_parsed_module(module)
+
+    return module
+
+
+@pytest.fixture
+def classes(generator, payload_example, module_dir):
+    """Namespace produced by running the generated code"""
+    path = join(module_dir, 'payload_example.py')
+    with open(path, 'w') as fp:
+        write_payload_classes(generator.transform(payload_example), fp)
+
+    namespace = {}
+    with open(path) as fp:
+        exec(fp.read(), namespace)
+
+    return namespace
+
+
+def test_one_class_per_grouping(classes):
+    """
+    should generate classes for data and identification groupings
+    should use slots
+    """
+    for name in ('SystemUptimeData', 'UserAgeData', 'UserIdentification'):
+        assert name in classes
+        assert not hasattr(classes[name](), '__dict__')
+    assert 'Failure' not in classes
+
+
+def test_dict_round_trip(classes):
+    """
+    should convert from/to dicts, omitting empty fields
+    """
+    payload = classes['UserIdentification'].from_dict({'login': 'joe'})
+    assert payload.login == 'joe'
+    assert payload.to_dict() == {'login': 'joe'}
+    assert classes['UserIdentification']().to_dict() == {}
+
+
+def test_xml_round_trip(classes):
+    """
+    should convert values according to the leaf types
+    should resolve typedefs
+    """
+    for (name, value) in (('SystemUptimeData', 42),
+                          ('SystemEnabledData', False)):
+        cls = classes[name]
+        payload = cls.from_dict(dict.fromkeys(cls.__slots__, value))
+        element = Element('data')
+        payload.to_xml(element)
+        assert cls.from_xml(element).to_dict() == payload.to_dict()
+
+
+def test_convert_values(classes):
+    """
+    should convert the values according to the leaf types
+    should convert each value of a leaf-list
+    """
+    cls = classes['SystemLoadData']
+    assert cls(load='0.25').load == cls(load=0.25).load
+    assert str(cls.from_dict({'load': '0.25'}).load) == '0.25'
+
+    assert classes['SystemUptimeData'](uptime='42').uptime == 42
+    assert classes['SystemEnabledData'](enabled='false').enabled is False
+    assert classes['SystemEnabledData'](enabled=1).enabled is True
+    assert classes['SystemPortsData'].from_dict(
+        {'ports': ['22', 80]}).ports == [22, 80]
+    assert classes['UserAgeData']().age is None
+
+
+def test_name_collisions(classes):
+    """
+    should not replace the methods of the class by the leafs
+    """
+    cls = classes['UserToDictData']
+    payload = cls.from_dict({'to-dict': 'value'})
+    assert payload.to_dict_ == 'value'
+    assert payload.to_dict() == {'to-dict': 'value'}
@@ -10,6 +10,8 @@ import pytest
 
 from pyangext.utils import parse
 
+from pyang_accessors.generators import RPCGenerator
+
 __author__ = "Anderson Bravalheri"
 __copyright__ = "andersonbravalheri@gmail.com"
 __license__ = "mozilla"
@@ -161,6 +163,19 @@ def test_typedef_reference(rpc_module, ctx):
     assert 'type acme:state-type;' in yang
 
 
+def test_normalize_once(rpc_module, plain_example, ctx):
+    """
+    should produce the same module when the prefixes are resolved just
+        once for each original statement
+    """
+    generator = RPCGenerator(ctx, normalize_once=True)
+    out = generator.transform(plain_example)
+    yang = out.dump(ctx=ctx)
+    assert 'type acme:state-type;' in yang
+    assert yang == rpc_module.dump(ctx=ctx)
+    assert out.validate(ctx)
+
+
 def test_valid_yang(rpc_module, ctx):
     """
     module produced by transformation should be valid
@@ -169,3 +184,14 @@ def test_valid_yang(rpc_module, ctx):
     assert rpc_module.validate(ctx)
     assert hasattr(rpc_module, 'i_children')
     assert rpc_module.i_children
+
+
+def test_empty_options_use_defaults(ctx):
+    """
+    should replace empty values by the defaults
+    should keep an explicit 0 for options without a default
+    """
+    generator = RPCGenerator(ctx, suffix='', key_suffix=None, shard_size=0)
+    assert generator.suffix == 'interface'
+    assert generator.key_suffix == 'id'
+    assert generator.shard_size == 0
@@ -0,0 +1,59 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+Tests for the import registries
+"""
+import pickle
+
+import pytest
+
+from pyang_accessors.exceptions import YangImportError
+from pyang_accessors.registry import CatalogRegistry, ImportRegistry
+
+__author__ = "Anderson Bravalheri"
+__copyright__ = "andersonbravalheri@gmail.com"
+__license__ = "mozilla"
+
+
+def test_same_prefix_in_every_module():
+    """
+    should allocate the prefix once for the whole catalog
+    should just list the imports of each module
+    """
+    catalog = CatalogRegistry()
+    first = ImportRegistry(catalog)
+    second = ImportRegistry(catalog)
+
+    assert first.add('acme', 'acme-types', '2007-11-05') == 'acme'
+    assert second.add('acme', 'acme-system', None) == 'acme2'
+    assert second.add('types', 'acme-types', '2007-11-05') == 'acme'
+
+    assert sorted(first.by_name) == ['acme-types']
+    assert sorted(second.by_name) == ['acme-system', 'acme-types']
+
+
+def test_revision_conflicts_in_catalog():
+    """
+    should detect different revisions imported by different modules
+    """
+    catalog = CatalogRegistry()
+    ImportRegistry(catalog).add('acme', 'acme-types', '2007-11-05')
+    with pytest.raises(YangImportError):
+        ImportRegistry(catalog).add('acme', 'acme-types', '2008-01-01')
+
+
+def test_merge():
+    """
+    should keep the prefixes already allocated
+    should report the modules with a different prefix
+    should survive pickling (e.g. for process pools)
+    """
+    catalog = CatalogRegistry()
+    catalog.add('acme', 'acme-types', None)
+
+    worker = pickle.loads(pickle.dumps(CatalogRegistry()))
+    worker.add('acme', 'acme-system', None)
+    worker.add('ietf', 'ietf-inet-types', None)
+
+    assert catalog.merge(worker) == {'acme-system': 'acme2'}
+    assert catalog.by_name['ietf-inet-types'][0] == 'ietf'
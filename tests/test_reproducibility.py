@@ -0,0 +1,108 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+# pylint: disable=redefined-outer-name
+"""
+Tests for the reproducibility of the output
+"""
+import os
+import subprocess
+import sys
+from os.path import abspath, dirname, join
+
+import pytest
+
+from pyangext.utils import parse
+
+__author__ = "Anderson Bravalheri"
+__copyright__ = "andersonbravalheri@gmail.com"
+__license__ = "mozilla"
+
+ROOT_DIR = dirname(dirname(abspath(__file__)))
+
+TRANSFORM_SCRIPT = (
+    'import sys\n'
+    'from pyang_accessors.catalog import transform_file\n'
+    'sys.stdout.write(transform_file(sys.argv[1]))\n'
+)
+"""Generate the interface for a file in a new interpreter"""
+
+TYPES_TEMPLATE = """
+    module {name}-types {{
+        namespace "http://acme.example.com/{name}-types";
+        prefix "{name}";
+
+        revision 2007-11-05 {{
+            description "Initial revision.";
+        }}
+
+        typedef label {{ type string; }}
+    }}
+    """
+
+
+@pytest.fixture()
+def imports_example(ctx, module_dir):
+    """YANG example using typedefs from several modules"""
+    names = ['zeta', 'alpha', 'mu', 'beta']
+    for name in names:
+        with open(join(module_dir, name + '-types.yang'), 'w') as fp:
+            fp.write(TYPES_TEMPLATE.format(name=name))
+
+    text = """
+        module imports-example {
+            namespace "http://acme.example.com/imports";
+            prefix "acimports";
+
+            %s
+
+            revision 2007-11-05 {
+                description "Initial revision.";
+            }
+
+            %s
+        }
+        """ % (
+            '\n'.join('import {0}-types {{ prefix {0}; }}'.format(name)
+                      for name in names),
+            '\n'.join('leaf {0} {{ type {0}:label; }}'.format(name)
+                      for name in names),
+        )
+    with open(join(module_dir, 'imports-example.yang'), 'w') as fp:
+        fp.write(text)
+
+    module = parse(text, ctx)
+    ctx.add_parsed_module(module)
+
+    return module
+
+
+def test_byte_identical_output(module_dir, imports_example):
+    """
+    should produce the same output for the same input
+    should not depend on the hash seed of the interpreter
+    """
+    assert imports_example
+    filename = join(module_dir, 'imports-example.yang')
+    outputs = [
+        subprocess.check_output(
+            [sys.executable, '-c', TRANSFORM_SCRIPT, filename],
+            cwd=ROOT_DIR, env=dict(os.environ, PYTHONHASHSEED=seed))
+        for seed in ('0', '1', '2', '3')
+    ]
+    assert outputs[0]
+    assert all(output == outputs[0] for output in outputs)
+
+
+def test_sorted_imports(generator, imports_example):
+    """
+    should place the imports together, sorted by prefix
+    """
+    out = generator.transform(imports_example).unwrap()
+    keywords = [node.keyword for node in out.substmts]
+    first = keywords.index('import')
+    imports = [node for node in out.substmts if node.keyword == 'import']
+    assert keywords[first:first + len(imports)] == ['import'] * len(imports)
+
+    prefixes = [node.search_one('prefix').arg for node in imports]
+    assert prefixes == sorted(prefixes)
+    assert len(imports) == 4
@@ -0,0 +1,181 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+# pylint: disable=redefined-outer-name
+"""
+Tests for the scanner traversal
+"""
+import sys
+from os.path import join
+
+import pytest
+
+from pyangext.utils import parse
+
+from pyang_accessors.definitions import READ_OP
+from pyang_accessors.scan import EntryPoint, KeyContext
+
+__author__ = "Anderson Bravalheri"
+__copyright__ = "andersonbravalheri@gmail.com"
+__license__ = "mozilla"
+
+
+@pytest.fixture()
+def scan_example(ctx, module_dir):
+    """YANG example with nested lists and read-only subtrees"""
+    text = """
+        module scan-example {
+            namespace "http://acme.example.com/scan";
+            prefix "acscan";
+
+            revision 2007-11-05 {
+                description "Initial revision.";
+            }
+
+            leaf host-name { type string; }
+
+            list users {
+                key login;
+                leaf login { type string; }
+                container profile {
+                    leaf login { type string; }
+                    leaf name { type string; }
+                }
+                list posts {
+                    key date;
+                    leaf date { type string; }
+                    leaf content { type string; }
+                }
+            }
+
+            container statistics {
+                config false;
+                leaf visits { type uint32; }
+                list sessions {
+                    key id;
+                    leaf id { type uint32; }
+                    leaf address { type string; }
+                }
+            }
+        }
+        """
+    with open(join(module_dir, 'scan-example.yang'), 'w') as fp:
+        fp.write(text)
+
+    module = parse(text, ctx)
+    ctx.add_parsed_module(module)
+
+    return module
+
+
+def deep_example(ctx, module_dir, depth):
+    """YANG example with ``depth`` nested containers"""
+    body = 'leaf value { type string; }'
+    for level in reversed(range(depth)):
+        body = 'container level-{} {{ {} }}'.format(level, body)
+
+    text = """
+        module deep-example {{
+            namespace "http://acme.example.com/deep";
+            prefix "acdeep";
+
+            revision 2007-11-05 {{
+                description "Initial revision.";
+            }}
+
+            {}
+        }}
+        """.format(body)
+    with open(join(module_dir, 'deep-example.yang'), 'w') as fp:
+        fp.write(text)
+
+    module = parse(text, ctx)
+    ctx.add_parsed_module(module)
+
+    return module
+
+
+def test_pre_order(generator, scan_example):
+    """
+    should produce the entry-points in the order of the schema
+    should skip the keys of the parent lists, in any level
+    """
+    entries = generator.scan(scan_example)
+    assert [entry.path for entry in entries] == [
+        ['host-name'],
+        ['user', 'profile', 'name'],
+        ['user', 'post', 'content'],
+        ['statistics', 'visits'],
+        ['statistics', 'session', 'address'],
+    ]
+
+
+def test_inherited_context(generator, scan_example):
+    """
+    should relate the keys of every parent list
+    should inherit the read-only flag
+    """
+    entries = dict(
+        ('/'.join(entry.path), entry)
+        for entry in generator.scan(scan_example)
+    )
+
+    content = entries['user/post/content']
+    assert sorted(content.parent_keys) == ['post', 'user']
+    assert [key.arg for key in content.parent_keys['user']] == ['login']
+    assert [key.arg for key in content.parent_keys['post']] == ['date']
+
+    assert entries['statistics/session/address'].operations == [READ_OP]
+    assert len(entries['user/profile/name'].operations) > 1
+
+
+def test_deep_nesting(generator, ctx, module_dir):
+    """
+    should not be limited by the recursion depth of the schema
+    """
+    limit = sys.getrecursionlimit()
+    depth = limit + 50
+    # pyang itself parses and validates recursively
+    sys.setrecursionlimit(20 * depth)
+    try:
+        module = deep_example(ctx, module_dir, depth)
+    finally:
+        sys.setrecursionlimit(limit)
+
+    entries = generator.scan(module)
+    assert len(entries) == 1
+    assert len(entries[0].path) == depth + 1
+
+
+def test_shared_key_context(generator, scan_example):
+    """
+    should share the same keys object between the descendants of a list
+    should memoize the prefixed keys
+    """
+    entries = dict(
+        ('/'.join(entry.path), entry)
+        for entry in generator.scan(scan_example)
+    )
+    keys = entries['user/profile/name'].parent_keys['user']
+    assert entries['user/post/content'].parent_keys['user'] is keys
+    assert keys.item_name == 'user'
+    assert keys.names == frozenset(['login'])
+
+    prefixed = keys.prefixed(generator.name_composer)
+    assert [key.arg for key in prefixed] == ['user-login']
+    assert keys.prefixed(generator.name_composer) is prefixed
+
+
+def test_copy_keeps_key_context(scan_example):
+    """
+    should keep the keys of a copied entry-point as a key context
+    """
+    users = scan_example.search_one('list', 'users')
+    keys = KeyContext('user', [users.search_one('leaf', 'login')])
+    entry = EntryPoint(['user'], payload=users, own_keys=keys)
+
+    copy = entry.copy(copy_payload=False)
+    assert isinstance(copy.own_keys, KeyContext)
+    assert copy.own_keys is not keys
+    assert copy.own_keys.item_name == 'user'
+    assert copy.own_keys.names == frozenset(['login'])
+    assert copy.payload is users
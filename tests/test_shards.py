@@ -0,0 +1,231 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+# pylint: disable=redefined-outer-name
+"""
+Tests for the output split into submodules
+"""
+from os.path import join
+
+import pytest
+
+from pyang_builder import Builder
+from pyangext.utils import parse
+
+from pyang_accessors.exceptions import DefinitionConflictError
+from pyang_accessors.generators import RPCGenerator
+from pyang_accessors.scan import EntryPoint
+from pyang_accessors.shards import move_shared_definitions, partition_entries
+
+__author__ = "Anderson Bravalheri"
+__copyright__ = "andersonbravalheri@gmail.com"
+__license__ = "mozilla"
+
+
+@pytest.fixture()
+def shard_example(ctx, module_dir):
+    """YANG example with independent top-level subtrees"""
+    text = """
+        module shard-example {
+            namespace "http://acme.example.com/shard";
+            prefix "acshard";
+
+            revision 2007-11-05 {
+                description "Initial revision.";
+            }
+
+            leaf host-name { type string; }
+
+            list users {
+                leaf name { type string; }
+            }
+
+            list domains {
+                leaf url { type string; }
+            }
+        }
+        """
+    with open(join(module_dir, 'shard-example.yang'), 'w') as fp:
+        fp.write(text)
+
+    module = parse(text, ctx)
+    ctx.add_parsed_module(module)
+
+    return module
+
+
+@pytest.fixture
+def outputs(generator, shard_example):
+    """Main module and submodules, by name"""
+    return generator.transform_shards(shard_example)
+
+
+def test_partition_by_top_level_subtree():
+    """
+    should keep the subtrees together while they fit the size
+    should split subtrees bigger than the size
+    """
+    entries = [EntryPoint(path) for path in (
+        ['user', 'name'], ['user', 'age'], ['host-name'],
+        ['domain', 'url'], ['domain', 'owner'], ['domain', 'ip'])]
+
+    partitions = partition_entries(entries)
+    assert [len(partition) for partition in partitions] == [2, 1, 3]
+
+    partitions = partition_entries(entries, 2)
+    assert [len(partition) for partition in partitions] == [2, 1, 2, 1]
+
+
+def test_main_module_includes_submodules(outputs):
+    """
+    should produce the main module, the common submodule and the shards
+    should include all the submodules in the main module
+    """
+    names = [name for (name, _) in outputs]
+    assert names == [
+        'shard-example-interface',
+        'shard-example-interface-common',
+        'shard-example-interface-shard-1',
+        'shard-example-interface-shard-2',
+        'shard-example-interface-shard-3',
+    ]
+
+    (_, main) = outputs[0]
+    for name in names[1:]:
+        assert main.find('include', name)
+    assert not main.find('rpc', 'get-host-name')
+
+
+def test_shared_definitions_in_common_submodule(outputs):
+    """
+    should place default groupings in the common submodule
+    should keep the other groupings in the shards
+    """
+    modules = dict(outputs)
+    common = modules['shard-example-interface-common']
+    assert common.find('belongs-to', 'shard-example-interface')
+    assert common.find('grouping', 'failure')
+    assert common.find('grouping', 'default-identification')
+
+    for (_, shard) in outputs[2:]:
+        assert shard.find('include', 'shard-example-interface-common')
+        assert not shard.find('grouping', 'failure')
+
+    users = modules['shard-example-interface-shard-2']
+    assert users.find('rpc', 'get-user-name')
+    assert users.find('grouping', 'user-name-data')
+    assert not common.find('grouping', 'user-name-data')
+
+
+def test_shared_definitions_counted_once(ctx, outputs, shard_example):
+    """
+    should count the groupings repeated by the shards just once
+    """
+    groupings = [grouping.arg for (_, module) in outputs
+                 for grouping in module.unwrap().search('grouping')]
+    assert len(groupings) == len(set(groupings))
+
+    generator = RPCGenerator(ctx, max_groupings=len(groupings))
+    assert generator.transform_shards(shard_example)
+    assert generator.budget.usage['groupings'] == len(groupings)
+
+
+@pytest.fixture()
+def split_example(ctx, module_dir):
+    """YANG example with a subtree bigger than the shards"""
+    text = """
+        module split-example {
+            namespace "http://acme.example.com/split";
+            prefix "acsplit";
+
+            revision 2007-11-05 {
+                description "Initial revision.";
+            }
+
+            list users {
+                key login;
+                leaf login { type string; }
+                leaf name { type string; }
+                leaf email { type string; }
+                leaf phone { type string; }
+            }
+        }
+        """
+    with open(join(module_dir, 'split-example.yang'), 'w') as fp:
+        fp.write(text)
+
+    module = parse(text, ctx)
+    ctx.add_parsed_module(module)
+
+    return module
+
+
+def test_list_accessors_in_a_single_shard(ctx, split_example):
+    """
+    should define the accessors of a list item just once
+    should define them in the shard with the first entry-point
+    should consider the entry-points of all the shards
+    """
+    generator = RPCGenerator(ctx, shard_size=2, bulk=True, list_keys=True)
+    outputs = generator.transform_shards(split_example)
+    shards = [module for (_, module) in outputs[2:]]
+    assert len(shards) == 2
+
+    rpc_names = [rpc.arg for shard in shards
+                 for rpc in shard.unwrap().search('rpc')]
+    assert len(rpc_names) == len(set(rpc_names))
+
+    (first, second) = shards
+    for rpc_name in ('get-many-user', 'set-many-user', 'list-user-keys'):
+        assert first.find('rpc', rpc_name)
+        assert not second.find('rpc', rpc_name)
+    assert second.find('rpc', 'get-user-phone')
+
+    data = first.find('grouping', 'user-many-data')[0]
+    for name in ('name', 'email', 'phone'):
+        assert data.find('container', name)
+
+
+def submodule(name):
+    """Empty submodule, as the ones created for the shards"""
+    return Builder(name, keyword='submodule')('submodule', name)
+
+
+def test_move_used_definitions():
+    """
+    should move the identical definitions just once
+    should move the definitions used by the moved ones
+    """
+    (first, second, common) = [
+        submodule(name) for name in ('first', 'second', 'common')]
+    first.grouping('user-name-data', [
+        ('leaf', 'name', [('type', 'string')]),
+    ])
+    for shard in (first, second):
+        shard.grouping('user-data', [('uses', 'user-name-data')])
+
+    moved = move_shared_definitions([first, second], common)
+    assert moved == [('grouping', 'user-name-data'), ('grouping', 'user-data')]
+    assert common.find('grouping', 'user-name-data')
+    assert common.find('grouping', 'user-data')
+    for shard in (first, second):
+        assert not shard.find('grouping', 'user-name-data')
+        assert not shard.find('grouping', 'user-data')
+
+
+def test_conflicting_definitions():
+    """
+    should not discard a definition different from the moved one
+    """
+    (first, second, common) = [
+        submodule(name) for name in ('first', 'second', 'common')]
+    first.grouping('user-many-data', [
+        ('container', 'name', [('uses', 'user-name-data')]),
+    ])
+    second.grouping('user-many-data', [
+        ('container', 'email', [('uses', 'user-email-data')]),
+    ])
+
+    with pytest.raises(DefinitionConflictError) as info:
+        move_shared_definitions([first, second], common)
+    assert info.value.name == 'user-many-data'
+    assert info.value.shards == ['first', 'second']
@@ -0,0 +1,93 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+# pylint: disable=redefined-outer-name
+"""
+Tests for the subscription accessors and change notifications
+"""
+from os.path import join
+
+import pytest
+
+from pyangext.utils import parse
+
+from pyang_accessors.generators import RPCGenerator
+
+__author__ = "Anderson Bravalheri"
+__copyright__ = "andersonbravalheri@gmail.com"
+__license__ = "mozilla"
+
+
+@pytest.fixture()
+def subscribe_example(ctx, module_dir):
+    """YANG example with an observable container"""
+    text = """
+        module subscribe-example {
+            namespace "http://acme.example.com/subscribe";
+            prefix "acsub";
+
+            import pyang-accessors { prefix accessor; }
+
+            container system {
+                leaf host-name { type string; }
+                leaf uptime { type uint32; config false; }
+                accessor:modifier observable;
+            }
+
+            list users {
+                key login;
+                leaf login { type string; }
+                leaf name { type string; }
+            }
+        }
+        """
+    with open(join(module_dir, 'subscribe-example.yang'), 'w') as fp:
+        fp.write(text)
+
+    module = parse(text, ctx)
+    ctx.add_parsed_module(module)
+
+    return module
+
+
+def test_observable_modifier(generator, subscribe_example):
+    """
+    should add subscription accessors to the observable nodes
+    should add subscription accessors to read-only nodes
+    should not add subscription accessors to other nodes
+    """
+    out = generator.transform(subscribe_example)
+
+    assert out.find('rpc', 'subscribe-system-host-name')
+    assert out.find('rpc', 'unsubscribe-system-host-name')
+    assert out.find('rpc', 'subscribe-system-uptime')
+    assert not out.find('rpc', 'set-system-uptime')
+    assert not out.find('rpc', 'subscribe-user-name')
+
+    assert out.find('notification', 'system-uptime-changed')
+    notification = out.find('notification', 'system-uptime-changed')[0]
+    assert notification.find('uses', 'system-uptime-data')
+
+
+def test_subscribe_option(ctx, subscribe_example):
+    """
+    should add subscription accessors to all the nodes
+    should identify the changed node in the notification
+    """
+    out = RPCGenerator(ctx, subscribe=True).transform(subscribe_example)
+
+    assert out.find('rpc', 'subscribe-user-name')
+    rpc = out.find('rpc', 'subscribe-user-name')[0]
+    assert rpc.find('input')[0].find('uses', 'user-identification')
+
+    assert out.find('notification', 'user-name-changed')
+    notification = out.find('notification', 'user-name-changed')[0]
+    assert notification.find('uses', 'user-identification')
+    assert notification.find('uses', 'user-name-data')
+
+
+def test_valid_yang(ctx, subscribe_example):
+    """
+    module produced with subscriptions should be valid
+    """
+    out = RPCGenerator(ctx, subscribe=True).transform(subscribe_example)
+    assert out.validate(ctx)